@@ -10,13 +10,18 @@ from typing import Any, Dict
 
 __version__ = "4.3.1"
 __all__ = [
+    "ArrowReader",
+    "ArrowWriter",
     "ASCReader",
     "ASCWriter",
     "AsyncBufferedReader",
+    "AsyncNotifier",
     "BitTiming",
     "BitTimingFd",
     "BLFReader",
     "BLFWriter",
+    "CANBReader",
+    "CANBWriter",
     "BufferedReader",
     "Bus",
     "BusABC",
@@ -38,10 +43,13 @@ __all__ = [
     "LogReader",
     "ModifiableCyclicTaskABC",
     "Message",
+    "MessageBatch",
     "MessageSync",
     "MF4Reader",
     "MF4Writer",
     "Notifier",
+    "ParquetReader",
+    "ParquetWriter",
     "Printer",
     "RedirectReader",
     "RestartableCyclicTaskABC",
@@ -67,6 +75,7 @@ __all__ = [
     "log",
     "logger",
     "message",
+    "message_batch",
     "notifier",
     "player",
     "set_logging_level",
@@ -97,10 +106,14 @@ from .exceptions import (
 from .interface import Bus, detect_available_configs
 from .interfaces import VALID_INTERFACES
 from .io import (
+    ArrowReader,
+    ArrowWriter,
     ASCReader,
     ASCWriter,
     BLFReader,
     BLFWriter,
+    CANBReader,
+    CANBWriter,
     CanutilsLogReader,
     CanutilsLogWriter,
     CSVReader,
@@ -110,6 +123,8 @@ from .io import (
     MessageSync,
     MF4Reader,
     MF4Writer,
+    ParquetReader,
+    ParquetWriter,
     Printer,
     SizedRotatingLogger,
     SqliteReader,
@@ -120,7 +135,8 @@ from .io import (
 )
 from .listener import AsyncBufferedReader, BufferedReader, Listener, RedirectReader
 from .message import Message
-from .notifier import Notifier
+from .message_batch import MessageBatch
+from .notifier import AsyncNotifier, Notifier
 from .thread_safe_bus import ThreadSafeBus
 from .util import set_logging_level
 
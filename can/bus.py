@@ -139,6 +139,60 @@ class BusABC(metaclass=ABCMeta):
 
                 return None
 
+    def recv_batch(
+        self, max_messages: int = 256, timeout: Optional[float] = None
+    ) -> List[Message]:
+        """Block waiting for messages from the Bus and return all of them
+        that are available at once.
+
+        This waits up to ``timeout`` seconds for the first message to arrive
+        and then collects every further message that can be read without
+        blocking, until ``max_messages`` messages have been gathered.
+
+        The default implementation reads the messages one at a time.
+        Interfaces that can fetch several frames with a single
+        system or driver call should override this method to avoid the
+        per-message overhead.
+
+        :param max_messages:
+            the maximum number of messages to return
+        :param timeout:
+            seconds to wait for the first message or None to wait indefinitely
+
+        :return:
+            A list of received :class:`~can.Message` objects in the order
+            they were received. The list is empty on timeout.
+
+        :raises ValueError:
+            If ``max_messages`` is smaller than 1
+        :raises ~can.exceptions.CanOperationError:
+            If an error occurred while reading
+        """
+        if max_messages < 1:
+            raise ValueError(f"max_messages must be positive, got {max_messages}")
+
+        msg = self.recv(timeout=timeout)
+        if msg is None:
+            return []
+
+        messages = [msg]
+        while len(messages) < max_messages:
+            # drain without blocking, skipping over messages that do not match
+            try:
+                msg, already_filtered = self._recv_internal(timeout=0.0)
+            except NotImplementedError:
+                # the bus provides its own (legacy) implementation of recv()
+                msg, already_filtered = self.recv(timeout=0.0), True
+
+            if msg is None:
+                break
+
+            if already_filtered or self._matches_filters(msg):
+                LOG.log(self.RECV_LOGGING_LEVEL, "Received: %s", msg)
+                messages.append(msg)
+
+        return messages
+
     def _recv_internal(
         self, timeout: Optional[float]
     ) -> Tuple[Optional[Message], bool]:
@@ -401,6 +455,7 @@ class BusABC(metaclass=ABCMeta):
             messages based only on the arbitration ID and mask.
         """
         self._filters = filters or None
+        self._compiled_filters = can.util.compile_filters(self._filters)
         with contextlib.suppress(NotImplementedError):
             self._apply_filters(self._filters)
 
@@ -425,30 +480,9 @@ class BusABC(metaclass=ABCMeta):
             the message to check if matching
         :return: whether the given message matches at least one filter
         """
-
-        # if no filters are set, all messages are matched
-        if self._filters is None:
-            return True
-
-        for _filter in self._filters:
-            # check if this filter even applies to the message
-            if "extended" in _filter:
-                _filter = cast(can.typechecking.CanFilterExtended, _filter)
-                if _filter["extended"] != msg.is_extended_id:
-                    continue
-
-            # then check for the mask and id
-            can_id = _filter["can_id"]
-            can_mask = _filter["can_mask"]
-
-            # basically, we compute
-            # `msg.arbitration_id & can_mask == can_id & can_mask`
-            # by using the shorter, but equivalent from below:
-            if (can_id ^ msg.arbitration_id) & can_mask == 0:
-                return True
-
-        # nothing matched
-        return False
+        return can.util.match_filters(
+            self._compiled_filters, msg.arbitration_id, msg.is_extended_id
+        )
 
     def flush_tx_buffer(self) -> None:
         """Discard every message that may be queued in the output buffer(s)."""
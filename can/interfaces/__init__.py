@@ -24,6 +24,7 @@ __all__ = [
     "robotell",
     "seeedstudio",
     "serial",
+    "shm_virtual",
     "slcan",
     "socketcan",
     "socketcand",
@@ -46,6 +47,7 @@ BACKENDS: Dict[str, Tuple[str, str]] = {
     "iscan": ("can.interfaces.iscan", "IscanBus"),
     "virtual": ("can.interfaces.virtual", "VirtualBus"),
     "udp_multicast": ("can.interfaces.udp_multicast", "UdpMulticastBus"),
+    "shm_virtual": ("can.interfaces.shm_virtual", "ShmVirtualBus"),
     "neovi": ("can.interfaces.ics_neovi", "NeoViBus"),
     "vector": ("can.interfaces.vector", "VectorBus"),
     "slcan": ("can.interfaces.slcan", "slcanBus"),
@@ -0,0 +1,552 @@
+"""
+This module implements a virtual CAN interface for the communication
+between several processes on the same host.
+
+All ShmVirtualBus instances connecting to the same channel share a ring
+buffer in shared memory, so that no messages have to be passed through
+sockets or pipes.
+"""
+
+import contextlib
+import hashlib
+import logging
+import os
+import select
+import struct
+import sys
+import threading
+import time
+from multiprocessing import resource_tracker, shared_memory
+from random import randint
+from typing import Any, Dict, List, Optional, Tuple
+
+from can import (
+    CanInitializationError,
+    CanInterfaceNotImplementedError,
+    CanOperationError,
+)
+from can.bus import BusABC, CanProtocol
+from can.message import Message
+from can.typechecking import AutoDetectedConfig
+
+try:
+    import fcntl
+except ModuleNotFoundError:  # Missing on Windows
+    fcntl = None  # type: ignore[assignment]
+
+logger = logging.getLogger(__name__)
+
+
+#: The maximum number of buses which can be connected to one channel
+MAX_BUSES = 64
+
+#: The size of a slot in the ring buffer, which holds one message
+SLOT_SIZE = 96
+
+_MAGIC = b"PYCANSHM"
+_VERSION = 1
+
+# magic, version, number of slots, slot size, (reserved)
+_HEADER = struct.Struct("<8sIIII")
+_SEQUENCE = struct.Struct("<Q")
+# the number of messages that were written to the channel
+_SEQUENCE_OFFSET = 24
+# process id and token of each connected bus
+_BUS = struct.Struct("<II")
+_BUSES_OFFSET = 32
+# one byte per bus, which is set if the bus waits for a wakeup
+_WAITING_OFFSET = _BUSES_OFFSET + MAX_BUSES * _BUS.size
+_SLOTS_OFFSET = _WAITING_OFFSET + MAX_BUSES
+
+# sequence, timestamp, arbitration id, token of the sender, flags, dlc, length
+_SLOT = struct.Struct("<QdIIBBB5x")
+_DATA_OFFSET = _SLOT.size
+_DATA_SIZE = SLOT_SIZE - _SLOT.size
+
+_WAKEUP = b"\x01"
+
+_FLAG_EXTENDED_ID = 0x01
+_FLAG_REMOTE_FRAME = 0x02
+_FLAG_ERROR_FRAME = 0x04
+_FLAG_FD = 0x08
+_FLAG_BITRATE_SWITCH = 0x10
+_FLAG_ERROR_STATE_INDICATOR = 0x20
+
+# The resource tracker unlinks the registered segments when the process exits,
+# even if other processes still use them. Since Python 3.13, segments can be
+# opened without registering them, but older versions register every segment,
+# also when attaching to it, so they have to be unregistered afterwards.
+_SEGMENT_OPTIONS: Dict[str, Any]
+if sys.version_info >= (3, 13):
+    _SEGMENT_OPTIONS = {"track": False}
+    _TRACKED = False
+else:
+    _SEGMENT_OPTIONS = {}
+    _TRACKED = os.name == "posix"
+
+# The directory of the lock files and named pipes of the channels. Like the
+# names of the segments, and unlike the temporary directory, it does not
+# depend on the environment, so that all processes use the same files.
+_FILES_DIRECTORY = "/dev/shm" if os.path.isdir("/dev/shm") else "/tmp"
+
+
+def _segment_name(channel: Any) -> str:
+    """Return the name of the shared memory segment of a channel.
+
+    The channel is hashed, since the names are limited to 31 characters
+    on macOS.
+    """
+    digest = hashlib.sha1(str(channel).encode()).hexdigest()
+    return f"pycan_{digest[:16]}"
+
+
+def _open_segment(name: str, size: int) -> Tuple[shared_memory.SharedMemory, bool]:
+    """Attach to the segment with the given name or create it.
+
+    :return: The segment and whether it was created.
+    """
+    try:
+        segment = shared_memory.SharedMemory(
+            name, create=True, size=size, **_SEGMENT_OPTIONS
+        )
+        created = True
+    except FileExistsError:
+        segment = shared_memory.SharedMemory(name, **_SEGMENT_OPTIONS)
+        created = False
+    if _TRACKED:
+        resource_tracker.unregister(f"/{segment.name}", "shared_memory")
+    return segment, created
+
+
+def _unlink_segment(segment: shared_memory.SharedMemory) -> None:
+    if _TRACKED:
+        # unlink() unregisters the segment again
+        resource_tracker.register(f"/{segment.name}", "shared_memory")
+    segment.unlink()
+
+
+def _is_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class ShmVirtualBus(BusABC):
+    """
+    A virtual CAN bus for the communication between processes on the same
+    host, which uses a ring buffer in shared memory.
+
+    All buses connected to a channel share one
+    :class:`multiprocessing.shared_memory.SharedMemory` segment, which holds
+    a fixed number of slots of :data:`SLOT_SIZE` bytes and the number of
+    messages that were written. A bus writes a message to the next slot while
+    holding a lock on a file of the channel, and increments this
+    sequence counter afterwards. Every bus reads the slots at its own pace by
+    comparing its own sequence counter with the one of the channel. A bus
+    which waits for a message is woken up by the sender through a named pipe,
+    which is also returned by :meth:`fileno`.
+
+    In this interface, a channel is an arbitrary object, which is converted
+    to a string, used as an identifier for connected buses.
+
+    .. note::
+        Senders never wait for the receivers. If a bus does not read its
+        messages in time, the oldest ones are overwritten and are counted in
+        :attr:`dropped`.
+
+    .. warning::
+        This interface guarantees message ordering, but does *not* implement
+        rate limiting or ID arbitration/prioritization under high loads.
+        Please refer to the section :ref:`virtual_interfaces_doc` for more
+        information on this and a comparison to alternatives.
+    """
+
+    def __init__(
+        self,
+        channel: Any = "shm0",
+        receive_own_messages: bool = False,
+        preserve_timestamps: bool = False,
+        slot_count: int = 4096,
+        **kwargs: Any,
+    ) -> None:
+        """
+        The constructed instance has access to the bus identified by the
+        channel parameter. It is able to see all messages transmitted on the
+        bus by instances in any process on this host, which were constructed
+        with the same channel identifier.
+
+        :param channel: The channel identifier. Buses with the same string
+            representation of the channel are connected.
+        :param receive_own_messages: If set to True, sent messages will be
+            reflected back on the input queue.
+        :param preserve_timestamps: If set to True, messages transmitted via
+            :func:`~can.BusABC.send` will keep the timestamp set in the
+            :class:`~can.Message` instance. Otherwise, the timestamp value
+            will be replaced with the current system time.
+        :param slot_count: The number of messages that fit into the ring
+            buffer. It is only used by the first bus, which creates the
+            shared memory of the channel.
+        :param kwargs: Additional keyword arguments passed to the parent
+            constructor.
+
+        :raises ~can.exceptions.CanInterfaceNotImplementedError:
+            If the platform does not support file locks and named pipes.
+        :raises ~can.exceptions.CanInitializationError:
+            If the shared memory can not be used or if :data:`MAX_BUSES`
+            buses are already connected to the channel.
+        """
+        if fcntl is None or not hasattr(os, "mkfifo"):
+            raise CanInterfaceNotImplementedError(
+                "The shm_virtual interface is only supported on Unix systems"
+            )
+        if slot_count < 1:
+            raise ValueError(f"slot_count must be positive, got {slot_count}")
+
+        super().__init__(
+            channel=channel,
+            receive_own_messages=receive_own_messages,
+            **kwargs,
+        )
+
+        self.channel_id = channel
+        self._can_protocol = CanProtocol.CAN_FD
+        self.channel_info = f"Shared memory virtual bus channel {self.channel_id}"
+        self.receive_own_messages = receive_own_messages
+        self.preserve_timestamps = preserve_timestamps
+        #: The number of messages that were overwritten before they were read
+        self.dropped = 0
+
+        self._name = _segment_name(channel)
+        self._send_lock = threading.Lock()
+        # index => (token, file descriptor) of the named pipes of other buses
+        self._wakeup_fds: Dict[int, Tuple[int, int]] = {}
+        self._token = randint(1, 0xFFFFFFFF)
+        self._open = False
+
+        path = os.path.join(_FILES_DIRECTORY, f"{self._name}.lock")
+        self._lock_fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+        self._channel_lock = _FileLock(self._lock_fd)
+        try:
+            with self._channel_lock:
+                self._connect(slot_count)
+        except Exception:
+            os.close(self._lock_fd)
+            raise
+        self._open = True
+
+    def _fifo_path(self, index: int) -> str:
+        return os.path.join(_FILES_DIRECTORY, f"{self._name}_{index}.fifo")
+
+    def _connect(self, slot_count: int) -> None:
+        """Open the shared memory and register this bus in it.
+
+        Has to be called with the lock of the channel.
+        """
+        size = _SLOTS_OFFSET + slot_count * SLOT_SIZE
+        try:
+            self._segment, created = _open_segment(self._name, size)
+        except (OSError, ValueError) as error:
+            raise CanInitializationError(
+                f"Could not open the shared memory of channel {self.channel_id}"
+            ) from error
+
+        # undo everything if this bus can not be connected
+        with contextlib.ExitStack() as cleanup:
+            if created:
+                cleanup.callback(_unlink_segment, self._segment)
+            cleanup.callback(self._segment.close)
+            try:
+                self._register(created, slot_count, cleanup)
+            except OSError as error:
+                raise CanInitializationError(
+                    f"Could not connect to channel {self.channel_id}"
+                ) from error
+            cleanup.pop_all()
+
+    def _register(
+        self, created: bool, slot_count: int, cleanup: contextlib.ExitStack
+    ) -> None:
+        """Check the shared memory, create the named pipe of this bus and
+        register it in the shared memory.
+        """
+        buf = self._segment.buf
+        if created:
+            _HEADER.pack_into(buf, 0, _MAGIC, _VERSION, slot_count, SLOT_SIZE, 0)
+        magic, version, self._slot_count, slot_size, _ = _HEADER.unpack_from(buf, 0)
+        if (magic, version, slot_size) != (_MAGIC, _VERSION, SLOT_SIZE):
+            raise CanInitializationError(
+                f"The shared memory of channel {self.channel_id} has an "
+                f"unsupported format"
+            )
+
+        for index in range(MAX_BUSES):
+            pid, token = _BUS.unpack_from(buf, _BUSES_OFFSET + index * _BUS.size)
+            if not token or not _is_alive(pid):
+                break
+        else:
+            raise CanInitializationError(
+                f"There are already {MAX_BUSES} buses connected to "
+                f"channel {self.channel_id}"
+            )
+
+        self._index = index
+        fifo_path = self._fifo_path(index)
+        if os.path.exists(fifo_path):
+            # left behind by a process that did not shut down its bus
+            os.unlink(fifo_path)
+        os.mkfifo(fifo_path, 0o600)
+        cleanup.callback(os.unlink, fifo_path)
+        self._fifo_fd = os.open(fifo_path, os.O_RDONLY | os.O_NONBLOCK)
+        cleanup.callback(os.close, self._fifo_fd)
+        # keep a writer open, so that the pipe never reports the end of file
+        self._fifo_writer_fd = os.open(fifo_path, os.O_WRONLY | os.O_NONBLOCK)
+        cleanup.callback(os.close, self._fifo_writer_fd)
+
+        self._buf = buf
+        self._sequence = _SEQUENCE.unpack_from(buf, _SEQUENCE_OFFSET)[0]
+        self._waiting_offset = _WAITING_OFFSET + index
+        # a selector on fileno() is woken up by the first message
+        buf[self._waiting_offset] = _WAKEUP[0]
+        _BUS.pack_into(buf, _BUSES_OFFSET + index * _BUS.size, os.getpid(), self._token)
+
+    def _check_if_open(self) -> None:
+        """Raises :exc:`~can.exceptions.CanOperationError` if the bus is not open.
+
+        Has to be called in every method that accesses the bus.
+        """
+        if not self._open:
+            raise CanOperationError("Cannot operate on a closed bus")
+
+    def _read(self) -> Optional[Message]:
+        """Read the next message from the ring buffer without waiting."""
+        buf = self._buf
+        slot_count = self._slot_count
+        while True:
+            sequence = self._sequence
+            write_sequence = _SEQUENCE.unpack_from(buf, _SEQUENCE_OFFSET)[0]
+            if sequence >= write_sequence:
+                return None
+            if write_sequence - sequence > slot_count:
+                # the oldest messages have already been overwritten
+                self.dropped += write_sequence - sequence - slot_count
+                sequence = write_sequence - slot_count
+
+            offset = _SLOTS_OFFSET + (sequence % slot_count) * SLOT_SIZE
+            (
+                slot_sequence,
+                timestamp,
+                arbitration_id,
+                sender,
+                flags,
+                dlc,
+                length,
+            ) = _SLOT.unpack_from(buf, offset)
+            data = bytearray(
+                buf[offset + _DATA_OFFSET : offset + _DATA_OFFSET + length]
+            )
+            self._sequence = sequence + 1
+
+            # the slot is marked with the sequence of its message after it
+            # was written, so it has been overwritten if that changed
+            if (
+                slot_sequence != sequence + 1
+                or _SEQUENCE.unpack_from(buf, offset)[0] != slot_sequence
+            ):
+                self.dropped += 1
+                continue
+
+            is_rx = sender != self._token
+            if not is_rx and not self.receive_own_messages:
+                continue
+
+            return Message(
+                timestamp=timestamp,
+                arbitration_id=arbitration_id,
+                is_extended_id=bool(flags & _FLAG_EXTENDED_ID),
+                is_remote_frame=bool(flags & _FLAG_REMOTE_FRAME),
+                is_error_frame=bool(flags & _FLAG_ERROR_FRAME),
+                channel=self.channel_id,
+                dlc=dlc,
+                data=data,
+                is_fd=bool(flags & _FLAG_FD),
+                is_rx=is_rx,
+                bitrate_switch=bool(flags & _FLAG_BITRATE_SWITCH),
+                error_state_indicator=bool(flags & _FLAG_ERROR_STATE_INDICATOR),
+            )
+
+    def _drain_fifo(self) -> None:
+        try:
+            while len(os.read(self._fifo_fd, 4096)) == 4096:
+                pass
+        except BlockingIOError:
+            pass
+
+    def _recv_internal(
+        self, timeout: Optional[float]
+    ) -> Tuple[Optional[Message], bool]:
+        self._check_if_open()
+        msg = self._read()
+        if msg is not None:
+            return msg, False
+
+        end_time = None if timeout is None else time.monotonic() + timeout
+        while True:
+            # discard old wakeups and ask the senders for a new one before
+            # checking again, so that no message can be missed
+            self._drain_fifo()
+            self._buf[self._waiting_offset] = _WAKEUP[0]
+            msg = self._read()
+            if msg is not None:
+                return msg, False
+
+            time_left = None
+            if end_time is not None:
+                time_left = end_time - time.monotonic()
+                if time_left <= 0:
+                    return None, False
+            try:
+                select.select([self._fifo_fd], [], [], time_left)
+            except (OSError, ValueError):
+                self._check_if_open()
+                raise
+
+    def send(self, msg: Message, timeout: Optional[float] = None) -> None:
+        self._check_if_open()
+
+        length = len(msg.data)
+        if length > _DATA_SIZE:
+            raise CanOperationError(
+                f"The data of the message is longer than {_DATA_SIZE} bytes"
+            )
+        timestamp = msg.timestamp if self.preserve_timestamps else time.time()
+        flags = (
+            (_FLAG_EXTENDED_ID if msg.is_extended_id else 0)
+            | (_FLAG_REMOTE_FRAME if msg.is_remote_frame else 0)
+            | (_FLAG_ERROR_FRAME if msg.is_error_frame else 0)
+            | (_FLAG_FD if msg.is_fd else 0)
+            | (_FLAG_BITRATE_SWITCH if msg.bitrate_switch else 0)
+            | (_FLAG_ERROR_STATE_INDICATOR if msg.error_state_indicator else 0)
+        )
+
+        buf = self._buf
+        slot_count = self._slot_count
+        with self._send_lock, self._channel_lock:
+            sequence = _SEQUENCE.unpack_from(buf, _SEQUENCE_OFFSET)[0]
+            offset = _SLOTS_OFFSET + (sequence % slot_count) * SLOT_SIZE
+            # invalidate the slot while it is written
+            _SEQUENCE.pack_into(buf, offset, 0)
+            _SLOT.pack_into(
+                buf,
+                offset,
+                0,
+                timestamp,
+                msg.arbitration_id,
+                self._token,
+                flags,
+                msg.dlc,
+                length,
+            )
+            buf[offset + _DATA_OFFSET : offset + _DATA_OFFSET + length] = msg.data
+            _SEQUENCE.pack_into(buf, offset, sequence + 1)
+            _SEQUENCE.pack_into(buf, _SEQUENCE_OFFSET, sequence + 1)
+
+        waiting = bytes(buf[_WAITING_OFFSET:_SLOTS_OFFSET])
+        if _WAKEUP in waiting:
+            self._wake_up(waiting)
+
+    def _wake_up(self, waiting: bytes) -> None:
+        """Write to the named pipes of all buses that wait for a message."""
+        buf = self._buf
+        index = waiting.find(_WAKEUP)
+        while index >= 0:
+            buf[_WAITING_OFFSET + index] = 0
+            _, token = _BUS.unpack_from(buf, _BUSES_OFFSET + index * _BUS.size)
+            fd = self._wakeup_fd(index, token)
+            if fd is not None:
+                try:
+                    os.write(fd, b"\x00")
+                except BlockingIOError:
+                    pass  # the pipe is full, so the bus will wake up anyway
+                except OSError:
+                    os.close(fd)
+                    del self._wakeup_fds[index]
+            index = waiting.find(_WAKEUP, index + 1)
+
+    def _wakeup_fd(self, index: int, token: int) -> Optional[int]:
+        """Return the named pipe of the bus with the given index and token."""
+        cached_token, fd = self._wakeup_fds.get(index, (0, -1))
+        if cached_token == token:
+            return fd
+        if fd >= 0:
+            os.close(fd)
+            del self._wakeup_fds[index]
+        if not token:
+            return None
+        try:
+            fd = os.open(self._fifo_path(index), os.O_WRONLY | os.O_NONBLOCK)
+        except OSError:
+            return None
+        self._wakeup_fds[index] = (token, fd)
+        return fd
+
+    def fileno(self) -> int:
+        """Return a file descriptor, which becomes readable once a message
+        is available.
+
+        It has to be used like the file descriptor of a socket: Messages are
+        read with :meth:`~can.BusABC.recv` until it returns :obj:`None`,
+        before waiting for the file descriptor to become readable again.
+        """
+        self._check_if_open()
+        return self._fifo_fd
+
+    def shutdown(self) -> None:
+        super().shutdown()
+        if not self._open:
+            return
+        self._open = False
+
+        buf = self._buf
+        with self._send_lock, self._channel_lock:
+            _BUS.pack_into(buf, _BUSES_OFFSET + self._index * _BUS.size, 0, 0)
+            buf[self._waiting_offset] = 0
+            # the last bus removes the shared memory of the channel
+            for index in range(MAX_BUSES):
+                pid, token = _BUS.unpack_from(buf, _BUSES_OFFSET + index * _BUS.size)
+                if token and _is_alive(pid):
+                    break
+            else:
+                _unlink_segment(self._segment)
+
+        os.close(self._fifo_fd)
+        os.close(self._fifo_writer_fd)
+        os.unlink(self._fifo_path(self._index))
+        for _, fd in self._wakeup_fds.values():
+            os.close(fd)
+        self._wakeup_fds.clear()
+        del self._buf, buf
+        self._segment.close()
+        os.close(self._lock_fd)
+
+    @staticmethod
+    def _detect_available_configs() -> List[AutoDetectedConfig]:
+        if fcntl is None or not hasattr(os, "mkfifo"):
+            return []
+        return [{"interface": "shm_virtual", "channel": "shm0"}]
+
+
+class _FileLock:
+    """An exclusive lock on a file, which is shared by all processes."""
+
+    def __init__(self, fd: int) -> None:
+        self._fd = fd
+
+    def __enter__(self) -> None:
+        fcntl.flock(self._fd, fcntl.LOCK_EX)
+
+    def __exit__(self, *args: Any) -> None:
+        fcntl.flock(self._fd, fcntl.LOCK_UN)
@@ -0,0 +1,217 @@
+"""
+Receives many frames from a SocketCAN socket with a single recvmmsg(2) call,
+see :meth:`can.interfaces.socketcan.SocketcanBus.recv_batch`.
+"""
+
+import ctypes
+import ctypes.util
+import errno
+import os
+import socket
+import struct
+from typing import Dict, List
+
+import can
+from can import Message
+from can.interfaces.socketcan import constants
+from can.interfaces.socketcan.utils import (
+    CMSG_SPACE_available,
+    _build_message,
+    _unpack_timestamp,
+)
+
+if CMSG_SPACE_available:
+    from can.interfaces.socketcan.utils import (
+        CMSG_HEADER_SIZE,
+        RECEIVED_ANCILLARY_BUFFER_SIZE,
+    )
+
+
+# The following structs mirror the declarations in <sys/socket.h> and <linux/can.h>
+# and are used to receive many frames with a single recvmmsg(2) call:
+#
+#     struct iovec {
+#         void  *iov_base;
+#         size_t iov_len;
+#     };
+#
+#     struct msghdr {
+#         void         *msg_name;
+#         socklen_t     msg_namelen;
+#         struct iovec *msg_iov;
+#         size_t        msg_iovlen;
+#         void         *msg_control;
+#         size_t        msg_controllen;
+#         int           msg_flags;
+#     };
+#
+#     struct mmsghdr {
+#         struct msghdr msg_hdr;
+#         unsigned int  msg_len;
+#     };
+class _IoVec(ctypes.Structure):
+    _fields_ = [
+        ("iov_base", ctypes.c_void_p),
+        ("iov_len", ctypes.c_size_t),
+    ]
+
+
+class _MsgHdr(ctypes.Structure):
+    _fields_ = [
+        ("msg_name", ctypes.c_void_p),
+        ("msg_namelen", ctypes.c_uint32),
+        ("msg_iov", ctypes.POINTER(_IoVec)),
+        ("msg_iovlen", ctypes.c_size_t),
+        ("msg_control", ctypes.c_void_p),
+        ("msg_controllen", ctypes.c_size_t),
+        ("msg_flags", ctypes.c_int),
+    ]
+
+
+class _MMsgHdr(ctypes.Structure):
+    _fields_ = [
+        ("msg_hdr", _MsgHdr),
+        ("msg_len", ctypes.c_uint),
+    ]
+
+
+# struct sockaddr_can starts with the address family followed by the interface index
+SOCKADDR_CAN_STRUCT = struct.Struct("@Hi")
+# large enough for struct sockaddr_can including the (optional) J1939 address fields
+SOCKADDR_CAN_BUFFER_SIZE = 32
+# struct cmsghdr { size_t cmsg_len; int cmsg_level; int cmsg_type; }
+CMSG_HEADER_STRUCT = struct.Struct("@Nii")
+
+try:
+    _libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+    _recvmmsg = _libc.recvmmsg
+    _recvmmsg.argtypes = [
+        ctypes.c_int,
+        ctypes.POINTER(_MMsgHdr),
+        ctypes.c_uint,
+        ctypes.c_int,
+        ctypes.c_void_p,
+    ]
+    _recvmmsg.restype = ctypes.c_int
+    recvmmsg_available = CMSG_SPACE_available
+except (OSError, AttributeError, TypeError):
+    recvmmsg_available = False
+
+
+class RecvmmsgBuffer:
+    """Preallocated buffers to receive up to ``size`` frames with one
+    recvmmsg(2) call. See :func:`capture_messages`.
+    """
+
+    def __init__(self, size: int) -> None:
+        self.size = size
+        self._frames = ctypes.create_string_buffer(constants.CANFD_MTU * size)
+        self._control = ctypes.create_string_buffer(
+            RECEIVED_ANCILLARY_BUFFER_SIZE * size
+        )
+        self._names = ctypes.create_string_buffer(SOCKADDR_CAN_BUFFER_SIZE * size)
+        self._iovecs = (_IoVec * size)()
+        self.headers = (_MMsgHdr * size)()
+
+        frames_address = ctypes.addressof(self._frames)
+        control_address = ctypes.addressof(self._control)
+        names_address = ctypes.addressof(self._names)
+        for index in range(size):
+            self._iovecs[index].iov_base = frames_address + index * constants.CANFD_MTU
+            self._iovecs[index].iov_len = constants.CANFD_MTU
+
+            header = self.headers[index].msg_hdr
+            header.msg_iov = ctypes.pointer(self._iovecs[index])
+            header.msg_iovlen = 1
+            header.msg_name = names_address + index * SOCKADDR_CAN_BUFFER_SIZE
+            header.msg_control = (
+                control_address + index * RECEIVED_ANCILLARY_BUFFER_SIZE
+            )
+        self.reset(size)
+
+        self.frames = memoryview(self._frames).cast("B")
+        self.control = memoryview(self._control).cast("B")
+        self.names = memoryview(self._names).cast("B")
+
+    def reset(self, count: int) -> None:
+        """Restore the length fields the kernel overwrote in the first ``count`` headers."""
+        for index in range(count):
+            header = self.headers[index].msg_hdr
+            header.msg_namelen = SOCKADDR_CAN_BUFFER_SIZE
+            header.msg_controllen = RECEIVED_ANCILLARY_BUFFER_SIZE
+            header.msg_flags = 0
+
+
+def capture_messages(
+    sock: socket.socket,
+    buffer: RecvmmsgBuffer,
+    max_messages: int,
+    get_channel: bool = False,
+) -> List[Message]:
+    """
+    Captures all messages that are currently available on the given socket,
+    using a single recvmmsg(2) system call. This does not block.
+
+    :param sock:
+        The socket to read the messages from.
+    :param buffer:
+        The preallocated buffer to receive the frames into.
+    :param max_messages:
+        The maximum number of messages to read. Limited to ``buffer.size``.
+    :param get_channel:
+        Find out which channel each message comes from.
+
+    :return: The received messages, which might be an empty list.
+    """
+    count = _recvmmsg(
+        sock.fileno(),
+        buffer.headers,
+        min(max_messages, buffer.size),
+        socket.MSG_DONTWAIT,
+        None,
+    )
+    if count < 0:
+        error_number = ctypes.get_errno()
+        if error_number in (errno.EAGAIN, errno.EWOULDBLOCK):
+            return []
+        raise can.CanOperationError(
+            f"Error receiving: {os.strerror(error_number)}", error_number
+        )
+
+    frames = buffer.frames
+    control = buffer.control
+    interface_names: Dict[int, str] = {}
+    messages = []
+    for index in range(count):
+        header = buffer.headers[index]
+        frame_offset = index * constants.CANFD_MTU
+        cf = frames[frame_offset : frame_offset + header.msg_len]
+
+        control_offset = index * RECEIVED_ANCILLARY_BUFFER_SIZE
+        _, cmsg_level, cmsg_type = CMSG_HEADER_STRUCT.unpack_from(
+            control, control_offset
+        )
+        assert (
+            header.msg_hdr.msg_controllen > 0
+            and cmsg_level == socket.SOL_SOCKET
+            and cmsg_type == constants.SO_TIMESTAMPNS
+        ), "received control message type that was not requested"
+        timestamp = _unpack_timestamp(control, control_offset + CMSG_HEADER_SIZE)
+
+        channel = None
+        if get_channel:
+            _, interface_index = SOCKADDR_CAN_STRUCT.unpack_from(
+                buffer.names, index * SOCKADDR_CAN_BUFFER_SIZE
+            )
+            if interface_index not in interface_names:
+                interface_names[interface_index] = socket.if_indextoname(
+                    interface_index
+                )
+            channel = interface_names[interface_index]
+
+        messages.append(
+            _build_message(cf, timestamp, header.msg_hdr.msg_flags, channel)
+        )
+
+    buffer.reset(count)
+    return messages
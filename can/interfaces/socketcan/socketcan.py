@@ -11,7 +11,6 @@ import errno
 import logging
 import select
 import socket
-import struct
 import threading
 import time
 import warnings
@@ -25,20 +24,28 @@ from can.broadcastmanager import (
     RestartableCyclicTaskABC,
 )
 from can.interfaces.socketcan import constants
-from can.interfaces.socketcan.utils import find_available_interfaces, pack_filters
+from can.interfaces.socketcan.recvmmsg import (
+    RecvmmsgBuffer,
+    capture_messages,
+    recvmmsg_available,
+)
+from can.interfaces.socketcan.utils import (  # pylint: disable=unused-import
+    CAN_FRAME_HEADER_STRUCT,
+    CMSG_SPACE_available,
+    _build_message,
+    _unpack_timestamp,
+    dissect_can_frame,  # noqa: F401
+    find_available_interfaces,
+    pack_filters,
+)
 from can.typechecking import CanFilters
 
 log = logging.getLogger(__name__)
 log_tx = log.getChild("tx")
 log_rx = log.getChild("rx")
 
-try:
-    from socket import CMSG_SPACE
-
-    CMSG_SPACE_available = True
-except ImportError:
-    CMSG_SPACE_available = False
-    log.error("socket.CMSG_SPACE not available on this platform")
+if CMSG_SPACE_available:
+    from can.interfaces.socketcan.utils import RECEIVED_ANCILLARY_BUFFER_SIZE
 
 
 # Setup BCM struct
@@ -127,14 +134,6 @@ BcmMsgHead = bcm_header_factory(
 )
 
 
-# struct module defines a binary packing format:
-# https://docs.python.org/3/library/struct.html#struct-format-strings
-# The 32bit can id is directly followed by the 8bit data link count
-# The data field is aligned on an 8 byte boundary, hence we add padding
-# which aligns the data field to an 8 byte boundary.
-CAN_FRAME_HEADER_STRUCT = struct.Struct("=IBB2x")
-
-
 def build_can_frame(msg: Message) -> bytes:
     """CAN frame packing/unpacking (see 'struct can_frame' in <linux/can.h>)
     /**
@@ -252,14 +251,6 @@ def build_bcm_update_header(can_id: int, msg_flags: int, nframes: int = 1) -> by
     )
 
 
-def dissect_can_frame(frame: bytes) -> Tuple[int, int, int, bytes]:
-    can_id, can_dlc, flags = CAN_FRAME_HEADER_STRUCT.unpack_from(frame)
-    if len(frame) != constants.CANFD_MTU:
-        # Flags not valid in non-FD frames
-        flags = 0
-    return can_id, can_dlc, flags, frame[8 : 8 + can_dlc]
-
-
 def create_bcm_socket(channel: str) -> socket.socket:
     """create a broadcast manager socket and connect to the given interface"""
     s = socket.socket(constants.PF_CAN, socket.SOCK_DGRAM, constants.CAN_BCM)
@@ -540,67 +531,15 @@ def capture_message(
             f"Error receiving: {error.strerror}", error.errno
         ) from error
 
-    can_id, can_dlc, flags, data = dissect_can_frame(cf)
-
     # Fetching the timestamp
     assert len(ancillary_data) == 1, "only requested a single extra field"
     cmsg_level, cmsg_type, cmsg_data = ancillary_data[0]
     assert (
         cmsg_level == socket.SOL_SOCKET and cmsg_type == constants.SO_TIMESTAMPNS
     ), "received control message type that was not requested"
-    # see https://man7.org/linux/man-pages/man3/timespec.3.html -> struct timespec for details
-    seconds, nanoseconds = RECEIVED_TIMESTAMP_STRUCT.unpack_from(cmsg_data)
-    if nanoseconds >= 1e9:
-        raise can.CanOperationError(
-            f"Timestamp nanoseconds field was out of range: {nanoseconds} not less than 1e9"
-        )
-    timestamp = seconds + nanoseconds * 1e-9
-
-    # EXT, RTR, ERR flags -> boolean attributes
-    #   /* special address description flags for the CAN_ID */
-    #   #define CAN_EFF_FLAG 0x80000000U /* EFF/SFF is set in the MSB */
-    #   #define CAN_RTR_FLAG 0x40000000U /* remote transmission request */
-    #   #define CAN_ERR_FLAG 0x20000000U /* error frame */
-    is_extended_frame_format = bool(can_id & constants.CAN_EFF_FLAG)
-    is_remote_transmission_request = bool(can_id & constants.CAN_RTR_FLAG)
-    is_error_frame = bool(can_id & constants.CAN_ERR_FLAG)
-    is_fd = len(cf) == constants.CANFD_MTU
-    bitrate_switch = bool(flags & constants.CANFD_BRS)
-    error_state_indicator = bool(flags & constants.CANFD_ESI)
-
-    # Section 4.7.1: MSG_DONTROUTE: set when the received frame was created on the local host.
-    is_rx = not bool(msg_flags & socket.MSG_DONTROUTE)
-
-    if is_extended_frame_format:
-        # log.debug("CAN: Extended")
-        # TODO does this depend on SFF or EFF?
-        arbitration_id = can_id & 0x1FFFFFFF
-    else:
-        # log.debug("CAN: Standard")
-        arbitration_id = can_id & 0x000007FF
-
-    msg = Message(
-        timestamp=timestamp,
-        channel=channel,
-        arbitration_id=arbitration_id,
-        is_extended_id=is_extended_frame_format,
-        is_remote_frame=is_remote_transmission_request,
-        is_error_frame=is_error_frame,
-        is_fd=is_fd,
-        is_rx=is_rx,
-        bitrate_switch=bitrate_switch,
-        error_state_indicator=error_state_indicator,
-        dlc=can_dlc,
-        data=data,
-    )
-
-    return msg
-
+    timestamp = _unpack_timestamp(cmsg_data)
 
-# Constants needed for precise handling of timestamps
-if CMSG_SPACE_available:
-    RECEIVED_TIMESTAMP_STRUCT = struct.Struct("@ll")
-    RECEIVED_ANCILLARY_BUFFER_SIZE = CMSG_SPACE(RECEIVED_TIMESTAMP_STRUCT.size)
+    return _build_message(cf, timestamp, msg_flags, channel)
 
 
 class SocketcanBus(BusABC):  # pylint: disable=abstract-method
@@ -656,6 +595,7 @@ class SocketcanBus(BusABC):  # pylint: disable=abstract-method
         self.channel_info = f"socketcan channel '{channel}'"
         self._bcm_sockets: Dict[str, socket.socket] = {}
         self._is_filtered = False
+        self._recvmmsg_buffer: Optional[RecvmmsgBuffer] = None
         self._task_id = 0
         self._task_id_guard = threading.Lock()
         self._can_protocol = CanProtocol.CAN_FD if fd else CanProtocol.CAN_20
@@ -752,6 +692,63 @@ class SocketcanBus(BusABC):  # pylint: disable=abstract-method
         # socket wasn't readable or timeout occurred
         return None, self._is_filtered
 
+    def recv_batch(
+        self, max_messages: int = 256, timeout: Optional[float] = None
+    ) -> List[Message]:
+        """Block waiting for messages and drain up to ``max_messages`` frames
+        from the socket with a single ``recvmmsg`` system call.
+
+        Falls back to :meth:`can.BusABC.recv_batch` where ``recvmmsg``
+        is not available.
+
+        See :meth:`can.BusABC.recv_batch` for details on the parameters.
+        """
+        if not recvmmsg_available:
+            return super().recv_batch(max_messages=max_messages, timeout=timeout)
+
+        if max_messages < 1:
+            raise ValueError(f"max_messages must be positive, got {max_messages}")
+
+        if self._recvmmsg_buffer is None or self._recvmmsg_buffer.size < max_messages:
+            self._recvmmsg_buffer = RecvmmsgBuffer(max_messages)
+
+        start = time.time()
+        time_left = timeout
+        get_channel = self.channel == ""
+
+        while True:
+            try:
+                ready_receive_sockets, _, _ = select.select(
+                    [self.socket], [], [], time_left
+                )
+            except OSError as error:
+                # something bad happened (e.g. the interface went down)
+                raise can.CanOperationError(
+                    f"Failed to receive: {error.strerror}", error.errno
+                ) from error
+
+            if ready_receive_sockets:
+                messages = capture_messages(
+                    self.socket, self._recvmmsg_buffer, max_messages, get_channel
+                )
+                if self.channel:
+                    for msg in messages:
+                        if not msg.channel:
+                            # Default to our own channel
+                            msg.channel = self.channel
+                if not self._is_filtered:
+                    messages = [msg for msg in messages if self._matches_filters(msg)]
+                if messages:
+                    if log.isEnabledFor(self.RECV_LOGGING_LEVEL):
+                        for msg in messages:
+                            log.log(self.RECV_LOGGING_LEVEL, "Received: %s", msg)
+                    return messages
+
+            if timeout is not None:
+                time_left = timeout - (time.time() - start)
+                if time_left <= 0:
+                    return []
+
     def send(self, msg: Message, timeout: Optional[float] = None) -> None:
         """Transmit a message to the CAN bus.
 
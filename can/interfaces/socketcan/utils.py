@@ -6,15 +6,39 @@ import errno
 import json
 import logging
 import os
+import socket
 import struct
 import subprocess
-from typing import List, Optional, cast
+from typing import List, Optional, Tuple, Union, cast
 
-from can import typechecking
+import can
+from can import Message, typechecking
+from can.interfaces.socketcan import constants
 from can.interfaces.socketcan.constants import CAN_EFF_FLAG
 
 log = logging.getLogger(__name__)
 
+try:
+    from socket import CMSG_SPACE
+
+    CMSG_SPACE_available = True
+except ImportError:
+    CMSG_SPACE_available = False
+    log.error("socket.CMSG_SPACE not available on this platform")
+
+# struct module defines a binary packing format:
+# https://docs.python.org/3/library/struct.html#struct-format-strings
+# The 32bit can id is directly followed by the 8bit data link count
+# The data field is aligned on an 8 byte boundary, hence we add padding
+# which aligns the data field to an 8 byte boundary.
+CAN_FRAME_HEADER_STRUCT = struct.Struct("=IBB2x")
+
+# Constants needed for precise handling of timestamps
+if CMSG_SPACE_available:
+    RECEIVED_TIMESTAMP_STRUCT = struct.Struct("@ll")
+    RECEIVED_ANCILLARY_BUFFER_SIZE = CMSG_SPACE(RECEIVED_TIMESTAMP_STRUCT.size)
+    CMSG_HEADER_SIZE = socket.CMSG_LEN(0)
+
 
 def pack_filters(can_filters: Optional[typechecking.CanFilters] = None) -> bytes:
     if can_filters is None:
@@ -82,3 +106,73 @@ def error_code_to_str(code: Optional[int]) -> str:
     description = os.strerror(code) if code is not None else "NO DESCRIPTION AVAILABLE"
 
     return f"{name} (errno {code}): {description}"
+
+
+def dissect_can_frame(frame: bytes) -> Tuple[int, int, int, bytes]:
+    can_id, can_dlc, flags = CAN_FRAME_HEADER_STRUCT.unpack_from(frame)
+    if len(frame) != constants.CANFD_MTU:
+        # Flags not valid in non-FD frames
+        flags = 0
+    return can_id, can_dlc, flags, frame[8 : 8 + can_dlc]
+
+
+def _unpack_timestamp(cmsg_data: Union[bytes, memoryview], offset: int = 0) -> float:
+    """Convert the ``struct timespec`` of a ``SO_TIMESTAMPNS`` control message
+    to seconds."""
+    # see https://man7.org/linux/man-pages/man3/timespec.3.html -> struct timespec for details
+    seconds, nanoseconds = RECEIVED_TIMESTAMP_STRUCT.unpack_from(cmsg_data, offset)
+    if nanoseconds >= 1e9:
+        raise can.CanOperationError(
+            f"Timestamp nanoseconds field was out of range: {nanoseconds} not less than 1e9"
+        )
+    return seconds + nanoseconds * 1e-9
+
+
+def _build_message(
+    cf: Union[bytes, memoryview],
+    timestamp: float,
+    msg_flags: int,
+    channel: Optional[str],
+) -> Message:
+    """Create a :class:`~can.Message` from a raw ``can_frame`` or ``canfd_frame``."""
+    can_id, can_dlc, flags, data = dissect_can_frame(cf)
+
+    # EXT, RTR, ERR flags -> boolean attributes
+    #   /* special address description flags for the CAN_ID */
+    #   #define CAN_EFF_FLAG 0x80000000U /* EFF/SFF is set in the MSB */
+    #   #define CAN_RTR_FLAG 0x40000000U /* remote transmission request */
+    #   #define CAN_ERR_FLAG 0x20000000U /* error frame */
+    is_extended_frame_format = bool(can_id & constants.CAN_EFF_FLAG)
+    is_remote_transmission_request = bool(can_id & constants.CAN_RTR_FLAG)
+    is_error_frame = bool(can_id & constants.CAN_ERR_FLAG)
+    is_fd = len(cf) == constants.CANFD_MTU
+    bitrate_switch = bool(flags & constants.CANFD_BRS)
+    error_state_indicator = bool(flags & constants.CANFD_ESI)
+
+    # Section 4.7.1: MSG_DONTROUTE: set when the received frame was created on the local host.
+    is_rx = not bool(msg_flags & socket.MSG_DONTROUTE)
+
+    if is_extended_frame_format:
+        # log.debug("CAN: Extended")
+        # TODO does this depend on SFF or EFF?
+        arbitration_id = can_id & 0x1FFFFFFF
+    else:
+        # log.debug("CAN: Standard")
+        arbitration_id = can_id & 0x000007FF
+
+    msg = Message(
+        timestamp=timestamp,
+        channel=channel,
+        arbitration_id=arbitration_id,
+        is_extended_id=is_extended_frame_format,
+        is_remote_frame=is_remote_transmission_request,
+        is_error_frame=is_error_frame,
+        is_fd=is_fd,
+        is_rx=is_rx,
+        bitrate_switch=bitrate_switch,
+        error_state_indicator=error_state_indicator,
+        dlc=can_dlc,
+        data=data,
+    )
+
+    return msg
@@ -6,13 +6,15 @@ Any VirtualBus instances connecting to the same channel
 and reside in the same process will receive the same messages.
 """
 
+import collections
 import logging
 import queue
+import threading
 import time
 from copy import deepcopy
 from random import randint
 from threading import RLock
-from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
+from typing import TYPE_CHECKING, Any, Deque, Dict, List, Optional, Tuple, Union
 
 from can import CanOperationError
 from can.bus import BusABC, CanProtocol
@@ -22,10 +24,115 @@ from can.typechecking import AutoDetectedConfig
 logger = logging.getLogger(__name__)
 
 
+_MESSAGE_ATTRIBUTES = [name for name in Message.__slots__ if name != "__weakref__"]
+
+
+class FrozenMessage(Message):
+    """A read-only :class:`~can.Message`, which is received by a
+    :class:`VirtualBus` with ``zero_copy`` enabled.
+
+    The same instance is passed to all these receivers, so its attributes can
+    not be changed and :attr:`data` is a :class:`bytes` object.
+    :func:`~copy.copy` returns a regular, mutable :class:`~can.Message`.
+    """
+
+    __slots__ = ()
+
+    @classmethod
+    def freeze(
+        cls, msg: Message, timestamp: float, channel: Any, is_rx: bool
+    ) -> "FrozenMessage":
+        """Create a read-only copy of a message.
+
+        :param msg: The message to copy.
+        :param timestamp: The timestamp of the copy.
+        :param channel: The channel of the copy.
+        :param is_rx: Whether the copy was received.
+        """
+        frozen = cls.__new__(cls)
+        set_attribute = object.__setattr__
+        set_attribute(frozen, "timestamp", timestamp)
+        set_attribute(frozen, "arbitration_id", msg.arbitration_id)
+        set_attribute(frozen, "is_extended_id", msg.is_extended_id)
+        set_attribute(frozen, "is_remote_frame", msg.is_remote_frame)
+        set_attribute(frozen, "is_error_frame", msg.is_error_frame)
+        set_attribute(frozen, "channel", channel)
+        set_attribute(frozen, "dlc", msg.dlc)
+        set_attribute(frozen, "data", bytes(msg.data))
+        set_attribute(frozen, "is_fd", msg.is_fd)
+        set_attribute(frozen, "is_rx", is_rx)
+        set_attribute(frozen, "bitrate_switch", msg.bitrate_switch)
+        set_attribute(frozen, "error_state_indicator", msg.error_state_indicator)
+        return frozen
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError(f"{type(self).__name__} is read-only")
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError(f"{type(self).__name__} is read-only")
+
+    def __reduce__(self) -> Any:
+        # unpickled as a regular message
+        msg = self.__copy__()
+        state = {name: getattr(msg, name) for name in _MESSAGE_ATTRIBUTES}
+        return Message, (), (None, state)
+
+
+class SharedMessageQueue:
+    """The reception queue of a :class:`VirtualBus` with ``zero_copy`` enabled.
+
+    It stores :class:`FrozenMessage` instances, which are shared with the other
+    receivers, in a :class:`~collections.deque` without locking. If the queue
+    has a maximum size, the oldest messages are dropped to make room for new
+    ones, so that the senders never block.
+    """
+
+    def __init__(self, maxsize: int = 0) -> None:
+        self._items: Deque[FrozenMessage] = collections.deque(maxlen=maxsize or None)
+        self._not_empty = threading.Event()
+
+    def qsize(self) -> int:
+        return len(self._items)
+
+    def put(self, msg: FrozenMessage) -> None:
+        self._items.append(msg)
+        if not self._not_empty.is_set():
+            self._not_empty.set()
+
+    def get(self, timeout: Optional[float]) -> Optional[FrozenMessage]:
+        """Return the next message, or ``None`` if there is none within
+        ``timeout`` seconds.
+        """
+        items = self._items
+        try:
+            return items.popleft()
+        except IndexError:
+            pass
+
+        end_time = None if timeout is None else time.monotonic() + timeout
+        while True:
+            self._not_empty.clear()
+            # a message might have been added before the event was cleared
+            if not items:
+                if end_time is None:
+                    self._not_empty.wait()
+                else:
+                    remaining = end_time - time.monotonic()
+                    if remaining <= 0 or not self._not_empty.wait(remaining):
+                        return None
+            try:
+                return items.popleft()
+            except IndexError:
+                # taken by another thread reading from the same bus
+                continue
+
+
 # Channels are lists of queues, one for each connection
 if TYPE_CHECKING:
     # https://mypy.readthedocs.io/en/stable/runtime_troubles.html#using-classes-that-are-generic-in-stubs-but-not-at-runtime
-    channels: Dict[Optional[Any], List[queue.Queue[Message]]] = {}
+    channels: Dict[
+        Optional[Any], List[Union[queue.Queue[Message], SharedMessageQueue]]
+    ] = {}
 else:
     channels = {}
 channels_lock = RLock()
@@ -63,6 +170,7 @@ class VirtualBus(BusABC):
         rx_queue_size: int = 0,
         preserve_timestamps: bool = False,
         protocol: CanProtocol = CanProtocol.CAN_20,
+        zero_copy: bool = False,
         **kwargs: Any,
     ) -> None:
         """
@@ -89,6 +197,11 @@ class VirtualBus(BusABC):
         :param protocol: The protocol implemented by this bus instance. The
             value does not affect the operation of the bus instance and can
             be set to an arbitrary value for testing purposes.
+        :param zero_copy: If set to True, this bus receives read-only
+            :class:`FrozenMessage` instances, which are shared with all other
+            receivers that use this option, instead of a copy of its own.
+            They are stored in a :class:`SharedMessageQueue`, so sending to
+            this bus never blocks, even if the ``rx_queue_size`` is reached.
         :param kwargs: Additional keyword arguments passed to the parent
             constructor.
         """
@@ -112,7 +225,11 @@ class VirtualBus(BusABC):
                 channels[self.channel_id] = []
             self.channel = channels[self.channel_id]
 
-            self.queue: queue.Queue[Message] = queue.Queue(rx_queue_size)
+            self.queue: Union[queue.Queue[Message], SharedMessageQueue]
+            if zero_copy:
+                self.queue = SharedMessageQueue(rx_queue_size)
+            else:
+                self.queue = queue.Queue(rx_queue_size)
             self.channel.append(self.queue)
 
     def _check_if_open(self) -> None:
@@ -127,6 +244,8 @@ class VirtualBus(BusABC):
         self, timeout: Optional[float]
     ) -> Tuple[Optional[Message], bool]:
         self._check_if_open()
+        if isinstance(self.queue, SharedMessageQueue):
+            return self.queue.get(timeout), False
         try:
             msg = self.queue.get(block=True, timeout=timeout)
         except queue.Empty:
@@ -138,11 +257,25 @@ class VirtualBus(BusABC):
         self._check_if_open()
 
         timestamp = msg.timestamp if self.preserve_timestamps else time.time()
+        # the read-only copy shared by all receivers with zero_copy
+        shared: Optional[FrozenMessage] = None
         # Add message to all listening on this channel
         all_sent = True
         for bus_queue in self.channel:
             if bus_queue is self.queue and not self.receive_own_messages:
                 continue
+            if isinstance(bus_queue, SharedMessageQueue):
+                if bus_queue is self.queue:
+                    bus_queue.put(
+                        FrozenMessage.freeze(msg, timestamp, self.channel_id, False)
+                    )
+                else:
+                    if shared is None:
+                        shared = FrozenMessage.freeze(
+                            msg, timestamp, self.channel_id, True
+                        )
+                    bus_queue.put(shared)
+                continue
             msg_copy = deepcopy(msg)
             msg_copy.timestamp = timestamp
             msg_copy.channel = self.channel_id
@@ -4,11 +4,15 @@ and Writers based off the file extension.
 """
 
 __all__ = [
+    "ArrowReader",
+    "ArrowWriter",
     "ASCReader",
     "ASCWriter",
     "BaseRotatingLogger",
     "BLFReader",
     "BLFWriter",
+    "CANBReader",
+    "CANBWriter",
     "CanutilsLogReader",
     "CanutilsLogWriter",
     "CSVReader",
@@ -20,7 +24,10 @@ __all__ = [
     "MessageSync",
     "MF4Reader",
     "MF4Writer",
+    "ParquetReader",
+    "ParquetWriter",
     "Printer",
+    "SHARDED_MESSAGE_READERS",
     "SizedRotatingLogger",
     "SqliteReader",
     "SqliteWriter",
@@ -29,11 +36,15 @@ __all__ = [
     "TRCWriter",
     "asc",
     "blf",
+    "canb",
     "canutils",
     "csv",
     "generic",
     "logger",
+    "merge_logs",
     "mf4",
+    "parallel_read",
+    "parquet",
     "player",
     "printer",
     "sqlite",
@@ -42,16 +53,25 @@ __all__ = [
 
 # Generic
 from .logger import MESSAGE_WRITERS, BaseRotatingLogger, Logger, SizedRotatingLogger
-from .player import MESSAGE_READERS, LogReader, MessageSync
+from .player import (
+    MESSAGE_READERS,
+    SHARDED_MESSAGE_READERS,
+    LogReader,
+    MessageSync,
+    merge_logs,
+    parallel_read,
+)
 
 # isort: split
 
 # Format specific
 from .asc import ASCReader, ASCWriter
 from .blf import BLFReader, BLFWriter
+from .canb import CANBReader, CANBWriter
 from .canutils import CanutilsLogReader, CanutilsLogWriter
 from .csv import CSVReader, CSVWriter
 from .mf4 import MF4Reader, MF4Writer
+from .parquet import ArrowReader, ArrowWriter, ParquetReader, ParquetWriter
 from .printer import Printer
 from .sqlite import SqliteReader, SqliteWriter
 from .trc import TRCFileVersion, TRCReader, TRCWriter
@@ -0,0 +1,450 @@
+"""
+Access to the log containers of BLF files, which is used by :mod:`can.io.blf`.
+
+Regular files are memory-mapped, so the log containers can be decompressed
+directly from the mapping. An index of the time range of every container
+allows to skip the containers outside of a requested range, and the
+containers can be decoded in a pool of processes.
+"""
+
+import bisect
+import collections
+import concurrent.futures
+import logging
+import mmap
+import os
+import struct
+import zlib
+from typing import (
+    Any,
+    BinaryIO,
+    Callable,
+    Deque,
+    Generator,
+    Iterable,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+    TypeVar,
+    cast,
+)
+
+from ..typechecking import StringPathLike
+
+LOG = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class BLFParseError(Exception):
+    """BLF file could not be parsed correctly."""
+
+
+# signature ("LOBJ"), header size, header version, object size, object type
+OBJ_HEADER_BASE_STRUCT = struct.Struct("<4sHHLL")
+
+# flags, client index, object version, timestamp
+OBJ_HEADER_V1_STRUCT = struct.Struct("<LHHQ")
+
+# flags, timestamp status, object version, timestamp, (original timestamp)
+OBJ_HEADER_V2_STRUCT = struct.Struct("<LBxHQ8x")
+
+# compression method, size uncompressed
+LOG_CONTAINER_STRUCT = struct.Struct("<H6xL4x")
+
+# signature ("BLFI"), index version, size and modification time of the BLF file,
+# count of containers
+INDEX_HEADER_STRUCT = struct.Struct("<4sHQQL")
+
+# container offset, first timestamp, last timestamp, skip
+INDEX_ENTRY_STRUCT = struct.Struct("<Qddl")
+
+INDEX_VERSION = 1
+
+LOG_CONTAINER = 10
+
+NO_COMPRESSION = 0
+ZLIB_DEFLATE = 2
+
+#: The buffer, start and end position of the compressed data of a log
+#: container, and the number of uncompressed bytes to skip
+ContainerBody = Tuple[Any, int, int, int]
+
+
+def unpack_container(
+    buffer: Any, start: int, end: int
+) -> Optional[Tuple[Any, int, int]]:
+    """Return the uncompressed data of the log container stored in
+    ``buffer[start:end]`` as a tuple of buffer, start and end position.
+
+    Uncompressed data is not copied.
+    """
+    method, _ = LOG_CONTAINER_STRUCT.unpack_from(buffer, start)
+    start += LOG_CONTAINER_STRUCT.size
+    if method == NO_COMPRESSION:
+        return buffer, start, end
+    if method == ZLIB_DEFLATE:
+        with memoryview(buffer)[start:end] as view:
+            data = zlib.decompressobj().decompress(view)
+        return data, 0, len(data)
+    # Unknown compression method
+    LOG.warning("Unknown compression method (%d)", method)
+    return None
+
+
+def read_containers(file: BinaryIO) -> Generator[ContainerBody, None, None]:
+    """Read the log containers of a file sequentially."""
+    while True:
+        data = file.read(OBJ_HEADER_BASE_STRUCT.size)
+        if not data:
+            # EOF
+            break
+
+        signature, _, _, obj_size, obj_type = OBJ_HEADER_BASE_STRUCT.unpack(data)
+        if signature != b"LOBJ":
+            raise BLFParseError()
+        obj_data = file.read(obj_size - OBJ_HEADER_BASE_STRUCT.size)
+        # Read padding bytes
+        file.read(obj_size % 4)
+
+        if obj_type == LOG_CONTAINER:
+            yield obj_data, 0, len(obj_data), 0
+
+
+def compress_container(data: Any, compression_level: int) -> Tuple[int, Any]:
+    """Return the compression method and the compressed data of a container."""
+    if not compression_level:
+        return NO_COMPRESSION, data
+    return ZLIB_DEFLATE, zlib.compress(data, compression_level)
+
+
+def _scan_objects(
+    data: bytes, start_timestamp: float
+) -> Tuple[List[Tuple[int, float]], int]:
+    """Find the position and absolute timestamp of all complete objects
+    in *data*.
+
+    :return: the objects and the position of the remaining data
+    """
+    objects: List[Tuple[int, float]] = []
+    max_pos = len(data)
+    pos = 0
+    while True:
+        remaining = pos
+        pos = data.find(b"LOBJ", pos, pos + 8)
+        if pos < 0:
+            if remaining + 8 > max_pos:
+                return objects, remaining
+            raise BLFParseError("Could not find next object")
+        if pos + OBJ_HEADER_BASE_STRUCT.size > max_pos:
+            return objects, remaining
+        _, _, header_version, obj_size, _ = OBJ_HEADER_BASE_STRUCT.unpack_from(
+            data, pos
+        )
+        next_pos = pos + obj_size
+        if next_pos > max_pos:
+            return objects, remaining
+        if header_version == 1:
+            flags, _, _, timestamp = OBJ_HEADER_V1_STRUCT.unpack_from(
+                data, pos + OBJ_HEADER_BASE_STRUCT.size
+            )
+        elif header_version == 2:
+            flags, _, _, timestamp = OBJ_HEADER_V2_STRUCT.unpack_from(
+                data, pos + OBJ_HEADER_BASE_STRUCT.size
+            )
+        else:
+            pos = next_pos
+            continue
+        factor = 1e-5 if flags == 1 else 1e-9
+        objects.append((pos, timestamp * factor + start_timestamp))
+        pos = next_pos
+
+
+class LogContainerInfo(NamedTuple):
+    """Location and time range of a log container within a BLF file."""
+
+    #: Position of the container object in the file
+    offset: int
+    #: Earliest timestamp of the objects starting in this container, or `None`
+    #: if no object starts in it
+    first_timestamp: Optional[float]
+    #: Latest timestamp of the objects starting in this container, or `None`
+    last_timestamp: Optional[float]
+    #: Position of the first object starting in the uncompressed container data.
+    #: The bytes before belong to an object from a previous container.
+    skip: int
+
+
+class MappedContainers:
+    """The log containers of a memory-mapped BLF file.
+
+    :param file: the opened BLF file
+    :param header_size: the size of the file header
+    :param start_timestamp: the start timestamp of the file header
+    :param index_file:
+        A path to cache the container index in, see :attr:`index`.
+    :raises OSError: if the file cannot be memory-mapped
+    :raises ValueError: if the file is empty
+    """
+
+    def __init__(
+        self,
+        file: BinaryIO,
+        header_size: int,
+        start_timestamp: float,
+        index_file: Optional[StringPathLike] = None,
+    ) -> None:
+        self._file = file
+        self._header_size = header_size
+        self._start_timestamp = start_timestamp
+        self._index_file = index_file
+        self._index: Optional[List[LogContainerInfo]] = None
+        self._mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    @property
+    def index(self) -> List[LogContainerInfo]:
+        """The index of all log containers in the file.
+
+        It is built on first access, or loaded from the *index_file*.
+        """
+        if self._index is None:
+            if self._index_file is not None:
+                self._index = self._load_index(self._index_file)
+            if self._index is None:
+                self._index = self.build_index()
+                if self._index_file is not None:
+                    self._save_index(self._index_file, self._index)
+        return self._index
+
+    def bodies(
+        self, start: Optional[float], stop: Optional[float]
+    ) -> Generator[ContainerBody, None, None]:
+        """Yield the log containers which can contain messages between
+        *start* and *stop*.
+
+        The index is only used if *start* or *stop* is given.
+        """
+        if start is None and stop is None:
+            for _, body_start, body_end in self.walk(self._header_size):
+                yield self._mmap, body_start, body_end, 0
+            return
+
+        index = self.index
+        selected = [
+            number
+            for number, info in enumerate(index)
+            if info.first_timestamp is not None
+            and (stop is None or info.first_timestamp < stop)
+            and (start is None or cast(float, info.last_timestamp) >= start)
+        ]
+        if not selected:
+            return
+        first, last = selected[0], selected[-1]
+        # The last object of the last selected container might continue
+        # in the next one
+        for number in range(first, min(last + 2, len(index))):
+            body_start, body_end = self.body(index[number].offset)
+            # Skip the end of an object from a previous container
+            skip = index[first].skip if number == first else 0
+            yield self._mmap, body_start, body_end, skip
+
+    def walk(self, offset: int) -> Generator[Tuple[int, int, int], None, None]:
+        """Yield the offset and the start and end position of the compressed
+        data of every log container starting at *offset*."""
+        mapped = self._mmap
+        size = len(mapped)
+        while offset + OBJ_HEADER_BASE_STRUCT.size <= size:
+            signature, _, _, obj_size, obj_type = OBJ_HEADER_BASE_STRUCT.unpack_from(
+                mapped, offset
+            )
+            if signature != b"LOBJ":
+                raise BLFParseError()
+            if obj_type == LOG_CONTAINER:
+                yield (offset, *self.body(offset))
+            offset += obj_size + obj_size % 4
+
+    def body(self, offset: int) -> Tuple[int, int]:
+        """Return the start and end position of the log container at *offset*,
+        without the object header."""
+        mapped = self._mmap
+        obj_size = OBJ_HEADER_BASE_STRUCT.unpack_from(mapped, offset)[3]
+        return offset + OBJ_HEADER_BASE_STRUCT.size, min(offset + obj_size, len(mapped))
+
+    def build_index(self) -> List[LogContainerInfo]:
+        """Decompress all log containers to find their time ranges."""
+        index: List[LogContainerInfo] = []
+        # Position of each container within the concatenated uncompressed data
+        container_starts: List[int] = []
+        stream_pos = 0
+        tail = b""
+        for offset, body_start, body_end in self.walk(self._header_size):
+            container = unpack_container(self._mmap, body_start, body_end)
+            if container is None:
+                continue
+            data, pos, end = container
+            index.append(LogContainerInfo(offset, None, None, -1))
+            container_starts.append(stream_pos)
+            stream_pos += end - pos
+
+            buffer = b"".join((tail, data[pos:end]))
+            buffer_start = stream_pos - len(buffer)
+            objects, remaining = _scan_objects(buffer, self._start_timestamp)
+            for obj_pos, timestamp in objects:
+                # Objects are assigned to the container in which they start
+                obj_stream_pos = buffer_start + obj_pos
+                owner = bisect.bisect_right(container_starts, obj_stream_pos) - 1
+                info = index[owner]
+                if info.first_timestamp is None:
+                    index[owner] = LogContainerInfo(
+                        offset=info.offset,
+                        first_timestamp=timestamp,
+                        last_timestamp=timestamp,
+                        skip=obj_stream_pos - container_starts[owner],
+                    )
+                else:
+                    index[owner] = info._replace(
+                        first_timestamp=min(info.first_timestamp, timestamp),
+                        last_timestamp=max(cast(float, info.last_timestamp), timestamp),
+                    )
+            tail = buffer[remaining:]
+        return index
+
+    def _load_index(self, path: StringPathLike) -> Optional[List[LogContainerInfo]]:
+        stat = os.fstat(self._file.fileno())
+        try:
+            with open(path, "rb") as index_file:
+                data = index_file.read()
+            signature, version, size, mtime, count = INDEX_HEADER_STRUCT.unpack_from(
+                data
+            )
+        except (OSError, struct.error):
+            return None
+        if (
+            signature != b"BLFI"
+            or version != INDEX_VERSION
+            or size != stat.st_size
+            or mtime != stat.st_mtime_ns
+            or len(data) != INDEX_HEADER_STRUCT.size + count * INDEX_ENTRY_STRUCT.size
+        ):
+            LOG.debug("Ignoring outdated index file %s", path)
+            return None
+        index = []
+        for offset, first, last, skip in INDEX_ENTRY_STRUCT.iter_unpack(
+            data[INDEX_HEADER_STRUCT.size :]
+        ):
+            if skip < 0:
+                index.append(LogContainerInfo(offset, None, None, skip))
+            else:
+                index.append(LogContainerInfo(offset, first, last, skip))
+        return index
+
+    def _save_index(self, path: StringPathLike, index: List[LogContainerInfo]) -> None:
+        stat = os.fstat(self._file.fileno())
+        data = [
+            INDEX_HEADER_STRUCT.pack(
+                b"BLFI", INDEX_VERSION, stat.st_size, stat.st_mtime_ns, len(index)
+            )
+        ]
+        for info in index:
+            data.append(
+                INDEX_ENTRY_STRUCT.pack(
+                    info.offset,
+                    0.0 if info.first_timestamp is None else info.first_timestamp,
+                    0.0 if info.last_timestamp is None else info.last_timestamp,
+                    info.skip,
+                )
+            )
+        try:
+            with open(path, "wb") as index_file:
+                index_file.write(b"".join(data))
+        except OSError as exc:
+            LOG.warning("Could not write index file %s: %s", path, exc)
+
+    def close(self) -> None:
+        """Unmap the file."""
+        self._mmap.close()
+
+
+def decode_parallel(
+    bodies: Iterable[ContainerBody],
+    workers: int,
+    decode: Callable[[bytes], Any],
+    join: Callable[[ContainerBody, Optional[concurrent.futures.Future]], T],
+) -> Generator[T, None, None]:
+    """Decode the log containers in a pool of *workers* processes.
+
+    :param bodies: the log containers to decode
+    :param workers: the number of processes
+    :param decode:
+        A picklable function, which is called with the compressed data of every
+        container that does not start with bytes to skip.
+    :param join:
+        Called in order with every container and the future of its result,
+        or `None` if it was not decoded by a worker.
+    :return: the results of *join*
+    """
+    with concurrent.futures.ProcessPoolExecutor(workers) as executor:
+        pending: Deque[
+            Tuple[ContainerBody, Optional[concurrent.futures.Future]]
+        ] = collections.deque()
+        for body in bodies:
+            buffer, start, end, skip = body
+            future = None
+            if not skip:
+                future = executor.submit(decode, buffer[start:end])
+            pending.append((body, future))
+            # Limit the number of containers in memory
+            if len(pending) > 2 * workers:
+                yield join(*pending.popleft())
+        while pending:
+            yield join(*pending.popleft())
+
+
+class CompressionPool:
+    """Compresses log containers in a pool of threads.
+
+    :param workers: the number of threads
+    :param compression_level: see :func:`compress_container`
+    """
+
+    def __init__(self, workers: int, compression_level: int) -> None:
+        self.workers = workers
+        self._compression_level = compression_level
+        self._executor = concurrent.futures.ThreadPoolExecutor(
+            workers, thread_name_prefix="BLFWriter"
+        )
+        # Containers being compressed and their uncompressed size
+        self._pending: Deque[
+            Tuple[concurrent.futures.Future, int]
+        ] = collections.deque()
+
+    def submit(self, data: bytes) -> None:
+        """Start compressing the uncompressed *data* of a container."""
+        future = self._executor.submit(
+            compress_container, data, self._compression_level
+        )
+        self._pending.append((future, len(data)))
+
+    def completed(
+        self, max_pending: int
+    ) -> Generator[Tuple[int, Any, int], None, None]:
+        """Yield the compression method, the compressed data and the
+        uncompressed size of the compressed containers in order, and wait
+        until at most *max_pending* containers are left."""
+        pending = self._pending
+        while pending and (len(pending) > max_pending or pending[0][0].done()):
+            future, uncompressed_size = pending.popleft()
+            method, data = future.result()
+            yield method, data, uncompressed_size
+
+    def pending_size(self) -> int:
+        """Return the size of the containers which are not written yet."""
+        return sum(
+            len(future.result()[1]) if future.done() else uncompressed_size
+            for future, uncompressed_size in self._pending
+        )
+
+    def shutdown(self) -> None:
+        """Wait for the threads to finish."""
+        self._executor.shutdown()
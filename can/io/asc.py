@@ -8,7 +8,7 @@ Example .asc files:
 import logging
 import re
 from datetime import datetime
-from typing import Any, Dict, Final, Generator, List, Optional, TextIO, Union
+from typing import Any, Dict, Final, Generator, Iterable, List, Optional, TextIO, Union
 
 from ..message import Message
 from ..typechecking import StringPathLike
@@ -26,8 +26,23 @@ ASC_MESSAGE_REGEX: Final = re.compile(
     r"\d+\.\d+\s+(\d+\s+(\w+\s+(Tx|Rx)|ErrorFrame)|CANFD)",
     re.ASCII | re.IGNORECASE,
 )
+# Returned by the fast line parser for messages which are filtered out
+_SKIPPED: Final = Message()
 
 
+def _byte_table(base: int) -> Dict[str, int]:
+    """Map the string representations of all byte values in *base* to the values."""
+    if base == BASE_HEX:
+        return {
+            format(value, spec): value
+            for value in range(256)
+            for spec in ("x", "X", "02x", "02X")
+        }
+    return {str(value): value for value in range(256)}
+
+
+_BYTE_TABLES: Final = {BASE_HEX: _byte_table(BASE_HEX), BASE_DEC: _byte_table(BASE_DEC)}
+
 logger = logging.getLogger("can.io.asc")
 
 
@@ -57,7 +72,7 @@ class ASCReader(TextIOMessageReader):
                      `relative` (starting at 0.0) or `absolute` (starting at
                      the system time). Default `True = relative`.
         """
-        super().__init__(file, mode="r")
+        super().__init__(file, mode="r", **kwargs)
 
         if not self.file:
             raise ValueError("The given file cannot be None")
@@ -259,10 +274,130 @@ class ASCReader(TextIOMessageReader):
 
         return Message(**msg_kwargs)
 
+    def _parse_message_fast(self, line: str) -> Optional[Message]:
+        """Parse the common lines of classic and CAN FD data frames.
+
+        Only the fields up to the data bytes are split. The data bytes are
+        converted at once if they have the usual format of two hex digits
+        separated by a single space.
+
+        :return: the message, `_SKIPPED` if the message is filtered out or
+                 `None` if the line has to be parsed by the slower, regular
+                 expression based parser
+        """
+        try:
+            (
+                timestamp,
+                channel,
+                can_id_str,
+                direction,
+                frame_type,
+                dlc_str,
+                rest,
+            ) = line.split(None, 6)
+            base = self._converted_base
+            if channel == "CANFD":
+                # Except for the direction, the fields are shifted by one
+                # compared to classic frames
+                channel, can_id_str, brs = can_id_str, frame_type, dlc_str
+                if brs.isdigit():
+                    esi, dlc_str, data_length_str, rest = rest.split(None, 3)
+                else:
+                    # Skip the symbolic name
+                    brs, esi, dlc_str, data_length_str, rest = rest.split(None, 4)
+                data_length = int(data_length_str)
+                # Remote frames and invalid lengths are not supported
+                supported = data_length != 0 and (
+                    dlc2len(int(dlc_str, base)) == data_length
+                )
+                is_fd = True
+            else:
+                supported = frame_type in ("d", "D")
+                data_length = dlc2len(int(dlc_str, base))
+                brs = esi = "0"
+                is_fd = False
+            integer, dot, fraction = timestamp.partition(".")
+            if not (
+                supported
+                and dot
+                and integer.isdigit()
+                and fraction.isdigit()
+                and channel.isdigit()
+                and direction in ("Rx", "Tx")
+            ):
+                return None
+
+            if can_id_str[-1:] in ("x", "X"):
+                is_extended_id = True
+                arbitration_id = int(can_id_str[:-1], base)
+            else:
+                is_extended_id = False
+                arbitration_id = int(can_id_str, base)
+
+            msg_timestamp = float(timestamp) + self.start_time
+            # See ASCWriter
+            msg_channel = int(channel) - 1
+            if self._filtering and not self._accepts(
+                msg_timestamp, arbitration_id, is_extended_id, msg_channel
+            ):
+                return _SKIPPED
+
+            # Classic frames contain at most 8 data bytes
+            length = data_length if is_fd else min(8, data_length)
+            if base == BASE_HEX:
+                data = (
+                    bytearray.fromhex(rest[: 3 * length - 1]) if length else bytearray()
+                )
+                if len(data) != length:
+                    return None
+            else:
+                data = bytearray(
+                    map(
+                        _BYTE_TABLES[base].__getitem__,
+                        rest.split(None, length)[:length],
+                    )
+                )
+            return Message(
+                msg_timestamp,
+                arbitration_id,
+                is_extended_id,
+                False,
+                False,
+                msg_channel,
+                data_length,
+                data,
+                is_fd,
+                direction == "Rx",
+                brs == "1",
+                esi == "1",
+            )
+        except (KeyError, ValueError):
+            return None
+
     def __iter__(self) -> Generator[Message, None, None]:
+        yield from self.read_lines(self.file)
+        self.stop()
+
+    def read_lines(self, lines: Iterable[str]) -> Generator[Message, None, None]:
+        """Read the header of the file and then parse the given lines instead
+        of the rest of the file.
+
+        This is used by :func:`~can.io.player.parallel_read` to parse a part
+        of a large file.
+        """
         self._extract_header()
+        yield from self._parse_lines(lines)
+
+    def _parse_lines(self, lines: Iterable[str]) -> Generator[Message, None, None]:
+        """Parse the lines following the header."""
+        parse_message_fast = self._parse_message_fast
+        for _line in lines:
+            msg = parse_message_fast(_line)
+            if msg is not None:
+                if msg is not _SKIPPED:
+                    yield msg
+                continue
 
-        for _line in self.file:
             line = _line.strip()
 
             if trigger_match := ASC_TRIGGER_REGEX.match(line):
@@ -300,11 +435,9 @@ class ASCReader(TextIOMessageReader):
                 msg = self._process_classic_can_frame(rest_of_message, msg_kwargs)
             else:
                 msg = self._process_fd_can_frame(rest_of_message, msg_kwargs)
-            if msg is not None:
+            if msg is not None and (not self._filtering or self._accepts_message(msg)):
                 yield msg
 
-        self.stop()
-
 
 class ASCWriter(TextIOMessageWriter):
     """Logs CAN data to an ASCII log file (.asc).
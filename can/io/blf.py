@@ -12,25 +12,53 @@ of uncompressed data each. This data contains the actual CAN messages and other
 objects types.
 """
 
+import concurrent.futures
 import datetime
+import functools
+import io
 import logging
 import struct
 import time
-import zlib
-from typing import Any, BinaryIO, Generator, List, Optional, Tuple, Union, cast
+from typing import (
+    Any,
+    BinaryIO,
+    Callable,
+    Dict,
+    Generator,
+    Iterable,
+    List,
+    Optional,
+    Tuple,
+    Union,
+    cast,
+)
 
 from ..message import Message
-from ..typechecking import StringPathLike
+from ..typechecking import Channel, StringPathLike
 from ..util import channel2int, dlc2len, len2dlc
+from ._blf_container import (
+    LOG_CONTAINER,
+    LOG_CONTAINER_STRUCT,
+    NO_COMPRESSION,
+    OBJ_HEADER_BASE_STRUCT,
+    OBJ_HEADER_V1_STRUCT,
+    OBJ_HEADER_V2_STRUCT,
+    ZLIB_DEFLATE,
+    BLFParseError,
+    CompressionPool,
+    ContainerBody,
+    LogContainerInfo,
+    MappedContainers,
+    compress_container,
+    decode_parallel,
+    read_containers,
+    unpack_container,
+)
 from .generic import BinaryIOMessageReader, FileIOMessageWriter
 
 TSystemTime = Tuple[int, int, int, int, int, int, int, int]
 
 
-class BLFParseError(Exception):
-    """BLF file could not be parsed correctly."""
-
-
 LOG = logging.getLogger(__name__)
 
 # signature ("LOGG"), header size,
@@ -43,18 +71,6 @@ FILE_HEADER_STRUCT = struct.Struct("<4sLBBBBBBBBQQLL8H8H")
 # Pad file header to this size
 FILE_HEADER_SIZE = 144
 
-# signature ("LOBJ"), header size, header version, object size, object type
-OBJ_HEADER_BASE_STRUCT = struct.Struct("<4sHHLL")
-
-# flags, client index, object version, timestamp
-OBJ_HEADER_V1_STRUCT = struct.Struct("<LHHQ")
-
-# flags, timestamp status, object version, timestamp, (original timestamp)
-OBJ_HEADER_V2_STRUCT = struct.Struct("<LBxHQ8x")
-
-# compression method, size uncompressed
-LOG_CONTAINER_STRUCT = struct.Struct("<H6xL4x")
-
 # channel, flags, dlc, arbitration id, data
 CAN_MSG_STRUCT = struct.Struct("<HBBL8s")
 
@@ -77,17 +93,26 @@ CAN_ERROR_EXT_STRUCT = struct.Struct("<HHLBBBxLLH2x8s")
 GLOBAL_MARKER_STRUCT = struct.Struct("<LLL3xBLLL12x")
 
 
+OBJ_HEADER_SIZE = OBJ_HEADER_BASE_STRUCT.size + OBJ_HEADER_V1_STRUCT.size
+
+# Complete objects as written by BLFWriter, the object header (base and
+# version 1) followed by the data of the structs above
+_OBJ_HEADER_FORMAT = "<4sHHLL" + "LHHQ"
+CAN_MSG_OBJ_STRUCT = struct.Struct(_OBJ_HEADER_FORMAT + "HBBL8s")
+CAN_FD_MSG_OBJ_STRUCT = struct.Struct(_OBJ_HEADER_FORMAT + "HBBLLBBB5x64s")
+CAN_ERROR_EXT_OBJ_STRUCT = struct.Struct(_OBJ_HEADER_FORMAT + "HHLBBBxLLH2x8s")
+
+MAX_MESSAGE_OBJECT_SIZE = max(
+    CAN_MSG_OBJ_STRUCT.size, CAN_FD_MSG_OBJ_STRUCT.size, CAN_ERROR_EXT_OBJ_STRUCT.size
+)
+
 CAN_MESSAGE = 1
-LOG_CONTAINER = 10
 CAN_ERROR_EXT = 73
 CAN_MESSAGE2 = 86
 GLOBAL_MARKER = 96
 CAN_FD_MESSAGE = 100
 CAN_FD_MESSAGE_64 = 101
 
-NO_COMPRESSION = 0
-ZLIB_DEFLATE = 2
-
 CAN_MSG_EXT = 0x80000000
 REMOTE_FLAG = 0x80
 EDL = 0x1
@@ -132,82 +157,49 @@ def systemtime_to_timestamp(systemtime: TSystemTime) -> float:
         return 0
 
 
-class BLFReader(BinaryIOMessageReader):
-    """
-    Iterator of CAN messages from a Binary Logging File.
-
-    Only CAN messages and error frames are supported. Other object types are
-    silently ignored.
-    """
-
-    file: BinaryIO
-
-    def __init__(
-        self,
-        file: Union[StringPathLike, BinaryIO],
-        **kwargs: Any,
-    ) -> None:
-        """
-        :param file: a path-like object or as file-like object to read from
-                     If this is a file-like object, is has to opened in binary
-                     read mode, not text read mode.
-        """
-        super().__init__(file, mode="rb")
-        data = self.file.read(FILE_HEADER_STRUCT.size)
-        header = FILE_HEADER_STRUCT.unpack(data)
-        if header[0] != b"LOGG":
-            raise BLFParseError("Unexpected file format")
-        self.file_size = header[10]
-        self.uncompressed_size = header[11]
-        self.object_count = header[12]
-        self.start_timestamp = systemtime_to_timestamp(cast(TSystemTime, header[14:22]))
-        self.stop_timestamp = systemtime_to_timestamp(cast(TSystemTime, header[22:30]))
-        # Read rest of header
-        self.file.read(header[1] - FILE_HEADER_STRUCT.size)
-        self._tail = b""
-        self._pos = 0
-
-    def __iter__(self) -> Generator[Message, None, None]:
-        while True:
-            data = self.file.read(OBJ_HEADER_BASE_STRUCT.size)
-            if not data:
-                # EOF
-                break
-
-            signature, _, _, obj_size, obj_type = OBJ_HEADER_BASE_STRUCT.unpack(data)
-            if signature != b"LOBJ":
-                raise BLFParseError()
-            obj_data = self.file.read(obj_size - OBJ_HEADER_BASE_STRUCT.size)
-            # Read padding bytes
-            self.file.read(obj_size % 4)
-
-            if obj_type == LOG_CONTAINER:
-                method, _ = LOG_CONTAINER_STRUCT.unpack_from(obj_data)
-                container_data = obj_data[LOG_CONTAINER_STRUCT.size :]
-                if method == NO_COMPRESSION:
-                    data = container_data
-                elif method == ZLIB_DEFLATE:
-                    zobj = zlib.decompressobj()
-                    data = zobj.decompress(container_data)
-                else:
-                    # Unknown compression method
-                    LOG.warning("Unknown compression method (%d)", method)
-                    continue
-                yield from self._parse_container(data)
-        self.stop()
-
-    def _parse_container(self, data):
-        if self._tail:
-            data = b"".join((self._tail, data))
+class _ObjectParser:
+    """Parses the objects within the uncompressed data of log containers."""
+
+    start_timestamp = 0.0
+    _tail = b""
+    _pos = 0
+    _filtering = False
+    #: Only called if :attr:`_filtering` is set, e.g. by :class:`BLFReader`
+    _accepts: Callable[[float, int, bool, Optional[Channel]], bool]
+
+    def _parse_container(self, data, pos, end):
+        tail = self._tail
+        if tail:
+            # Complete the object that started in the previous container by
+            # only copying the missing bytes instead of the whole container
+            head = b"".join((tail, data[pos : pos + 8 + OBJ_HEADER_BASE_STRUCT.size]))
+            obj_pos = head.find(b"LOBJ", 0, 8)
+            if obj_pos < 0 or obj_pos + OBJ_HEADER_BASE_STRUCT.size > len(head):
+                if len(head) < 8 + OBJ_HEADER_BASE_STRUCT.size:
+                    # Not even the object header is complete yet
+                    self._tail = head
+                    return
+                raise BLFParseError("Could not find next object")
+            obj_size = OBJ_HEADER_BASE_STRUCT.unpack_from(head, obj_pos)[3]
+            missing = obj_pos + obj_size - len(tail)
+            if missing > end - pos:
+                # This object continues in the next container
+                self._tail = b"".join((tail, data[pos:end]))
+                return
+            self._tail = b""
+            yield from self._parse_container(
+                b"".join((tail, data[pos : pos + missing])), 0, obj_pos + obj_size
+            )
+            pos += missing
         try:
-            yield from self._parse_data(data)
+            yield from self._parse_data(data, pos, end)
         except struct.error:
             # There was not enough data in the container to unpack a struct
             pass
         # Save the remaining data that could not be processed
-        self._tail = data[self._pos :]
+        self._tail = data[self._pos : end]
 
-    def _parse_data(self, data):
+    def _parse_data(self, data, pos, max_pos):
         """Optimized inner loop by making local copies of global variables
         and class members and hardcoding some values."""
         unpack_obj_header_base = OBJ_HEADER_BASE_STRUCT.unpack_from
@@ -221,22 +213,28 @@ class BLFReader(BinaryIOMessageReader):
         unpack_can_fd_64_msg = CAN_FD_MSG_64_STRUCT.unpack_from
         can_fd_64_msg_size = CAN_FD_MSG_64_STRUCT.size
         unpack_can_error_ext = CAN_ERROR_EXT_STRUCT.unpack_from
+        find = data.find
+        filtering = self._filtering
+        if filtering:
+            accepts = self._accepts
+        # accepts is only called if filtering
+        # pylint: disable=used-before-assignment
 
         start_timestamp = self.start_timestamp
-        max_pos = len(data)
-        pos = 0
 
         # Loop until a struct unpack raises an exception
         while True:
             self._pos = pos
             # Find next object after padding (depends on object type)
-            try:
-                pos = data.index(b"LOBJ", pos, pos + 8)
-            except ValueError:
-                if pos + 8 > max_pos:
+            pos = find(b"LOBJ", pos, pos + 8)
+            if pos < 0:
+                if self._pos + 8 > max_pos:
                     # Not enough data in container
                     return
-                raise BLFParseError("Could not find next object") from None
+                raise BLFParseError("Could not find next object")
+            if pos + obj_header_base_size > max_pos:
+                # The object header continues in the next container
+                return
             header = unpack_obj_header_base(data, pos)
             # print(header)
             signature, _, header_version, obj_size, obj_type = header
@@ -268,6 +266,14 @@ class BLFReader(BinaryIOMessageReader):
 
             if obj_type in (CAN_MESSAGE, CAN_MESSAGE2):
                 channel, flags, dlc, can_id, can_data = unpack_can_msg(data, pos)
+                if filtering and not accepts(
+                    timestamp,
+                    can_id & 0x1FFFFFFF,
+                    bool(can_id & CAN_MSG_EXT),
+                    channel - 1,
+                ):
+                    pos = next_pos
+                    continue
                 yield Message(
                     timestamp=timestamp,
                     arbitration_id=can_id & 0x1FFFFFFF,
@@ -284,6 +290,14 @@ class BLFReader(BinaryIOMessageReader):
                 dlc = members[5]
                 can_id = members[7]
                 can_data = members[9]
+                if filtering and not accepts(
+                    timestamp,
+                    can_id & 0x1FFFFFFF,
+                    bool(can_id & CAN_MSG_EXT),
+                    channel - 1,
+                ):
+                    pos = next_pos
+                    continue
                 yield Message(
                     timestamp=timestamp,
                     is_error_frame=True,
@@ -306,6 +320,14 @@ class BLFReader(BinaryIOMessageReader):
                     valid_bytes,
                     can_data,
                 ) = members
+                if filtering and not accepts(
+                    timestamp,
+                    can_id & 0x1FFFFFFF,
+                    bool(can_id & CAN_MSG_EXT),
+                    channel - 1,
+                ):
+                    pos = next_pos
+                    continue
                 yield Message(
                     timestamp=timestamp,
                     arbitration_id=can_id & 0x1FFFFFFF,
@@ -337,6 +359,14 @@ class BLFReader(BinaryIOMessageReader):
                     _,
                     _,
                 ) = unpack_can_fd_64_msg(data, pos)
+                if filtering and not accepts(
+                    timestamp,
+                    can_id & 0x1FFFFFFF,
+                    bool(can_id & CAN_MSG_EXT),
+                    channel - 1,
+                ):
+                    pos = next_pos
+                    continue
                 pos += can_fd_64_msg_size
                 yield Message(
                     timestamp=timestamp,
@@ -354,6 +384,237 @@ class BLFReader(BinaryIOMessageReader):
 
             pos = next_pos
 
+    @classmethod
+    def decode_container(
+        cls, obj_data: bytes, start_timestamp: float
+    ) -> Optional[Tuple[bytes, List[tuple], bytes]]:
+        """Decompress and parse a log container in a worker process.
+
+        The container might start with the end of an object from a previous
+        container, so the first object is assumed to start at the first "LOBJ"
+        signature from which the container can be parsed. The reader checks this
+        assumption when joining the containers again.
+
+        :return:
+            the bytes before the first object, the messages as tuples of
+            :class:`~can.Message` arguments and the bytes of the last incomplete
+            object, or `None` if the container must be decoded by the reader
+        """
+        if LOG_CONTAINER_STRUCT.unpack_from(obj_data)[0] not in (
+            NO_COMPRESSION,
+            ZLIB_DEFLATE,
+        ):
+            return None
+        data, pos, end = cast(
+            Tuple[bytes, int, int], unpack_container(obj_data, 0, len(obj_data))
+        )
+        parser = cls()
+        parser.start_timestamp = start_timestamp
+        first = pos
+        while True:
+            first = data.find(b"LOBJ", first, end)
+            if first < 0:
+                # No object starts in this container
+                return None
+            try:
+                records = [
+                    (
+                        msg.timestamp,
+                        msg.arbitration_id,
+                        msg.is_extended_id,
+                        msg.is_remote_frame,
+                        msg.is_error_frame,
+                        msg.channel,
+                        msg.dlc,
+                        msg.data,
+                        msg.is_fd,
+                        msg.is_rx,
+                        msg.bitrate_switch,
+                        msg.error_state_indicator,
+                    )
+                    for msg in parser._parse_data(data, first, end)
+                ]
+            except (BLFParseError, struct.error):
+                first += 1
+                continue
+            return data[pos:first], records, data[parser._pos : end]
+
+
+class BLFReader(BinaryIOMessageReader, _ObjectParser):
+    """
+    Iterator of CAN messages from a Binary Logging File.
+
+    Only CAN messages and error frames are supported. Other object types are
+    silently ignored.
+
+    Regular files are memory-mapped and the log containers are decompressed
+    directly from the mapping. If *start* or *stop* are given, an index of all
+    log containers and their time ranges is used to skip the containers
+    outside of the requested range. Building the index requires decompressing
+    the file once, so it can be cached in a sidecar file with *index_file*.
+
+    With *workers* greater than 1, the log containers are decompressed and
+    parsed in a pool of processes. This speeds up converting large files,
+    but the overhead of starting the processes is not worth it for small ones.
+    """
+
+    file: BinaryIO
+
+    def __init__(
+        self,
+        file: Union[StringPathLike, BinaryIO],
+        start: Optional[float] = None,
+        stop: Optional[float] = None,
+        use_mmap: bool = True,
+        index_file: Optional[StringPathLike] = None,
+        workers: int = 1,
+        **kwargs: Any,
+    ) -> None:
+        """
+        :param file: a path-like object or as file-like object to read from
+                     If this is a file-like object, is has to opened in binary
+                     read mode, not text read mode.
+        :param start:
+            Only yield messages with a timestamp greater or equal to this
+            absolute timestamp.
+        :param stop:
+            Only yield messages with a timestamp less than this absolute
+            timestamp.
+        :param use_mmap:
+            Memory-map the file if it is a regular file. Other file-like
+            objects are always read sequentially.
+        :param index_file:
+            A path to cache the container index in. The index is loaded from
+            this file if it matches the BLF file, otherwise it is built and
+            written to it. Only used for memory-mapped files.
+        :param workers:
+            The number of processes which decompress and parse the log
+            containers. The messages are still yielded in order.
+        :raises ValueError: if *workers* is less than 1
+        """
+        if workers < 1:
+            raise ValueError("workers must be at least 1")
+        super().__init__(file, mode="rb", start=start, stop=stop, **kwargs)
+        data = self.file.read(FILE_HEADER_STRUCT.size)
+        header = FILE_HEADER_STRUCT.unpack(data)
+        if header[0] != b"LOGG":
+            raise BLFParseError("Unexpected file format")
+        self.file_size = header[10]
+        self.uncompressed_size = header[11]
+        self.object_count = header[12]
+        self.start_timestamp = systemtime_to_timestamp(cast(TSystemTime, header[14:22]))
+        self.stop_timestamp = systemtime_to_timestamp(cast(TSystemTime, header[22:30]))
+        # Read rest of header
+        self.file.read(header[1] - FILE_HEADER_STRUCT.size)
+        self._workers = workers
+        self._tail = b""
+        self._pos = 0
+
+        self._containers: Optional[MappedContainers] = None
+        if use_mmap and isinstance(self.file, (io.BufferedReader, io.FileIO)):
+            try:
+                self._containers = MappedContainers(
+                    self.file, header[1], self.start_timestamp, index_file
+                )
+            except (OSError, ValueError):
+                # Not a regular file
+                pass
+
+    @property
+    def container_index(self) -> List[LogContainerInfo]:
+        """The index of all log containers in the file.
+
+        It is built on first access, or loaded from the *index_file*.
+
+        :raises NotImplementedError: if the file is not memory-mapped
+        """
+        if self._containers is None:
+            raise NotImplementedError(
+                "The container index is only available for memory-mapped files"
+            )
+        return self._containers.index
+
+    def __iter__(self) -> Generator[Message, None, None]:
+        if self._containers is None:
+            bodies = read_containers(self.file)
+        else:
+            bodies = self._containers.bodies(self._start, self._stop)
+        containers: Iterable[Iterable[Message]]
+        if self._workers > 1:
+            containers = decode_parallel(
+                bodies,
+                self._workers,
+                functools.partial(
+                    _ObjectParser.decode_container, start_timestamp=self.start_timestamp
+                ),
+                self._join_container,
+            )
+        else:
+            containers = self._decode_serial(bodies)
+
+        for messages in containers:
+            yield from messages
+        self.stop()
+
+    def _decode_serial(
+        self, bodies: Iterable[ContainerBody]
+    ) -> Generator[Iterable[Message], None, None]:
+        for buffer, body_start, body_end, skip in bodies:
+            container = unpack_container(buffer, body_start, body_end)
+            if container is not None:
+                data, pos, end = container
+                yield self._parse_container(data, pos + skip, end)
+
+    def _join_container(
+        self,
+        body: ContainerBody,
+        future: Optional[concurrent.futures.Future],
+    ) -> List[Message]:
+        """Join the result of a worker process to the previous containers."""
+        result = None if future is None else future.result()
+        if result is not None:
+            head, records, tail = result
+            previous_tail = self._tail
+            self._tail = b""
+            try:
+                # Complete the object from the previous container
+                messages = list(
+                    self._parse_container(
+                        b"".join((previous_tail, head)),
+                        0,
+                        len(previous_tail) + len(head),
+                    )
+                )
+            except BLFParseError:
+                messages = None
+            # Only padding may be left if the worker found the first object
+            if messages is not None and len(self._tail) < 4:
+                if self._filtering:
+                    # The workers decode all objects
+                    accepts = self._accepts
+                    records = [
+                        record
+                        for record in records
+                        if accepts(record[0], record[1], record[2], record[5])
+                    ]
+                messages.extend(Message(*record) for record in records)
+                self._tail = tail
+                return messages
+            self._tail = previous_tail
+
+        buffer, start, end, skip = body
+        container = unpack_container(buffer, start, end)
+        if container is None:
+            return []
+        data, pos, end = container
+        return list(self._parse_container(data, pos + skip, end))
+
+    def stop(self) -> None:
+        if self._containers is not None:
+            self._containers.close()
+            self._containers = None
+        super().stop()
+
 
 class BLFWriter(FileIOMessageWriter):
     """
@@ -374,6 +635,7 @@ class BLFWriter(FileIOMessageWriter):
         append: bool = False,
         channel: int = 1,
         compression_level: int = -1,
+        compression_workers: int = 0,
         **kwargs: Any,
     ) -> None:
         """
@@ -391,7 +653,18 @@ class BLFWriter(FileIOMessageWriter):
             The default value is -1 (Z_DEFAULT_COMPRESSION).
             Z_DEFAULT_COMPRESSION represents a default compromise between
             speed and compression (currently equivalent to level 6).
+        :param compression_workers:
+            The number of threads which compress full log containers in the
+            background. By default, the containers are compressed in the thread
+            that adds the messages, e.g. the receive thread of a
+            :class:`~can.Notifier`, which is then blocked for a few milliseconds.
+            The containers are still written in order. At most twice as many
+            containers as workers are kept in memory, after that adding messages
+            blocks until the oldest container is compressed.
+        :raises ValueError: if *compression_workers* is negative
         """
+        if compression_workers < 0:
+            raise ValueError("compression_workers must not be negative")
         mode = "rb+" if append else "wb"
         try:
             super().__init__(file, mode=mode)
@@ -403,11 +676,18 @@ class BLFWriter(FileIOMessageWriter):
         assert self.file is not None
         self.channel = channel
         self.compression_level = compression_level
-        self._buffer: List[bytes] = []
         self._buffer_size = 0
+        # Cached BLF channel numbers of the message channels
+        self._channels: Dict[Any, int] = {}
+        self._pool: Optional[CompressionPool] = None
+        if compression_workers:
+            self._pool = CompressionPool(compression_workers, compression_level)
         # If max container size is located in kwargs, then update the instance
         if kwargs.get("max_container_size", False):
             self.max_container_size = kwargs["max_container_size"]
+        # The objects are packed into this buffer, which has room for one more
+        # message when the container is full
+        self._buffer = bytearray(self.max_container_size + MAX_MESSAGE_OBJECT_SIZE)
         if append:
             # Parse file header
             data = self.file.read(FILE_HEADER_STRUCT.size)
@@ -442,57 +722,146 @@ class BLFWriter(FileIOMessageWriter):
         # Pad to header size
         self.file.write(b"\x00" * (FILE_HEADER_SIZE - FILE_HEADER_STRUCT.size))
 
-    def on_message_received(self, msg):
-        channel = channel2int(msg.channel)
-        if channel is None:
-            channel = self.channel
-        else:
-            # Many interfaces start channel numbering at 0 which is invalid
-            channel += 1
-
-        arb_id = msg.arbitration_id
-        if msg.is_extended_id:
-            arb_id |= CAN_MSG_EXT
-        flags = REMOTE_FLAG if msg.is_remote_frame else 0
-        if not msg.is_rx:
-            flags |= DIR
-        can_data = bytes(msg.data)
-
-        if msg.is_error_frame:
-            data = CAN_ERROR_EXT_STRUCT.pack(
-                channel,
-                0,  # length
-                0,  # flags
-                0,  # ecc
-                0,  # position
-                len2dlc(msg.dlc),
-                0,  # frame length
-                arb_id,
-                0,  # ext flags
-                can_data,
-            )
-            self._add_object(CAN_ERROR_EXT, data, msg.timestamp)
-        elif msg.is_fd:
-            fd_flags = EDL
-            if msg.bitrate_switch:
-                fd_flags |= BRS
-            if msg.error_state_indicator:
-                fd_flags |= ESI
-            data = CAN_FD_MSG_STRUCT.pack(
-                channel,
-                flags,
-                len2dlc(msg.dlc),
-                arb_id,
-                0,
-                0,
-                fd_flags,
-                len(can_data),
-                can_data,
-            )
-            self._add_object(CAN_FD_MESSAGE, data, msg.timestamp)
-        else:
-            data = CAN_MSG_STRUCT.pack(channel, flags, msg.dlc, arb_id, can_data)
-            self._add_object(CAN_MESSAGE, data, msg.timestamp)
+    def on_message_received(self, msg: Message) -> None:
+        self.on_messages_received((msg,))
+
+    def on_messages_received(self, msgs: Iterable[Message]) -> None:
+        """Add several messages to the log file at once.
+
+        This is faster than calling :meth:`on_message_received` for every
+        message, since the objects are packed straight into the buffer of the
+        current log container.
+
+        :param msgs: the messages to log, in chronological order
+        """
+        pack_can_msg = CAN_MSG_OBJ_STRUCT.pack_into
+        can_msg_obj_size = CAN_MSG_OBJ_STRUCT.size
+        pack_can_fd_msg = CAN_FD_MSG_OBJ_STRUCT.pack_into
+        can_fd_msg_obj_size = CAN_FD_MSG_OBJ_STRUCT.size
+        pack_can_error_ext = CAN_ERROR_EXT_OBJ_STRUCT.pack_into
+        can_error_ext_obj_size = CAN_ERROR_EXT_OBJ_STRUCT.size
+        channels = self._channels
+        buffer = self._buffer
+        max_container_size = self.max_container_size
+        start_timestamp = self.start_timestamp
+        stop_timestamp = self.stop_timestamp
+        object_count = self.object_count
+        pos = self._buffer_size
+
+        for msg in msgs:
+            try:
+                channel = channels[msg.channel]
+            except KeyError:
+                channel = channels[msg.channel] = self._channel_number(msg.channel)
+            except TypeError:
+                # Channel is not hashable
+                channel = self._channel_number(msg.channel)
+
+            stop_timestamp = msg.timestamp
+            if start_timestamp is None:
+                start_timestamp = self.start_timestamp = stop_timestamp
+            timestamp = int((stop_timestamp - start_timestamp) * 1e9)
+            timestamp = max(timestamp, 0)
+
+            arb_id = msg.arbitration_id
+            if msg.is_extended_id:
+                arb_id |= CAN_MSG_EXT
+            flags = REMOTE_FLAG if msg.is_remote_frame else 0
+            if not msg.is_rx:
+                flags |= DIR
+
+            if msg.is_error_frame:
+                pack_can_error_ext(
+                    buffer,
+                    pos,
+                    b"LOBJ",
+                    OBJ_HEADER_SIZE,
+                    1,
+                    can_error_ext_obj_size,
+                    CAN_ERROR_EXT,
+                    TIME_ONE_NANS,
+                    0,
+                    0,
+                    timestamp,
+                    channel,
+                    0,  # length
+                    0,  # flags
+                    0,  # ecc
+                    0,  # position
+                    len2dlc(msg.dlc),
+                    0,  # frame length
+                    arb_id,
+                    0,  # ext flags
+                    msg.data,
+                )
+                pos += can_error_ext_obj_size
+            elif msg.is_fd:
+                fd_flags = EDL
+                if msg.bitrate_switch:
+                    fd_flags |= BRS
+                if msg.error_state_indicator:
+                    fd_flags |= ESI
+                pack_can_fd_msg(
+                    buffer,
+                    pos,
+                    b"LOBJ",
+                    OBJ_HEADER_SIZE,
+                    1,
+                    can_fd_msg_obj_size,
+                    CAN_FD_MESSAGE,
+                    TIME_ONE_NANS,
+                    0,
+                    0,
+                    timestamp,
+                    channel,
+                    flags,
+                    len2dlc(msg.dlc),
+                    arb_id,
+                    0,
+                    0,
+                    fd_flags,
+                    len(msg.data),
+                    msg.data,
+                )
+                pos += can_fd_msg_obj_size
+            else:
+                pack_can_msg(
+                    buffer,
+                    pos,
+                    b"LOBJ",
+                    OBJ_HEADER_SIZE,
+                    1,
+                    can_msg_obj_size,
+                    CAN_MESSAGE,
+                    TIME_ONE_NANS,
+                    0,
+                    0,
+                    timestamp,
+                    channel,
+                    flags,
+                    msg.dlc,
+                    arb_id,
+                    msg.data,
+                )
+                pos += can_msg_obj_size
+            object_count += 1
+
+            if pos >= max_container_size:
+                self._buffer_size = pos
+                while self._buffer_size >= max_container_size:
+                    self._flush()
+                pos = self._buffer_size
+
+        self._buffer_size = pos
+        self.stop_timestamp = stop_timestamp
+        self.object_count = object_count
+
+    def _channel_number(self, channel: Any) -> int:
+        number = channel2int(channel)
+        if number is None:
+            return self.channel
+        # Many interfaces start channel numbering at 0 which is invalid
+        return number + 1
 
     def log_event(self, text, timestamp=None):
         """Add an arbitrary message to the log file as a global marker.
@@ -522,49 +891,72 @@ class BLFWriter(FileIOMessageWriter):
             self.start_timestamp = timestamp
         self.stop_timestamp = timestamp
         timestamp = int((timestamp - self.start_timestamp) * 1e9)
-        header_size = OBJ_HEADER_BASE_STRUCT.size + OBJ_HEADER_V1_STRUCT.size
-        obj_size = header_size + len(data)
-        base_header = OBJ_HEADER_BASE_STRUCT.pack(
-            b"LOBJ", header_size, 1, obj_size, obj_type
-        )
-        obj_header = OBJ_HEADER_V1_STRUCT.pack(TIME_ONE_NANS, 0, 0, max(timestamp, 0))
-
-        self._buffer.append(base_header)
-        self._buffer.append(obj_header)
-        self._buffer.append(data)
+        obj_size = OBJ_HEADER_SIZE + len(data)
         padding_size = len(data) % 4
-        if padding_size:
-            self._buffer.append(b"\x00" * padding_size)
+        pos = self._buffer_size
+        end = pos + obj_size + padding_size
+        buffer = self._buffer
+        if end > len(buffer):
+            # Only message objects are guaranteed to fit
+            buffer.extend(bytes(end - len(buffer)))
+        OBJ_HEADER_BASE_STRUCT.pack_into(
+            buffer, pos, b"LOBJ", OBJ_HEADER_SIZE, 1, obj_size, obj_type
+        )
+        OBJ_HEADER_V1_STRUCT.pack_into(
+            buffer,
+            pos + OBJ_HEADER_BASE_STRUCT.size,
+            TIME_ONE_NANS,
+            0,
+            0,
+            max(timestamp, 0),
+        )
+        buffer[pos + OBJ_HEADER_SIZE : pos + obj_size] = data
+        buffer[pos + obj_size : end] = bytes(padding_size)
 
-        self._buffer_size += obj_size + padding_size
+        self._buffer_size = end
         self.object_count += 1
-        if self._buffer_size >= self.max_container_size:
+        while self._buffer_size >= self.max_container_size:
             self._flush()
 
     def _flush(self):
-        """Compresses and writes data in the buffer to file."""
+        """Compresses and writes one log container from the buffer to file."""
         if self.file.closed:
+            # Nothing can be written after stop()
+            self._buffer_size = 0
             return
-        buffer = b"".join(self._buffer)
-        if not buffer:
+        size = min(self._buffer_size, self.max_container_size)
+        if not size:
             # Nothing to write
             return
-        uncompressed_data = memoryview(buffer)[: self.max_container_size]
-        # Save data that comes after max size to next container
-        tail = buffer[self.max_container_size :]
-        self._buffer = [tail]
-        self._buffer_size = len(tail)
-        if not self.compression_level:
-            data = uncompressed_data
-            method = NO_COMPRESSION
-        else:
-            data = zlib.compress(uncompressed_data, self.compression_level)
-            method = ZLIB_DEFLATE
+        with memoryview(self._buffer)[:size] as uncompressed_data:
+            if self._pool is None:
+                method, data = compress_container(
+                    uncompressed_data, self.compression_level
+                )
+                self._write_container(method, data, size)
+            else:
+                # The buffer is reused, so the worker needs a copy
+                self._pool.submit(bytes(uncompressed_data))
+                self._write_compressed(2 * self._pool.workers)
+        # Move data that comes after max size to the next container
+        remaining = self._buffer_size - size
+        self._buffer[:remaining] = self._buffer[size : self._buffer_size]
+        self._buffer_size = remaining
+
+    def _write_compressed(self, max_pending: int) -> None:
+        """Write the containers compressed by the workers in order and wait
+        until at most *max_pending* containers are left."""
+        for method, data, uncompressed_size in cast(
+            CompressionPool, self._pool
+        ).completed(max_pending):
+            self._write_container(method, data, uncompressed_size)
+
+    def _write_container(self, method: int, data: Any, uncompressed_size: int) -> None:
         obj_size = OBJ_HEADER_BASE_STRUCT.size + LOG_CONTAINER_STRUCT.size + len(data)
         base_header = OBJ_HEADER_BASE_STRUCT.pack(
             b"LOBJ", OBJ_HEADER_BASE_STRUCT.size, 1, obj_size, LOG_CONTAINER
         )
-        container_header = LOG_CONTAINER_STRUCT.pack(method, len(uncompressed_data))
+        container_header = LOG_CONTAINER_STRUCT.pack(method, uncompressed_size)
         self.file.write(base_header)
         self.file.write(container_header)
         self.file.write(data)
@@ -572,15 +964,20 @@ class BLFWriter(FileIOMessageWriter):
         self.file.write(b"\x00" * (obj_size % 4))
         self.uncompressed_size += OBJ_HEADER_BASE_STRUCT.size
         self.uncompressed_size += LOG_CONTAINER_STRUCT.size
-        self.uncompressed_size += len(uncompressed_data)
+        self.uncompressed_size += uncompressed_size
 
     def file_size(self) -> int:
         """Return an estimate of the current file size in bytes."""
-        return self.file.tell() + self._buffer_size
+        pending_size = 0 if self._pool is None else self._pool.pending_size()
+        return self.file.tell() + pending_size + self._buffer_size
 
     def stop(self):
         """Stops logging and closes the file."""
-        self._flush()
+        while self._buffer_size and not self.file.closed:
+            self._flush()
+        if self._pool is not None:
+            self._write_compressed(0)
+            self._pool.shutdown()
         if self.file.seekable():
             filesize = self.file.tell()
             # Write header in the beginning of the file
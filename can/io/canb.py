@@ -0,0 +1,578 @@
+"""
+Implements the CANB format, a simple binary log format of python-can, which
+is optimized for fast appends and random access by time.
+
+The file starts with a short header, which is followed by blocks of messages.
+Every block has a header with its size, checksum and time range, and carries
+the table of channels, so that it can be decoded on its own. The payload of a
+block can be compressed. Classic CAN frames are stored as records of a fixed
+size, all other frames as records with a length prefix.
+
+When the writer is stopped, an index of all blocks is appended as footer. It
+allows the reader to find the blocks of a time range with a binary search.
+If the footer is missing, e.g. because the recording was interrupted, the
+reader scans the blocks instead and ignores an incomplete last block.
+"""
+
+import bisect
+import logging
+import struct
+import time
+import zlib
+from itertools import accumulate
+from typing import (
+    Any,
+    BinaryIO,
+    Callable,
+    Dict,
+    Generator,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+    Union,
+    cast,
+)
+
+from ..message import Message
+from ..message_batch import (
+    FLAG_BITRATE_SWITCH,
+    FLAG_ERROR_FRAME,
+    FLAG_ERROR_STATE_INDICATOR,
+    FLAG_EXTENDED_ID,
+    FLAG_FD,
+    FLAG_REMOTE_FRAME,
+    FLAG_RX,
+)
+from ..typechecking import Channel, StringPathLike
+from .generic import BinaryIOMessageReader, BinaryIOMessageWriter
+
+LOG = logging.getLogger(__name__)
+
+try:
+    import lz4.frame
+except ImportError:
+    lz4 = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None  # type: ignore[assignment]
+
+
+class CANBParseError(Exception):
+    """CANB file could not be parsed correctly."""
+
+
+# signature ("CANB"), version
+FILE_HEADER_STRUCT = struct.Struct("<4sH2x")
+
+# signature ("BLCK"), compression method, number of records,
+# stored payload size, uncompressed payload size,
+# first timestamp, last timestamp, CRC-32 of the stored payload
+BLOCK_HEADER_STRUCT = struct.Struct("<4sB3xLLLddL")
+
+# number of channels, followed by one entry per channel
+CHANNEL_TABLE_STRUCT = struct.Struct("<H")
+
+# integer channel
+CHANNEL_INT_STRUCT = struct.Struct("<Bq")
+
+# string channel, followed by its UTF-8 encoding
+CHANNEL_STR_STRUCT = struct.Struct("<BH")
+
+# timestamp, arbitration id, flags, channel index, dlc
+RECORD_PREFIX_STRUCT = struct.Struct("<dLBHB")
+
+# classic record: prefix and 8 data bytes
+CLASSIC_RECORD_STRUCT = struct.Struct("<dLBHB8s")
+
+# variable length record: prefix and data length, followed by the data
+VARIABLE_RECORD_STRUCT = struct.Struct("<dLBHBB")
+
+# block offset, first timestamp, last timestamp, number of records
+INDEX_ENTRY_STRUCT = struct.Struct("<Qddl")
+
+# index offset, number of entries, CRC-32 of the entries, signature ("CBIX")
+FOOTER_STRUCT = struct.Struct("<QLL4s")
+
+FILE_VERSION = 1
+
+NO_COMPRESSION = 0
+ZLIB = 1
+LZ4 = 2
+ZSTD = 3
+
+CHANNEL_INT = 0
+CHANNEL_STR = 1
+
+#: Channel index of messages without channel
+NO_CHANNEL = 0xFFFF
+
+#: Flag of records with a length prefix, in addition to the flags
+#: of :class:`~can.MessageBatch`
+FLAG_VARIABLE_LENGTH = 0x80
+
+
+class BlockInfo(NamedTuple):
+    """Location and time range of a block within a CANB file."""
+
+    #: Position of the block header in the file
+    offset: int
+    #: Earliest timestamp of the messages in this block
+    first_timestamp: float
+    #: Latest timestamp of the messages in this block
+    last_timestamp: float
+    #: Number of messages in this block
+    message_count: int
+
+
+def _compressor(compression: Optional[str]) -> Tuple[int, Callable[[bytes], bytes]]:
+    """Return the method number and compression function of *compression*."""
+    if compression is None:
+        return NO_COMPRESSION, bytes
+    if compression == "zlib":
+        return ZLIB, lambda data: zlib.compress(data, 1)
+    if compression == "lz4":
+        if lz4 is None:
+            raise NotImplementedError(
+                "The lz4 package was not found. Install python-can with "
+                "the optional dependency [canb] to use lz4 compression."
+            )
+        return LZ4, lz4.frame.compress
+    if compression == "zstd":
+        if zstandard is None:
+            raise NotImplementedError(
+                "The zstandard package was not found. Install python-can with "
+                "the optional dependency [canb] to use zstd compression."
+            )
+        return ZSTD, zstandard.ZstdCompressor().compress
+    raise ValueError(f"Unknown compression {compression!r}")
+
+
+def _decompress(method: int, data: bytes) -> bytes:
+    if method == NO_COMPRESSION:
+        return data
+    if method == ZLIB:
+        return zlib.decompress(data)
+    if method == LZ4 and lz4 is not None:
+        return cast(bytes, lz4.frame.decompress(data))
+    if method == ZSTD and zstandard is not None:
+        return zstandard.ZstdDecompressor().decompress(data)
+    raise CANBParseError(f"Unsupported compression method ({method})")
+
+
+def _pack_channel_table(channels: List[Channel]) -> bytes:
+    parts = [CHANNEL_TABLE_STRUCT.pack(len(channels))]
+    for channel in channels:
+        if isinstance(channel, int):
+            parts.append(CHANNEL_INT_STRUCT.pack(CHANNEL_INT, channel))
+        else:
+            name = str(channel).encode("utf-8")
+            parts.append(CHANNEL_STR_STRUCT.pack(CHANNEL_STR, len(name)))
+            parts.append(name)
+    return b"".join(parts)
+
+
+def _unpack_channel_table(data: bytes) -> Tuple[List[Channel], int]:
+    """Return the channels and the position of the first record."""
+    (count,) = CHANNEL_TABLE_STRUCT.unpack_from(data)
+    pos = CHANNEL_TABLE_STRUCT.size
+    channels: List[Channel] = []
+    for _ in range(count):
+        if data[pos] == CHANNEL_INT:
+            _, channel = CHANNEL_INT_STRUCT.unpack_from(data, pos)
+            channels.append(channel)
+            pos += CHANNEL_INT_STRUCT.size
+        else:
+            _, length = CHANNEL_STR_STRUCT.unpack_from(data, pos)
+            pos += CHANNEL_STR_STRUCT.size
+            channels.append(data[pos : pos + length].decode("utf-8"))
+            pos += length
+    return channels, pos
+
+
+def _read_footer(file: BinaryIO, size: int) -> Optional[Tuple[int, List[BlockInfo]]]:
+    """Return the position of the index and the blocks, or `None` if the
+    file has no valid footer."""
+    if size < FILE_HEADER_STRUCT.size + FOOTER_STRUCT.size:
+        return None
+    file.seek(size - FOOTER_STRUCT.size)
+    index_offset, count, crc, signature = FOOTER_STRUCT.unpack(
+        file.read(FOOTER_STRUCT.size)
+    )
+    index_size = count * INDEX_ENTRY_STRUCT.size
+    if (
+        signature != b"CBIX"
+        or index_offset < FILE_HEADER_STRUCT.size
+        or index_offset + index_size + FOOTER_STRUCT.size != size
+    ):
+        return None
+    file.seek(index_offset)
+    data = file.read(index_size)
+    if zlib.crc32(data) != crc:
+        return None
+    return index_offset, [
+        BlockInfo(*entry) for entry in INDEX_ENTRY_STRUCT.iter_unpack(data)
+    ]
+
+
+def _scan_blocks(file: BinaryIO, size: int) -> Tuple[int, List[BlockInfo]]:
+    """Find all complete blocks by reading the file from the start.
+
+    :return: the end of the last complete block and the blocks
+    """
+    blocks = []
+    pos = FILE_HEADER_STRUCT.size
+    file.seek(pos)
+    while pos + BLOCK_HEADER_STRUCT.size <= size:
+        header = file.read(BLOCK_HEADER_STRUCT.size)
+        (
+            signature,
+            _,
+            count,
+            stored_size,
+            _,
+            first,
+            last,
+            crc,
+        ) = BLOCK_HEADER_STRUCT.unpack(header)
+        end = pos + BLOCK_HEADER_STRUCT.size + stored_size
+        if signature != b"BLCK" or end > size:
+            break
+        if zlib.crc32(file.read(stored_size)) != crc:
+            break
+        blocks.append(BlockInfo(pos, first, last, count))
+        pos = end
+    if pos < size:
+        LOG.warning(
+            "Ignoring %d bytes after the last complete block at position %d",
+            size - pos,
+            pos,
+        )
+    return pos, blocks
+
+
+def _read_payload(file: BinaryIO, block: BlockInfo) -> bytes:
+    """Read, check and decompress the payload of *block*."""
+    file.seek(block.offset)
+    _, method, _, stored_size, _, _, _, crc = BLOCK_HEADER_STRUCT.unpack(
+        file.read(BLOCK_HEADER_STRUCT.size)
+    )
+    data = file.read(stored_size)
+    if zlib.crc32(data) != crc:
+        raise CANBParseError(f"Checksum error in block at position {block.offset}")
+    return _decompress(method, data)
+
+
+def _read_blocks(file: BinaryIO) -> Tuple[int, List[BlockInfo]]:
+    """Check the file header and find all blocks.
+
+    :return: the end of the last block and the blocks
+    """
+    file.seek(0, 2)
+    size = file.tell()
+    file.seek(0)
+    header = file.read(FILE_HEADER_STRUCT.size)
+    if len(header) < FILE_HEADER_STRUCT.size:
+        raise CANBParseError("The file is too short")
+    signature, version = FILE_HEADER_STRUCT.unpack(header)
+    if signature != b"CANB":
+        raise CANBParseError("Unexpected file format")
+    if version > FILE_VERSION:
+        raise CANBParseError(f"Unsupported file version ({version})")
+
+    footer = _read_footer(file, size)
+    if footer is not None:
+        return footer
+    return _scan_blocks(file, size)
+
+
+class CANBWriter(BinaryIOMessageWriter):
+    """
+    Logs CAN data to a CANB file (.canb), the binary log format of python-can.
+
+    The messages are packed into a buffer and written as one block when the
+    buffer holds *block_size* bytes, or at the latest after *flush_interval*
+    seconds. Every block is written with a single call and flushed, so after
+    a crash only the messages of the current block are lost and the file can
+    still be read and appended to.
+    """
+
+    file: BinaryIO
+
+    def __init__(
+        self,
+        file: Union[StringPathLike, BinaryIO],
+        append: bool = False,
+        compression: Optional[str] = None,
+        block_size: int = 64 * 1024,
+        flush_interval: Optional[float] = 1.0,
+        **kwargs: Any,
+    ) -> None:
+        """
+        :param file: a path-like object or as file-like object to write to
+                     If this is a file-like object, is has to opened in mode "wb+".
+        :param append:
+            Append messages to an existing log file. An incomplete last block
+            and the old footer are replaced.
+        :param compression:
+            The compression of the blocks, one of ``"zlib"``, ``"lz4"`` and
+            ``"zstd"`` or `None` to write them uncompressed, which is fastest.
+            ``"lz4"`` and ``"zstd"`` require the optional dependency ``[canb]``.
+        :param block_size:
+            The number of uncompressed bytes that are collected before
+            a block is written.
+        :param flush_interval:
+            The maximum time in seconds that messages are held back in the
+            buffer, or `None` to only write full blocks.
+        :raises ValueError: if *compression* is unknown or *block_size* is not positive
+        """
+        if block_size < 1:
+            raise ValueError(f"block_size must be positive, got {block_size}")
+        self._method, self._compress = _compressor(compression)
+
+        mode = "rb+" if append else "wb"
+        try:
+            super().__init__(file, mode=mode)
+        except FileNotFoundError:
+            # Trying to append to a non-existing file, create a new one
+            append = False
+            super().__init__(file, mode="wb")
+
+        self.block_size = block_size
+        self._flush_interval = flush_interval
+        self._channels: List[Channel] = []
+        self._channel_indices: Dict[Any, int] = {None: NO_CHANNEL}
+        self._channel_table = _pack_channel_table(self._channels)
+        self._buffer = bytearray()
+        self._count = 0
+        self._first_timestamp = float("inf")
+        self._last_timestamp = float("-inf")
+        self._last_flush = time.monotonic()
+        self.blocks: List[BlockInfo] = []
+
+        self.file.seek(0, 2)
+        if append and self.file.tell():
+            end, self.blocks = _read_blocks(self.file)
+            if self.blocks:
+                # continue with the channel numbers of the last block
+                channels, _ = _unpack_channel_table(
+                    _read_payload(self.file, self.blocks[-1])
+                )
+                for channel in channels:
+                    self._add_channel(channel)
+            # overwrite the footer or an incomplete block
+            self.file.seek(end)
+            self.file.truncate()
+        else:
+            self.file.write(FILE_HEADER_STRUCT.pack(b"CANB", FILE_VERSION))
+
+    def _add_channel(self, channel: Channel) -> int:
+        index = len(self._channels)
+        if index >= NO_CHANNEL:
+            raise ValueError(f"Too many channels to add {channel!r}")
+        self._channels.append(channel)
+        self._channel_indices[channel] = index
+        self._channel_table = _pack_channel_table(self._channels)
+        return index
+
+    def file_size(self) -> int:
+        """Return an estimate of the current file size in bytes."""
+        return self.file.tell() + len(self._buffer)
+
+    def flush(self) -> None:
+        """Write all buffered messages as one block."""
+        if not self._count:
+            return
+
+        payload = self._channel_table + self._buffer
+        data = self._compress(payload)
+        offset = self.file.tell()
+        self.file.write(
+            BLOCK_HEADER_STRUCT.pack(
+                b"BLCK",
+                self._method,
+                self._count,
+                len(data),
+                len(payload),
+                self._first_timestamp,
+                self._last_timestamp,
+                zlib.crc32(data),
+            )
+            + data
+        )
+        self.file.flush()
+        self.blocks.append(
+            BlockInfo(offset, self._first_timestamp, self._last_timestamp, self._count)
+        )
+
+        self._buffer = bytearray()
+        self._count = 0
+        self._first_timestamp = float("inf")
+        self._last_timestamp = float("-inf")
+        self._last_flush = time.monotonic()
+
+    def stop(self) -> None:
+        """Write the remaining messages and the index, and close the file."""
+        self.flush()
+        index = b"".join(INDEX_ENTRY_STRUCT.pack(*block) for block in self.blocks)
+        self.file.write(
+            index
+            + FOOTER_STRUCT.pack(
+                self.file.tell(), len(self.blocks), zlib.crc32(index), b"CBIX"
+            )
+        )
+        super().stop()
+
+    def on_message_received(self, msg: Message) -> None:
+        channel = msg.channel
+        try:
+            channel_index = self._channel_indices[channel]
+        except KeyError:
+            # the index of None is always known
+            assert channel is not None
+            channel_index = self._add_channel(channel)
+
+        flags = (
+            (FLAG_EXTENDED_ID if msg.is_extended_id else 0)
+            | (FLAG_REMOTE_FRAME if msg.is_remote_frame else 0)
+            | (FLAG_ERROR_FRAME if msg.is_error_frame else 0)
+            | (FLAG_FD if msg.is_fd else 0)
+            | (FLAG_RX if msg.is_rx else 0)
+            | (FLAG_BITRATE_SWITCH if msg.bitrate_switch else 0)
+            | (FLAG_ERROR_STATE_INDICATOR if msg.error_state_indicator else 0)
+        )
+        timestamp = msg.timestamp
+        data = msg.data
+        dlc = msg.dlc
+        if flags & (FLAG_FD | FLAG_REMOTE_FRAME) or len(data) != dlc or dlc > 8:
+            self._buffer += VARIABLE_RECORD_STRUCT.pack(
+                timestamp,
+                msg.arbitration_id,
+                flags | FLAG_VARIABLE_LENGTH,
+                channel_index,
+                dlc,
+                len(data),
+            )
+            self._buffer += data
+        else:
+            self._buffer += CLASSIC_RECORD_STRUCT.pack(
+                timestamp, msg.arbitration_id, flags, channel_index, dlc, bytes(data)
+            )
+
+        self._count += 1
+        if timestamp < self._first_timestamp:
+            self._first_timestamp = timestamp
+        if timestamp > self._last_timestamp:
+            self._last_timestamp = timestamp
+
+        if len(self._buffer) >= self.block_size or (
+            self._flush_interval is not None
+            and time.monotonic() - self._last_flush >= self._flush_interval
+        ):
+            self.flush()
+
+
+class CANBReader(BinaryIOMessageReader):
+    """
+    Iterator of CAN messages from a CANB file.
+
+    The blocks are located with the index in the footer of the file. If *start*
+    or *stop* are given, only the blocks overlapping the time range are read,
+    which are found with a binary search. Files without footer, e.g. of an
+    interrupted recording, are scanned block by block up to the last complete
+    block instead.
+    """
+
+    file: BinaryIO
+
+    def __init__(
+        self,
+        file: Union[StringPathLike, BinaryIO],
+        **kwargs: Any,
+    ) -> None:
+        """
+        :param file: a path-like object or as file-like object to read from
+                     If this is a file-like object, is has to opened in binary
+                     read mode, not text read mode.
+        :raises CANBParseError: if the file is not a CANB file
+        """
+        super().__init__(file, mode="rb", **kwargs)
+        _, self.blocks = _read_blocks(self.file)
+
+    def _block_range(self) -> Tuple[int, int]:
+        """Return the indices of the first and after the last block, which
+        might contain messages between *start* and *stop*."""
+        first, last = 0, len(self.blocks)
+        if self._start is not None:
+            # all blocks before the first one with a message at or after
+            # start can be skipped
+            latest = list(
+                accumulate((block.last_timestamp for block in self.blocks), max)
+            )
+            first = bisect.bisect_left(latest, self._start)
+        if self._stop is not None:
+            # all blocks after the last one with a message before stop
+            # can be skipped
+            earliest = list(
+                accumulate(
+                    (block.first_timestamp for block in reversed(self.blocks)), min
+                )
+            )
+            earliest.reverse()
+            last = max(first, bisect.bisect_left(earliest, self._stop))
+        return first, last
+
+    def __iter__(self) -> Generator[Message, None, None]:
+        first, last = self._block_range()
+        start, stop = self._start, self._stop
+        for block in self.blocks[first:last]:
+            if (start is not None and block.last_timestamp < start) or (
+                stop is not None and block.first_timestamp >= stop
+            ):
+                continue
+            yield from self._parse_block(_read_payload(self.file, block))
+
+        self.stop()
+
+    def _parse_block(self, payload: bytes) -> Generator[Message, None, None]:
+        """Optimized inner loop by making local copies of global variables."""
+        unpack_prefix = RECORD_PREFIX_STRUCT.unpack_from
+        prefix_size = RECORD_PREFIX_STRUCT.size
+        classic_record_size = CLASSIC_RECORD_STRUCT.size
+        accepts = self._accepts if self._filtering else None
+
+        channels, pos = _unpack_channel_table(payload)
+        end = len(payload)
+        while pos < end:
+            timestamp, can_id, flags, channel_index, dlc = unpack_prefix(payload, pos)
+            if flags & FLAG_VARIABLE_LENGTH:
+                data_pos = pos + prefix_size + 1
+                pos = data_pos + payload[pos + prefix_size]
+            else:
+                data_pos = pos + prefix_size
+                pos += classic_record_size
+
+            channel = channels[channel_index] if channel_index != NO_CHANNEL else None
+            is_extended_id = bool(flags & FLAG_EXTENDED_ID)
+            if accepts is not None and not accepts(
+                timestamp, can_id, is_extended_id, channel
+            ):
+                continue
+            yield Message(
+                timestamp=timestamp,
+                arbitration_id=can_id,
+                is_extended_id=is_extended_id,
+                is_remote_frame=bool(flags & FLAG_REMOTE_FRAME),
+                is_error_frame=bool(flags & FLAG_ERROR_FRAME),
+                channel=channel,
+                dlc=dlc,
+                data=payload[data_pos:pos]
+                if flags & FLAG_VARIABLE_LENGTH
+                else payload[data_pos : data_pos + dlc],
+                is_fd=bool(flags & FLAG_FD),
+                is_rx=bool(flags & FLAG_RX),
+                bitrate_switch=bool(flags & FLAG_BITRATE_SWITCH),
+                error_state_indicator=bool(flags & FLAG_ERROR_STATE_INDICATOR),
+            )
@@ -5,7 +5,8 @@ It is is compatible with "candump -L" from the canutils program
 """
 
 import logging
-from typing import Any, Generator, TextIO, Union
+from itertools import chain
+from typing import Any, Dict, Generator, Iterable, List, Optional, TextIO, Union
 
 from can.message import Message
 
@@ -38,41 +39,87 @@ class CanutilsLogReader(TextIOMessageReader):
     def __init__(
         self,
         file: Union[StringPathLike, TextIO],
+        block_size: Optional[int] = None,
         **kwargs: Any,
     ) -> None:
         """
         :param file: a path-like object or as file-like object to read from
                      If this is a file-like object, is has to opened in text
                      read mode, not binary read mode.
+        :param block_size: if set, the file is read in blocks of this many
+                           characters, which are split into lines here,
+                           instead of being read line by line
         """
-        super().__init__(file, mode="r")
+        super().__init__(file, mode="r", **kwargs)
+        self.block_size = block_size
 
     def __iter__(self) -> Generator[Message, None, None]:
-        for line in self.file:
+        if self.block_size:
+            lines: Iterable[str] = chain.from_iterable(
+                self._read_blocks(self.block_size)
+            )
+        else:
+            lines = self.file
+        yield from self.read_lines(lines)
+
+    def _read_blocks(self, block_size: int) -> Generator[List[str], None, None]:
+        """Read the file in blocks and yield the complete lines of each block."""
+        rest = ""
+        while True:
+            block = self.file.read(block_size)
+            if not block:
+                break
+            lines = (rest + block).split("\n")
+            # the last line is continued in the next block
+            rest = lines.pop()
+            yield lines
+        if rest:
+            yield [rest]
+
+    def read_lines(self, lines: Iterable[str]) -> Generator[Message, None, None]:
+        """Parse the given lines instead of the file.
+
+        This is used by :func:`~can.io.player.parallel_read` to parse a part
+        of a large file. The format has no header.
+        """
+        filtering = self._filtering
+        channels: Dict[str, Union[int, str]] = {}
+        for line in lines:
+            parts = line.split()
             # skip empty lines
-            temp = line.strip()
-            if not temp:
+            if not parts:
                 continue
 
-            channel_string: str
-            if temp[-2:].lower() in (" r", " t"):
-                timestamp_string, channel_string, frame, is_rx_string = temp.split()
-                is_rx = is_rx_string.strip().lower() == "r"
+            if len(parts) == 4:
+                timestamp_string, channel_string, frame, is_rx_string = parts
+                is_rx = is_rx_string.lower() == "r"
             else:
-                timestamp_string, channel_string, frame = temp.split()
+                timestamp_string, channel_string, frame = parts
                 is_rx = True
             timestamp = float(timestamp_string[1:-1])
             can_id_string, data = frame.split("#", maxsplit=1)
 
-            channel: Union[int, str]
-            if channel_string.isdigit():
-                channel = int(channel_string)
-            else:
-                channel = channel_string
+            channel = channels.get(channel_string)
+            if channel is None:
+                if channel_string.isdigit():
+                    channel = int(channel_string)
+                else:
+                    channel = channel_string
+                channels[channel_string] = channel
 
             is_extended = len(can_id_string) > 3
             can_id = int(can_id_string, 16)
 
+            if filtering:
+                if can_id & CAN_ERR_FLAG and can_id & CAN_ERR_BUSERROR:
+                    accepted = self._accepts(timestamp, 0, True, None)
+                else:
+                    accepted = self._accepts(
+                        timestamp, can_id & 0x1FFFFFFF, is_extended, channel
+                    )
+                if not accepted:
+                    continue
+
             is_fd = False
             brs = False
             esi = False
@@ -96,10 +143,8 @@ class CanutilsLogReader(TextIOMessageReader):
             else:
                 is_remote_frame = False
 
-                dlc = len(data) // 2
-                data_bin = bytearray()
-                for i in range(0, len(data), 2):
-                    data_bin.append(int(data[i : (i + 2)], 16))
+                data_bin = bytearray.fromhex(data)
+                dlc = len(data_bin)
 
             if can_id & CAN_ERR_FLAG and can_id & CAN_ERR_BUSERROR:
                 msg = Message(timestamp=timestamp, is_error_frame=True)
@@ -136,6 +181,7 @@ class CanutilsLogWriter(TextIOMessageWriter):
         file: Union[StringPathLike, TextIO],
         channel: str = "vcan0",
         append: bool = False,
+        buffer_size: int = 0,
         **kwargs: Any,
     ):
         """
@@ -146,12 +192,29 @@ class CanutilsLogWriter(TextIOMessageWriter):
                         have a channel set
         :param bool append: if set to `True` messages are appended to
                             the file, else the file is truncated
+        :param buffer_size: if set, this many lines are collected and written
+                            to the file at once. The buffer is written when
+                            the writer is flushed or stopped.
         """
         mode = "a" if append else "w"
         super().__init__(file, mode=mode)
 
         self.channel = channel
         self.last_timestamp = None
+        self.buffer_size = buffer_size
+        self._lines: List[str] = []
+        self._buffered_size = 0
+        self._channel_names: Dict[Any, str] = {}
+
+    def _channel_name(self, channel: Any) -> str:
+        name = self._channel_names.get(channel)
+        if name is None:
+            if isinstance(channel, int) or str(channel).isdigit():
+                name = f"can{channel}"
+            else:
+                name = str(channel)
+            self._channel_names[channel] = name
+        return name
 
     def on_message_received(self, msg):
         # this is the case for the very first message:
@@ -164,34 +227,54 @@ class CanutilsLogWriter(TextIOMessageWriter):
         else:
             timestamp = msg.timestamp
 
-        channel = msg.channel if msg.channel is not None else self.channel
-        if isinstance(channel, int) or isinstance(channel, str) and channel.isdigit():
-            channel = f"can{channel}"
+        channel = self._channel_name(
+            msg.channel if msg.channel is not None else self.channel
+        )
 
-        framestr = f"({timestamp:f}) {channel}"
-
-        if msg.is_error_frame:
-            framestr += f" {CAN_ERR_FLAG | CAN_ERR_BUSERROR:08X}#"
-        elif msg.is_extended_id:
-            framestr += f" {msg.arbitration_id:08X}#"
+        if msg.is_remote_frame:
+            payload = "R"
+        elif msg.is_fd:
+            fd_flags = 0
+            if msg.bitrate_switch:
+                fd_flags |= CANFD_BRS
+            if msg.error_state_indicator:
+                fd_flags |= CANFD_ESI
+            payload = f"#{fd_flags:X}{msg.data.hex().upper()}"
         else:
-            framestr += f" {msg.arbitration_id:03X}#"
+            payload = msg.data.hex().upper()
 
         if msg.is_error_frame:
+            can_id = f"{CAN_ERR_FLAG | CAN_ERR_BUSERROR:08X}"
             eol = "\n"
         else:
+            if msg.is_extended_id:
+                can_id = f"{msg.arbitration_id:08X}"
+            else:
+                can_id = f"{msg.arbitration_id:03X}"
             eol = " R\n" if msg.is_rx else " T\n"
 
-        if msg.is_remote_frame:
-            framestr += f"R{eol}"
-        else:
-            if msg.is_fd:
-                fd_flags = 0
-                if msg.bitrate_switch:
-                    fd_flags |= CANFD_BRS
-                if msg.error_state_indicator:
-                    fd_flags |= CANFD_ESI
-                framestr += f"#{fd_flags:X}"
-            framestr += f"{msg.data.hex().upper()}{eol}"
-
-        self.file.write(framestr)
+        line = f"({timestamp:f}) {channel} {can_id}#{payload}{eol}"
+
+        if not self.buffer_size:
+            self.file.write(line)
+            return
+
+        self._lines.append(line)
+        self._buffered_size += len(line)
+        if len(self._lines) >= self.buffer_size:
+            self.flush()
+
+    def flush(self) -> None:
+        """Write the buffered lines to the file."""
+        if self._lines:
+            self.file.writelines(self._lines)
+            self._lines = []
+            self._buffered_size = 0
+
+    def file_size(self) -> int:
+        """Return the size of the file including the buffered lines."""
+        return self.file.tell() + self._buffered_size
+
+    def stop(self) -> None:
+        self.flush()
+        super().stop()
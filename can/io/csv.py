@@ -39,7 +39,7 @@ class CSVReader(TextIOMessageReader):
                      If this is a file-like object, is has to opened in text
                      read mode, not binary read mode.
         """
-        super().__init__(file, mode="r")
+        super().__init__(file, mode="r", **kwargs)
 
     def __iter__(self) -> Generator[Message, None, None]:
         # skip the header line
@@ -49,17 +49,24 @@ class CSVReader(TextIOMessageReader):
             # don't crash on a file with only a header
             return
 
+        filtering = self._filtering
         for line in self.file:
             timestamp, arbitration_id, extended, remote, error, dlc, data = line.split(
                 ","
             )
+            msg_timestamp = float(timestamp)
+            msg_arbitration_id = int(arbitration_id, base=16)
+            if filtering and not self._accepts(
+                msg_timestamp, msg_arbitration_id, extended == "1", None
+            ):
+                continue
 
             yield Message(
-                timestamp=float(timestamp),
+                timestamp=msg_timestamp,
                 is_remote_frame=(remote == "1"),
                 is_extended_id=(extended == "1"),
                 is_error_frame=(error == "1"),
-                arbitration_id=int(arbitration_id, base=16),
+                arbitration_id=msg_arbitration_id,
                 dlc=int(dlc),
                 data=b64decode(data),
             )
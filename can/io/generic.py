@@ -21,6 +21,7 @@ from typing_extensions import Self
 from .. import typechecking
 from ..listener import Listener
 from ..message import Message
+from ..util import compile_filters, match_filters
 
 
 class BaseIOHandler(ContextManager, metaclass=ABCMeta):
@@ -119,7 +120,73 @@ class BinaryIOMessageWriter(FileIOMessageWriter, metaclass=ABCMeta):
 
 
 class MessageReader(BaseIOHandler, Iterable[Message], metaclass=ABCMeta):
-    """The base class for all readers."""
+    """The base class for all readers.
+
+    All readers can skip messages by time, ID and channel. The readers check
+    the messages as early as the format allows, so that skipped messages are
+    not fully decoded.
+    """
+
+    def __init__(
+        self,
+        file: Optional[typechecking.AcceptedIOType],
+        mode: str = "rt",
+        start: Optional[float] = None,
+        stop: Optional[float] = None,
+        can_filters: Optional[typechecking.CanFilters] = None,
+        channels: Optional[Iterable[typechecking.Channel]] = None,
+        **kwargs: Any,
+    ) -> None:
+        """
+        :param file: a path-like object to open a file, a file-like object
+                     to be used as a file or `None` to not use a file at all
+        :param mode: the mode that should be used to open the file, see
+                     :func:`open`, ignored if *file* is `None`
+        :param start:
+            only return messages with a timestamp greater or equal to this
+            absolute timestamp
+        :param stop:
+            only return messages with a timestamp less than this absolute
+            timestamp
+        :param can_filters:
+            only return messages matching at least one of these filters,
+            see :meth:`can.BusABC.set_filters` for details
+        :param channels:
+            only return messages of these channels
+        """
+        super().__init__(file, mode, **kwargs)
+        self._start = start
+        self._stop = stop
+        self._compiled_filters = compile_filters(can_filters)
+        self._channels = None if channels is None else frozenset(channels)
+        #: `True` if any messages may be skipped
+        self._filtering = not (
+            start is None
+            and stop is None
+            and self._compiled_filters is None
+            and self._channels is None
+        )
+
+    def _accepts(
+        self,
+        timestamp: float,
+        arbitration_id: int,
+        is_extended_id: bool,
+        channel: Optional[typechecking.Channel],
+    ) -> bool:
+        """Check whether a message passes the filters of the reader,
+        before the message is created."""
+        return (
+            (self._start is None or timestamp >= self._start)
+            and (self._stop is None or timestamp < self._stop)
+            and (self._channels is None or channel in self._channels)
+            and match_filters(self._compiled_filters, arbitration_id, is_extended_id)
+        )
+
+    def _accepts_message(self, msg: Message) -> bool:
+        return self._accepts(
+            msg.timestamp, msg.arbitration_id, msg.is_extended_id, msg.channel
+        )
 
 
 class TextIOMessageReader(MessageReader, metaclass=ABCMeta):
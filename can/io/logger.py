@@ -29,6 +29,7 @@ from ..message import Message
 from ..typechecking import AcceptedIOType, FileLike, StringPathLike
 from .asc import ASCWriter
 from .blf import BLFWriter
+from .canb import CANBWriter
 from .canutils import CanutilsLogWriter
 from .csv import CSVWriter
 from .generic import (
@@ -37,6 +38,7 @@ from .generic import (
     MessageWriter,
 )
 from .mf4 import MF4Writer
+from .parquet import ArrowWriter, ParquetWriter
 from .printer import Printer
 from .sqlite import SqliteWriter
 from .trc import TRCWriter
@@ -44,12 +46,15 @@ from .trc import TRCWriter
 #: A map of file suffixes to their corresponding
 #: :class:`can.io.generic.MessageWriter` class
 MESSAGE_WRITERS: Final[Dict[str, Type[MessageWriter]]] = {
+    ".arrow": ArrowWriter,
     ".asc": ASCWriter,
     ".blf": BLFWriter,
+    ".canb": CANBWriter,
     ".csv": CSVWriter,
     ".db": SqliteWriter,
     ".log": CanutilsLogWriter,
     ".mf4": MF4Writer,
+    ".parquet": ParquetWriter,
     ".trc": TRCWriter,
     ".txt": Printer,
 }
@@ -89,7 +94,7 @@ def _compress(
         ) from None
 
     real_suffix = suffixes[-2].lower()
-    if real_suffix in (".blf", ".db"):
+    if real_suffix in (".arrow", ".blf", ".canb", ".db", ".parquet"):
         raise ValueError(
             f"The file type {real_suffix} is currently incompatible with gzip."
         )
@@ -111,13 +116,18 @@ def Logger(  # noqa: N802
     for a given file suffix.
 
     The format is determined from the file suffix which can be one of:
+      * .arrow :class:`can.ArrowWriter`
+        (optional, depends on `pyarrow <https://arrow.apache.org/docs/python/>`_)
       * .asc :class:`can.ASCWriter`
       * .blf :class:`can.BLFWriter`
+      * .canb :class:`can.CANBWriter`
       * .csv: :class:`can.CSVWriter`
       * .db :class:`can.SqliteWriter`
       * .log :class:`can.CanutilsLogWriter`
       * .mf4 :class:`can.MF4Writer`
         (optional, depends on `asammdf <https://github.com/danielhrisca/asammdf>`_)
+      * .parquet :class:`can.ParquetWriter`
+        (optional, depends on `pyarrow <https://arrow.apache.org/docs/python/>`_)
       * .trc :class:`can.TRCWriter`
       * .txt :class:`can.Printer`
 
@@ -334,6 +344,7 @@ class SizedRotatingLogger(BaseRotatingLogger):
     The SizedRotatingLogger currently supports the formats
       * .asc: :class:`can.ASCWriter`
       * .blf :class:`can.BLFWriter`
+      * .canb :class:`can.CANBWriter`
       * .csv: :class:`can.CSVWriter`
       * .log :class:`can.CanutilsLogWriter`
       * .txt :class:`can.Printer` (if pointing to a file)
@@ -345,7 +356,14 @@ class SizedRotatingLogger(BaseRotatingLogger):
     :meth:`~can.Listener.stop` is called.
     """
 
-    _supported_formats: ClassVar[Set[str]] = {".asc", ".blf", ".csv", ".log", ".txt"}
+    _supported_formats: ClassVar[Set[str]] = {
+        ".asc",
+        ".blf",
+        ".canb",
+        ".csv",
+        ".log",
+        ".txt",
+    }
 
     def __init__(
         self,
@@ -5,15 +5,28 @@ MF4 files represent Measurement Data Format (MDF) version 4 as specified by
 the ASAM MDF standard (see https://www.asam.net/standards/detail/mdf/)
 """
 import logging
+import struct
+import time
 from datetime import datetime
 from hashlib import md5
 from io import BufferedIOBase, BytesIO
 from pathlib import Path
-from typing import Any, BinaryIO, Generator, Optional, Union, cast
+from typing import Any, BinaryIO, Generator, Optional, Tuple, Union, cast
 
 from ..message import Message
+from ..message_batch import (
+    FLAG_BITRATE_SWITCH,
+    FLAG_ERROR_FRAME,
+    FLAG_ERROR_STATE_INDICATOR,
+    FLAG_EXTENDED_ID,
+    FLAG_FD,
+    FLAG_REMOTE_FRAME,
+    FLAG_RX,
+    MAX_DATA_LENGTH,
+    MessageBatch,
+)
 from ..typechecking import StringPathLike
-from ..util import channel2int, dlc2len, len2dlc
+from ..util import CAN_FD_DLC, channel2int, len2dlc
 from .generic import BinaryIOMessageReader, BinaryIOMessageWriter
 
 logger = logging.getLogger("can.io.mf4")
@@ -67,6 +80,16 @@ try:
             ("CAN_RemoteFrame.Dir", "<u1"),
         ]
     )
+
+    _CAN_FD_DLC = np.array(CAN_FD_DLC, dtype=np.uint8)
+    # the records of data and error frames are written in place with the
+    # fields before and after the data bytes
+    assert STD_DTYPE.fields is not None
+    _DATA_BYTES_OFFSET = STD_DTYPE.fields["CAN_DataFrame.DataBytes"][1]
+    _RECORD_HEAD = struct.Struct("<BIBBB")
+    _RECORD_TAIL = struct.Struct("<BBBB")
+    _ZERO_BYTES = memoryview(bytes(MAX_DATA_LENGTH))
+    _BYTE_INDICES = np.arange(MAX_DATA_LENGTH)
 except ImportError:
     asammdf = None
 
@@ -74,6 +97,9 @@ except ImportError:
 CAN_MSG_EXT = 0x80000000
 CAN_ID_MASK = 0x1FFFFFFF
 
+# the names of the channel groups in the order they are written
+_GROUP_NAMES = ("CAN_DataFrame", "CAN_ErrorFrame", "CAN_RemoteFrame")
+
 
 class MF4Writer(BinaryIOMessageWriter):
     """Logs CAN data to an ASAM Measurement Data File v4 (.mf4).
@@ -90,6 +116,8 @@ class MF4Writer(BinaryIOMessageWriter):
         file: Union[StringPathLike, BinaryIO],
         database: Optional[StringPathLike] = None,
         compression_level: int = 2,
+        buffer_size: int = 1000,
+        flush_interval: Optional[float] = 1.0,
         **kwargs: Any,
     ) -> None:
         """
@@ -104,6 +132,12 @@ class MF4Writer(BinaryIOMessageWriter):
             * 0 - no compression
             * 1 - deflate (slower, but produces smaller files)
             * 2 - transposition + deflate (slowest, but produces the smallest files)
+        :param buffer_size:
+            the number of messages per channel group that are collected
+            before they are appended to the measurement at once
+        :param flush_interval:
+            the maximum time in seconds that messages are held back in the
+            buffers, or `None` to only flush full buffers
         """
         if asammdf is None:
             raise NotImplementedError(
@@ -117,6 +151,9 @@ class MF4Writer(BinaryIOMessageWriter):
                 f"append messages to an existing file."
             )
 
+        if buffer_size < 1:
+            raise ValueError(f"buffer_size must be positive, got {buffer_size}")
+
         super().__init__(file, mode="w+b")
         now = datetime.now()
         self._mdf = cast(MDF4, MDF(version="4.10"))
@@ -172,22 +209,55 @@ class MF4Writer(BinaryIOMessageWriter):
             )
         )
 
-        self._std_buffer = np.zeros(1, dtype=STD_DTYPE)
-        self._err_buffer = np.zeros(1, dtype=ERR_DTYPE)
-        self._rtr_buffer = np.zeros(1, dtype=RTR_DTYPE)
+        # one preallocated buffer of samples and timestamps per channel group
+        self._buffer_size = buffer_size
+        self._flush_interval = flush_interval
+        self._buffers = [
+            np.zeros(buffer_size, dtype=dtype)
+            for dtype in (STD_DTYPE, ERR_DTYPE, RTR_DTYPE)
+        ]
+        self._timestamps = [np.zeros(buffer_size, dtype="<f8") for _ in range(3)]
+        # byte views of the buffers, to write the records in place
+        self._records = [buffer.view(np.uint8).data for buffer in self._buffers]
+        self._counts = [0, 0, 0]
+        self._last_flush = time.monotonic()
 
     def file_size(self) -> int:
         """Return an estimate of the current file size in bytes."""
         # TODO: find solution without accessing private attributes of asammdf
-        return cast(int, self._mdf._tempfile.tell())  # pylint: disable=protected-access
+        # pylint: disable=protected-access
+        # newer versions of asammdf wrap the MDF4 object
+        mdf = getattr(self._mdf, "_mdf", self._mdf)
+        written = cast(int, mdf._tempfile.tell())
+        buffered = sum(
+            count * (buffer.itemsize + 8)
+            for count, buffer in zip(self._counts, self._buffers)
+        )
+        return written + buffered
+
+    def flush(self) -> None:
+        """Append all buffered messages to the measurement."""
+        for group_index, count in enumerate(self._counts):
+            if count:
+                sigs = [
+                    (self._timestamps[group_index][:count], None),
+                    (self._buffers[group_index][:count], None),
+                ]
+                self._mdf.extend(group_index, sigs)
+                self._counts[group_index] = 0
+
+        self._last_flush = time.monotonic()
 
     def stop(self) -> None:
+        self.flush()
         self._mdf.save(self.file, compression=self._compression_level)
         self._mdf.close()
         super().stop()
 
     def on_message_received(self, msg: Message) -> None:
         channel = channel2int(msg.channel)
+        if channel is None:
+            channel = 0
 
         timestamp = msg.timestamp
         if timestamp is None:
@@ -197,72 +267,65 @@ class MF4Writer(BinaryIOMessageWriter):
 
         timestamp -= self._start_time
 
-        if msg.is_remote_frame:
-            if channel is not None:
-                self._rtr_buffer["CAN_RemoteFrame.BusChannel"] = channel
-
-            self._rtr_buffer["CAN_RemoteFrame.ID"] = msg.arbitration_id
-            self._rtr_buffer["CAN_RemoteFrame.IDE"] = int(msg.is_extended_id)
-            self._rtr_buffer["CAN_RemoteFrame.Dir"] = 0 if msg.is_rx else 1
-            self._rtr_buffer["CAN_RemoteFrame.DLC"] = msg.dlc
-
-            sigs = [(np.array([timestamp]), None), (self._rtr_buffer, None)]
-            self._mdf.extend(2, sigs)
-
-        elif msg.is_error_frame:
-            if channel is not None:
-                self._err_buffer["CAN_ErrorFrame.BusChannel"] = channel
-
-            self._err_buffer["CAN_ErrorFrame.ID"] = msg.arbitration_id
-            self._err_buffer["CAN_ErrorFrame.IDE"] = int(msg.is_extended_id)
-            self._err_buffer["CAN_ErrorFrame.Dir"] = 0 if msg.is_rx else 1
-            data = msg.data
-            size = len(data)
-            self._err_buffer["CAN_ErrorFrame.DataLength"] = size
-            self._err_buffer["CAN_ErrorFrame.DataBytes"][0, :size] = data
-            if msg.is_fd:
-                self._err_buffer["CAN_ErrorFrame.DLC"] = len2dlc(msg.dlc)
-                self._err_buffer["CAN_ErrorFrame.ESI"] = int(msg.error_state_indicator)
-                self._err_buffer["CAN_ErrorFrame.BRS"] = int(msg.bitrate_switch)
-                self._err_buffer["CAN_ErrorFrame.EDL"] = 1
-            else:
-                self._err_buffer["CAN_ErrorFrame.DLC"] = msg.dlc
-                self._err_buffer["CAN_ErrorFrame.ESI"] = 0
-                self._err_buffer["CAN_ErrorFrame.BRS"] = 0
-                self._err_buffer["CAN_ErrorFrame.EDL"] = 0
-
-            sigs = [(np.array([timestamp]), None), (self._err_buffer, None)]
-            self._mdf.extend(1, sigs)
+        direction = 0 if msg.is_rx else 1
 
+        if msg.is_remote_frame:
+            group_index = 2
+            index = self._counts[group_index]
+            self._buffers[group_index][index] = (
+                channel,
+                msg.arbitration_id,
+                int(msg.is_extended_id),
+                msg.dlc,
+                0,
+                direction,
+            )
         else:
-            if channel is not None:
-                self._std_buffer["CAN_DataFrame.BusChannel"] = channel
-
-            self._std_buffer["CAN_DataFrame.ID"] = msg.arbitration_id
-            self._std_buffer["CAN_DataFrame.IDE"] = int(msg.is_extended_id)
-            self._std_buffer["CAN_DataFrame.Dir"] = 0 if msg.is_rx else 1
+            group_index = 1 if msg.is_error_frame else 0
+            index = self._counts[group_index]
             data = msg.data
             size = len(data)
-            self._std_buffer["CAN_DataFrame.DataLength"] = size
-            self._std_buffer["CAN_DataFrame.DataBytes"][0, :size] = data
+            records = self._records[group_index]
+            offset = index * self._buffers[group_index].itemsize
             if msg.is_fd:
-                self._std_buffer["CAN_DataFrame.DLC"] = len2dlc(msg.dlc)
-                self._std_buffer["CAN_DataFrame.ESI"] = int(msg.error_state_indicator)
-                self._std_buffer["CAN_DataFrame.BRS"] = int(msg.bitrate_switch)
-                self._std_buffer["CAN_DataFrame.EDL"] = 1
+                _RECORD_HEAD.pack_into(
+                    records,
+                    offset,
+                    channel,
+                    msg.arbitration_id,
+                    msg.is_extended_id,
+                    len2dlc(msg.dlc),
+                    size,
+                )
+                flags: Tuple[int, int, int] = (
+                    1,
+                    msg.bitrate_switch,
+                    msg.error_state_indicator,
+                )
             else:
-                self._std_buffer["CAN_DataFrame.DLC"] = msg.dlc
-                self._std_buffer["CAN_DataFrame.ESI"] = 0
-                self._std_buffer["CAN_DataFrame.BRS"] = 0
-                self._std_buffer["CAN_DataFrame.EDL"] = 0
+                _RECORD_HEAD.pack_into(
+                    records,
+                    offset,
+                    channel,
+                    msg.arbitration_id,
+                    msg.is_extended_id,
+                    msg.dlc,
+                    size,
+                )
+                flags = (0, 0, 0)
+            offset += _DATA_BYTES_OFFSET
+            records[offset : offset + size] = data
+            records[offset + size : offset + MAX_DATA_LENGTH] = _ZERO_BYTES[size:]
+            _RECORD_TAIL.pack_into(records, offset + MAX_DATA_LENGTH, direction, *flags)
 
-            sigs = [(np.array([timestamp]), None), (self._std_buffer, None)]
-            self._mdf.extend(0, sigs)
+        self._timestamps[group_index][index] = timestamp
+        self._counts[group_index] = index + 1
 
-        # reset buffer structure
-        self._std_buffer = np.zeros(1, dtype=STD_DTYPE)
-        self._err_buffer = np.zeros(1, dtype=ERR_DTYPE)
-        self._rtr_buffer = np.zeros(1, dtype=RTR_DTYPE)
+        if index + 1 >= self._buffer_size or (
+            self._flush_interval is not None
+            and time.monotonic() - self._last_flush >= self._flush_interval
+        ):
+            self.flush()
 
 
 class MF4Reader(BinaryIOMessageReader):
@@ -270,17 +333,26 @@ class MF4Reader(BinaryIOMessageReader):
     Iterator of CAN messages from a MF4 logging file.
 
     The MF4Reader only supports MF4 files that were recorded with python-can.
+
+    The records of the three channel groups are read in chunks and converted
+    with vectorized NumPy operations. Use :meth:`iter_batches` to get the
+    messages as :class:`~can.MessageBatch` objects without creating a
+    :class:`~can.Message` for every record.
     """
 
     def __init__(
         self,
         file: Union[StringPathLike, BinaryIO],
+        chunk_size: int = 10_000,
         **kwargs: Any,
     ) -> None:
         """
         :param file: a path-like object or as file-like object to read from
                         If this is a file-like object, is has to be opened in
                         binary read mode, not text read mode.
+        :param chunk_size:
+            the maximum number of records that are read and held in memory
+            at once
         """
         if asammdf is None:
             raise NotImplementedError(
@@ -288,7 +360,10 @@ class MF4Reader(BinaryIOMessageReader):
                 "the optional dependency [mf4] to use the MF4Reader."
             )
 
-        super().__init__(file, mode="rb")
+        if chunk_size < 1:
+            raise ValueError(f"chunk_size must be positive, got {chunk_size}")
+
+        super().__init__(file, mode="rb", **kwargs)
 
         self._mdf: MDF4
         if isinstance(file, BufferedIOBase):
@@ -296,188 +371,149 @@ class MF4Reader(BinaryIOMessageReader):
         else:
             self._mdf = MDF(file)
 
+        self.chunk_size = chunk_size
         self.start_timestamp = self._mdf.header.start_time.timestamp()
 
         masters = [self._mdf.get_master(i) for i in range(3)]
 
         masters = [
-            np.core.records.fromarrays((master, np.ones(len(master)) * i))
+            np.rec.fromarrays((master, np.ones(len(master)) * i))
             for i, master in enumerate(masters)
         ]
 
         self.masters = np.sort(np.concatenate(masters))
 
     def __iter__(self) -> Generator[Message, None, None]:
-        standard_counter = 0
-        error_counter = 0
-        rtr_counter = 0
-
-        for timestamp, group_index in self.masters:
-            # standard frames
-            if group_index == 0:
-                sample = self._mdf.get(
-                    "CAN_DataFrame",
-                    group=group_index,
-                    raw=True,
-                    record_offset=standard_counter,
-                    record_count=1,
-                )
+        for batch in self.iter_batches():
+            yield from batch
 
-                try:
-                    channel = int(sample["CAN_DataFrame.BusChannel"][0])
-                except ValueError:
-                    channel = None
-
-                if sample["CAN_DataFrame.EDL"] == 0:
-                    is_extended_id = bool(sample["CAN_DataFrame.IDE"][0])
-                    arbitration_id = int(sample["CAN_DataFrame.ID"][0])
-                    is_rx = int(sample["CAN_DataFrame.Dir"][0]) == 0
-                    size = int(sample["CAN_DataFrame.DataLength"][0])
-                    dlc = int(sample["CAN_DataFrame.DLC"][0])
-                    data = sample["CAN_DataFrame.DataBytes"][0, :size].tobytes()
-
-                    msg = Message(
-                        timestamp=timestamp + self.start_timestamp,
-                        is_error_frame=False,
-                        is_remote_frame=False,
-                        is_fd=False,
-                        is_extended_id=is_extended_id,
-                        channel=channel,
-                        is_rx=is_rx,
-                        arbitration_id=arbitration_id,
-                        data=data,
-                        dlc=dlc,
-                    )
+        self.stop()
 
-                else:
-                    is_extended_id = bool(sample["CAN_DataFrame.IDE"][0])
-                    arbitration_id = int(sample["CAN_DataFrame.ID"][0])
-                    is_rx = int(sample["CAN_DataFrame.Dir"][0]) == 0
-                    size = int(sample["CAN_DataFrame.DataLength"][0])
-                    dlc = dlc2len(sample["CAN_DataFrame.DLC"][0])
-                    data = sample["CAN_DataFrame.DataBytes"][0, :size].tobytes()
-                    error_state_indicator = bool(sample["CAN_DataFrame.ESI"][0])
-                    bitrate_switch = bool(sample["CAN_DataFrame.BRS"][0])
-
-                    msg = Message(
-                        timestamp=timestamp + self.start_timestamp,
-                        is_error_frame=False,
-                        is_remote_frame=False,
-                        is_fd=True,
-                        is_extended_id=is_extended_id,
-                        channel=channel,
-                        arbitration_id=arbitration_id,
-                        is_rx=is_rx,
-                        data=data,
-                        dlc=dlc,
-                        bitrate_switch=bitrate_switch,
-                        error_state_indicator=error_state_indicator,
-                    )
+    def iter_batches(self) -> Generator[MessageBatch, None, None]:
+        """Read the messages in chunks of up to ``chunk_size`` messages.
 
-                yield msg
-                standard_counter += 1
+        :return: a generator of :class:`~can.MessageBatch` objects in
+                 chronological order
+        """
+        # The records are sorted by time, so only the ones between start and
+        # stop need to be read
+        first, last = 0, len(self.masters)
+        if self._start is not None or self._stop is not None:
+            times = self.masters["f0"] + self.start_timestamp
+            if self._start is not None:
+                first = int(np.searchsorted(times, self._start, side="left"))
+            if self._stop is not None:
+                last = max(first, int(np.searchsorted(times, self._stop, side="left")))
+        skipped = self.masters["f1"][:first].astype(np.uint8)
+        counters = [int(np.count_nonzero(skipped == i)) for i in range(3)]
+
+        for offset in range(first, last, self.chunk_size):
+            window = self.masters[offset : min(offset + self.chunk_size, last)]
+            timestamps = window["f0"] + self.start_timestamp
+            group_indices = window["f1"].astype(np.uint8)
+
+            size = len(window)
+            arbitration_id = np.zeros(size, dtype=np.uint32)
+            flags = np.zeros(size, dtype=np.uint8)
+            dlc = np.zeros(size, dtype=np.uint8)
+            channel = np.zeros(size, dtype=np.int64)
+            data = np.zeros((size, MAX_DATA_LENGTH), dtype=np.uint8)
+
+            for group_index, name in enumerate(_GROUP_NAMES):
+                rows = group_indices == group_index
+                count = int(np.count_nonzero(rows))
+                if not count:
+                    continue
 
-            # error frames
-            elif group_index == 1:
                 sample = self._mdf.get(
-                    "CAN_ErrorFrame",
+                    name,
                     group=group_index,
                     raw=True,
-                    record_offset=error_counter,
-                    record_count=1,
+                    record_offset=counters[group_index],
+                    record_count=count,
                 )
+                counters[group_index] += count
 
-                try:
-                    channel = int(sample["CAN_ErrorFrame.BusChannel"][0])
-                except ValueError:
-                    channel = None
-
-                if sample["CAN_ErrorFrame.EDL"] == 0:
-                    is_extended_id = bool(sample["CAN_ErrorFrame.IDE"][0])
-                    arbitration_id = int(sample["CAN_ErrorFrame.ID"][0])
-                    is_rx = int(sample["CAN_ErrorFrame.Dir"][0]) == 0
-                    size = int(sample["CAN_ErrorFrame.DataLength"][0])
-                    dlc = int(sample["CAN_ErrorFrame.DLC"][0])
-                    data = sample["CAN_ErrorFrame.DataBytes"][0, :size].tobytes()
-
-                    msg = Message(
-                        timestamp=timestamp + self.start_timestamp,
-                        is_error_frame=True,
-                        is_remote_frame=False,
-                        is_fd=False,
-                        is_extended_id=is_extended_id,
-                        channel=channel,
-                        arbitration_id=arbitration_id,
-                        is_rx=is_rx,
-                        data=data,
-                        dlc=dlc,
-                    )
+                arbitration_id[rows] = sample[f"{name}.ID"]
+                channel[rows] = sample[f"{name}.BusChannel"]
+                group_flags = np.where(sample[f"{name}.IDE"] != 0, FLAG_EXTENDED_ID, 0)
+                group_flags |= np.where(sample[f"{name}.Dir"] == 0, FLAG_RX, 0)
+                group_dlc = sample[f"{name}.DLC"].astype(np.uint8)
 
+                if group_index == 2:
+                    # remote frames carry no data
+                    group_flags |= FLAG_REMOTE_FRAME
                 else:
-                    is_extended_id = bool(sample["CAN_ErrorFrame.IDE"][0])
-                    arbitration_id = int(sample["CAN_ErrorFrame.ID"][0])
-                    is_rx = int(sample["CAN_ErrorFrame.Dir"][0]) == 0
-                    size = int(sample["CAN_ErrorFrame.DataLength"][0])
-                    dlc = dlc2len(sample["CAN_ErrorFrame.DLC"][0])
-                    data = sample["CAN_ErrorFrame.DataBytes"][0, :size].tobytes()
-                    error_state_indicator = bool(sample["CAN_ErrorFrame.ESI"][0])
-                    bitrate_switch = bool(sample["CAN_ErrorFrame.BRS"][0])
-
-                    msg = Message(
-                        timestamp=timestamp + self.start_timestamp,
-                        is_error_frame=True,
-                        is_remote_frame=False,
-                        is_fd=True,
-                        is_extended_id=is_extended_id,
-                        channel=channel,
-                        arbitration_id=arbitration_id,
-                        is_rx=is_rx,
-                        data=data,
-                        dlc=dlc,
-                        bitrate_switch=bitrate_switch,
-                        error_state_indicator=error_state_indicator,
-                    )
-
-                yield msg
-                error_counter += 1
-
-            # remote frames
-            else:
-                sample = self._mdf.get(
-                    "CAN_RemoteFrame",
-                    group=group_index,
-                    raw=True,
-                    record_offset=rtr_counter,
-                    record_count=1,
-                )
-
-                try:
-                    channel = int(sample["CAN_RemoteFrame.BusChannel"][0])
-                except ValueError:
-                    channel = None
-
-                is_extended_id = bool(sample["CAN_RemoteFrame.IDE"][0])
-                arbitration_id = int(sample["CAN_RemoteFrame.ID"][0])
-                is_rx = int(sample["CAN_RemoteFrame.Dir"][0]) == 0
-                dlc = int(sample["CAN_RemoteFrame.DLC"][0])
-
-                msg = Message(
-                    timestamp=timestamp + self.start_timestamp,
-                    is_error_frame=False,
-                    is_remote_frame=True,
-                    is_fd=False,
-                    is_extended_id=is_extended_id,
-                    channel=channel,
-                    arbitration_id=arbitration_id,
-                    is_rx=is_rx,
-                    dlc=dlc,
-                )
+                    if group_index == 1:
+                        group_flags |= FLAG_ERROR_FRAME
 
-                yield msg
-
-                rtr_counter += 1
-
-        self.stop()
+                    is_fd = sample[f"{name}.EDL"] != 0
+                    group_flags |= np.where(is_fd, FLAG_FD, 0)
+                    group_flags |= np.where(
+                        is_fd & (sample[f"{name}.BRS"] != 0), FLAG_BITRATE_SWITCH, 0
+                    )
+                    group_flags |= np.where(
+                        is_fd & (sample[f"{name}.ESI"] != 0),
+                        FLAG_ERROR_STATE_INDICATOR,
+                        0,
+                    )
+                    # the DLC field of CAN FD frames holds the DLC code
+                    group_dlc = np.where(
+                        is_fd, _CAN_FD_DLC[group_dlc & 0x0F], group_dlc
+                    ).astype(np.uint8)
+
+                    # drop any bytes beyond the stored data length
+                    group_data = sample[f"{name}.DataBytes"].copy()
+                    group_data[
+                        _BYTE_INDICES >= sample[f"{name}.DataLength"][:, np.newaxis]
+                    ] = 0
+                    data[rows] = group_data
+
+                flags[rows] = group_flags
+                dlc[rows] = group_dlc
+
+            channels, channel_index = np.unique(channel, return_inverse=True)
+
+            batch = MessageBatch(
+                timestamp=timestamps,
+                arbitration_id=arbitration_id,
+                flags=flags,
+                dlc=dlc,
+                data=data,
+                channel_index=channel_index.reshape(-1),
+                channels=channels.tolist(),
+            )
+            if self._filtering:
+                batch = batch[self._mask(batch)]
+                if not batch:
+                    continue
+            yield batch
+
+    def _mask(self, batch: MessageBatch) -> "np.ndarray":
+        """Return the rows of *batch* which pass the filters of the reader."""
+        mask = batch.mask(start=self._start, stop=self._stop)
+        if self._compiled_filters is not None:
+            is_extended_id = batch.is_extended_id
+            matches = np.zeros(len(batch), dtype=bool)
+            for can_mask, standard_ids, extended_ids in self._compiled_filters:
+                masked_ids = batch.arbitration_id & np.uint32(can_mask)
+                for ids, rows in (
+                    (standard_ids, ~is_extended_id),
+                    (extended_ids, is_extended_id),
+                ):
+                    if ids:
+                        matches |= rows & np.isin(
+                            masked_ids, np.fromiter(ids, dtype=np.uint32)
+                        )
+            mask &= matches
+        if self._channels is not None:
+            selected = [
+                index
+                for index, channel in enumerate(batch.channels)
+                if channel in self._channels
+            ]
+            mask &= np.isin(batch.channel_index, selected)
+        return mask
 
     def stop(self) -> None:
         self._mdf.close()
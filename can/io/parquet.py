@@ -0,0 +1,451 @@
+"""
+Contains handling of Apache Parquet and Apache Arrow IPC logging files.
+
+Both formats store the messages column by column, so that they can be
+loaded directly into data analysis tools like pandas or Polars
+(see https://parquet.apache.org/ and https://arrow.apache.org/).
+"""
+
+import functools
+import logging
+import operator
+from abc import ABCMeta, abstractmethod
+from typing import (
+    Any,
+    BinaryIO,
+    Generator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+from ..message import Message
+from ..message_batch import (
+    FLAG_BITRATE_SWITCH,
+    FLAG_ERROR_FRAME,
+    FLAG_ERROR_STATE_INDICATOR,
+    FLAG_EXTENDED_ID,
+    FLAG_FD,
+    FLAG_REMOTE_FRAME,
+    FLAG_RX,
+    MAX_DATA_LENGTH,
+    MessageBatch,
+)
+from ..typechecking import Channel, StringPathLike
+from .generic import BinaryIOMessageReader, BinaryIOMessageWriter
+
+logger = logging.getLogger("can.io.parquet")
+
+try:
+    import numpy as np
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.dataset as ds
+    import pyarrow.parquet as pq
+
+    #: The columns of the files in the order of the arguments of Message()
+    SCHEMA = pa.schema(
+        [
+            pa.field("timestamp", pa.float64(), nullable=False),
+            pa.field("arbitration_id", pa.uint32(), nullable=False),
+            pa.field("is_extended_id", pa.bool_(), nullable=False),
+            pa.field("is_remote_frame", pa.bool_(), nullable=False),
+            pa.field("is_error_frame", pa.bool_(), nullable=False),
+            pa.field("channel", pa.string()),
+            pa.field("dlc", pa.uint8(), nullable=False),
+            pa.field("data", pa.binary(), nullable=False),
+            pa.field("is_fd", pa.bool_(), nullable=False),
+            pa.field("is_rx", pa.bool_(), nullable=False),
+            pa.field("bitrate_switch", pa.bool_(), nullable=False),
+            pa.field("error_state_indicator", pa.bool_(), nullable=False),
+        ]
+    )
+
+    _BYTE_INDICES = np.arange(MAX_DATA_LENGTH)
+except ImportError:
+    pa = None
+
+
+# The boolean columns and the corresponding flags of a MessageBatch
+_FLAG_COLUMNS = (
+    ("is_extended_id", FLAG_EXTENDED_ID),
+    ("is_remote_frame", FLAG_REMOTE_FRAME),
+    ("is_error_frame", FLAG_ERROR_FRAME),
+    ("is_fd", FLAG_FD),
+    ("is_rx", FLAG_RX),
+    ("bitrate_switch", FLAG_BITRATE_SWITCH),
+    ("error_state_indicator", FLAG_ERROR_STATE_INDICATOR),
+)
+
+# The index of the channel column in the rows of the writers
+_CHANNEL_COLUMN = 5
+
+# A rough estimate of the number of bytes of a buffered row besides the data
+_ROW_OVERHEAD = 24
+
+
+def _check_pyarrow(class_name: str) -> None:
+    if pa is None:
+        raise NotImplementedError(
+            "The pyarrow package was not found. Install python-can with "
+            f"the optional dependency [parquet] to use the {class_name}."
+        )
+
+
+def _parse_channel(channel: str) -> Channel:
+    """Integer channels are stored as their decimal string."""
+    return int(channel) if channel.isdecimal() else channel
+
+
+def _to_message_batch(record_batch: "pa.RecordBatch") -> MessageBatch:
+    """Convert the columns of a record batch into a :class:`~can.MessageBatch`."""
+    size = record_batch.num_rows
+
+    flags = np.zeros(size, dtype=np.uint8)
+    for name, flag in _FLAG_COLUMNS:
+        column = record_batch.column(name).to_numpy(zero_copy_only=False)
+        flags |= np.where(column, np.uint8(flag), np.uint8(0))
+
+    encoded = pc.dictionary_encode(  # pylint: disable=no-member
+        record_batch.column("channel")
+    )
+    channel_index = encoded.indices.fill_null(-1).to_numpy(zero_copy_only=False)
+    channels = [_parse_channel(name) for name in encoded.dictionary.to_pylist()]
+
+    # copy the variable length payloads into the rows of the data matrix
+    data = np.zeros((size, MAX_DATA_LENGTH), dtype=np.uint8)
+    data_column = record_batch.column("data")
+    _, offsets_buffer, values_buffer = data_column.buffers()
+    if size and values_buffer is not None:
+        offsets = np.frombuffer(
+            offsets_buffer,
+            dtype=np.int32,
+            count=size + 1,
+            offset=4 * data_column.offset,
+        )
+        values = np.frombuffer(values_buffer, dtype=np.uint8)
+        lengths = np.minimum(np.diff(offsets), MAX_DATA_LENGTH)
+        rows = _BYTE_INDICES < lengths[:, np.newaxis]
+        data[rows] = values[(offsets[:-1, np.newaxis] + _BYTE_INDICES)[rows]]
+
+    return MessageBatch(
+        timestamp=record_batch.column("timestamp").to_numpy(),
+        arbitration_id=record_batch.column("arbitration_id").to_numpy(),
+        flags=flags,
+        dlc=record_batch.column("dlc").to_numpy(),
+        data=data,
+        channel_index=channel_index,
+        channels=channels,
+    )
+
+
+class _ArrowMessageWriter(BinaryIOMessageWriter, metaclass=ABCMeta):
+    """Collects the messages in rows and writes them as record batches."""
+
+    def __init__(
+        self,
+        file: Union[StringPathLike, BinaryIO],
+        compression: Optional[str] = "zstd",
+        row_group_size: int = 100_000,
+        **kwargs: Any,
+    ) -> None:
+        """
+        :param file:
+            A path-like object or as file-like object to write to.
+            If this is a file-like object, is has to be opened in
+            binary write mode, not text write mode.
+        :param compression:
+            the compression codec of the columns, e.g. ``"zstd"``, ``"lz4"``
+            or `None` to store them uncompressed
+        :param row_group_size:
+            the number of messages that are collected in memory before they
+            are written to the file at once
+        """
+        _check_pyarrow(self.__class__.__name__)
+
+        if kwargs.get("append", False):
+            raise ValueError(
+                f"{self.__class__.__name__} is currently not equipped to "
+                f"append messages to an existing file."
+            )
+
+        if row_group_size < 1:
+            raise ValueError(f"row_group_size must be positive, got {row_group_size}")
+
+        super().__init__(file, mode="wb")
+        self.row_group_size = row_group_size
+        self._rows: List[Tuple[Any, ...]] = []
+        self._buffered_bytes = 0
+        self._open(compression)
+
+    @abstractmethod
+    def _open(self, compression: Optional[str]) -> None:
+        """Open the writer of the file format."""
+
+    @abstractmethod
+    def _write_batch(self, record_batch: "pa.RecordBatch") -> None:
+        """Write a record batch to the file."""
+
+    @abstractmethod
+    def _close(self) -> None:
+        """Complete the file."""
+
+    def file_size(self) -> int:
+        """Return an estimate of the current file size in bytes."""
+        return self.file.tell() + self._buffered_bytes
+
+    def flush(self) -> None:
+        """Write all buffered messages to the file."""
+        if not self._rows:
+            return
+
+        columns: List[Sequence[Any]] = list(zip(*self._rows))
+        columns[_CHANNEL_COLUMN] = [
+            None if channel is None else str(channel)
+            for channel in columns[_CHANNEL_COLUMN]
+        ]
+        record_batch = pa.RecordBatch.from_arrays(
+            [
+                pa.array(column, type=field.type)
+                for column, field in zip(columns, SCHEMA)
+            ],
+            schema=SCHEMA,
+        )
+        self._write_batch(record_batch)
+        self._rows = []
+        self._buffered_bytes = 0
+
+    def stop(self) -> None:
+        self.flush()
+        self._close()
+        super().stop()
+
+    def on_message_received(self, msg: Message) -> None:
+        data = bytes(msg.data)
+        self._rows.append(
+            (
+                msg.timestamp,
+                msg.arbitration_id,
+                msg.is_extended_id,
+                msg.is_remote_frame,
+                msg.is_error_frame,
+                msg.channel,
+                msg.dlc,
+                data,
+                msg.is_fd,
+                msg.is_rx,
+                msg.bitrate_switch,
+                msg.error_state_indicator,
+            )
+        )
+        self._buffered_bytes += _ROW_OVERHEAD + len(data)
+
+        if len(self._rows) >= self.row_group_size:
+            self.flush()
+
+
+class _ArrowMessageReader(BinaryIOMessageReader, metaclass=ABCMeta):
+    """Reads the record batches of a file, which pass the filters of the reader."""
+
+    def __init__(
+        self,
+        file: Union[StringPathLike, BinaryIO],
+        batch_size: int = 65_536,
+        **kwargs: Any,
+    ) -> None:
+        """
+        :param file: a path-like object or as file-like object to read from
+                     If this is a file-like object, is has to be opened in
+                     binary read mode, not text read mode.
+        :param batch_size:
+            the maximum number of messages that are read and held in memory
+            at once
+        """
+        _check_pyarrow(self.__class__.__name__)
+
+        if batch_size < 1:
+            raise ValueError(f"batch_size must be positive, got {batch_size}")
+
+        super().__init__(file, mode="rb", **kwargs)
+        self.batch_size = batch_size
+        self._fragment = self._file_format().make_fragment(self.file)
+
+    @abstractmethod
+    def _file_format(self) -> "ds.FileFormat":
+        """Return the dataset format of the files."""
+
+    def _filter_expression(self) -> Optional["ds.Expression"]:
+        """Translate the filters of the reader into an expression, which
+        is evaluated while the file is scanned."""
+        conditions = []
+        if self._start is not None:
+            conditions.append(pc.field("timestamp") >= self._start)
+        if self._stop is not None:
+            conditions.append(pc.field("timestamp") < self._stop)
+
+        if self._compiled_filters is not None:
+            arbitration_id = pc.field("arbitration_id")
+            is_extended_id = pc.field("is_extended_id")
+            matches = []
+            for can_mask, standard_ids, extended_ids in self._compiled_filters:
+                for ids, full_mask, frame_format in (
+                    (standard_ids, 0x7FF, ~is_extended_id),
+                    (extended_ids, 0x1FFFFFFF, is_extended_id),
+                ):
+                    if not ids:
+                        continue
+                    # plain comparisons of the column can use the statistics
+                    # of the row groups, so only mask the IDs if necessary
+                    masked_id = arbitration_id
+                    if can_mask & full_mask != full_mask:
+                        masked_id = pc.bit_wise_and(  # pylint: disable=no-member
+                            arbitration_id, pa.scalar(can_mask & full_mask, pa.uint32())
+                        )
+                    matches.append(
+                        frame_format
+                        & masked_id.isin(pa.array(sorted(ids), pa.uint32()))
+                    )
+            conditions.append(functools.reduce(operator.or_, matches))
+
+        if self._channels is not None:
+            channel = pc.field("channel")
+            condition = channel.isin(
+                pa.array(
+                    sorted(str(name) for name in self._channels if name is not None),
+                    pa.string(),
+                )
+            )
+            if None in self._channels:
+                condition |= channel.is_null()
+            conditions.append(condition)
+
+        if not conditions:
+            return None
+        return functools.reduce(operator.and_, conditions)
+
+    def __iter__(self) -> Generator[Message, None, None]:
+        for batch in self.iter_batches():
+            yield from batch
+
+        self.stop()
+
+    def iter_batches(self) -> Generator[MessageBatch, None, None]:
+        """Read the messages in chunks of up to ``batch_size`` messages.
+
+        The filters of the reader are pushed down into the scan of the file,
+        so that whole row groups are skipped based on their statistics if
+        possible.
+
+        :return: a generator of :class:`~can.MessageBatch` objects in the
+                 order of the file
+        """
+        for record_batch in self._fragment.to_batches(
+            filter=self._filter_expression(),
+            batch_size=self.batch_size,
+            use_threads=False,
+        ):
+            if record_batch.num_rows:
+                yield _to_message_batch(record_batch)
+
+    def read_table(self) -> "pa.Table":
+        """Read all messages, which pass the filters of the reader, into a
+        :class:`pyarrow.Table`.
+
+        The table can be converted with e.g. :meth:`pyarrow.Table.to_pandas`
+        or :func:`polars.from_arrow` without creating any
+        :class:`~can.Message` objects.
+        """
+        return self._fragment.to_table(
+            filter=self._filter_expression(), use_threads=False
+        )
+
+
+class ParquetWriter(_ArrowMessageWriter):
+    """Logs CAN data to an Apache Parquet file (.parquet).
+
+    The messages are collected in memory and written in row groups of
+    ``row_group_size`` messages. The arbitration IDs and channels are
+    dictionary encoded and all columns are compressed.
+
+    The file is only complete after :meth:`stop` was called.
+    ParquetWriter does not support append mode.
+
+    Integer channels are stored as their decimal string and converted back
+    when reading the file.
+    """
+
+    def _open(self, compression: Optional[str]) -> None:
+        self._writer = pq.ParquetWriter(
+            self.file,
+            SCHEMA,
+            compression=compression,
+            use_dictionary=["arbitration_id", "channel"],
+        )
+
+    def _write_batch(self, record_batch: "pa.RecordBatch") -> None:
+        self._writer.write_batch(record_batch, row_group_size=self.row_group_size)
+
+    def _close(self) -> None:
+        self._writer.close()
+
+
+class ParquetReader(_ArrowMessageReader):
+    """
+    Iterator of CAN messages from an Apache Parquet file.
+
+    The filters *start*, *stop*, *can_filters* and *channels* of the reader
+    are pushed down into the scan of the file: row groups whose statistics
+    do not match are skipped without decoding them. Use :meth:`iter_batches`
+    to get the messages as :class:`~can.MessageBatch` objects, or
+    :meth:`read_table` to get a :class:`pyarrow.Table`, without creating a
+    :class:`~can.Message` for every row.
+    """
+
+    def _file_format(self) -> "ds.FileFormat":
+        return ds.ParquetFileFormat()
+
+
+class ArrowWriter(_ArrowMessageWriter):
+    """Logs CAN data to an Apache Arrow IPC file (.arrow), also known as
+    Feather version 2.
+
+    The messages are collected in memory and written in record batches of
+    ``row_group_size`` messages. The supported compression codecs are
+    ``"zstd"`` and ``"lz4"``.
+
+    The file is only complete after :meth:`stop` was called.
+    ArrowWriter does not support append mode.
+
+    Integer channels are stored as their decimal string and converted back
+    when reading the file.
+    """
+
+    def _open(self, compression: Optional[str]) -> None:
+        self._writer = pa.ipc.new_file(
+            self.file,
+            SCHEMA,
+            options=pa.ipc.IpcWriteOptions(compression=compression),
+        )
+
+    def _write_batch(self, record_batch: "pa.RecordBatch") -> None:
+        self._writer.write_batch(record_batch)
+
+    def _close(self) -> None:
+        self._writer.close()
+
+
+class ArrowReader(_ArrowMessageReader):
+    """
+    Iterator of CAN messages from an Apache Arrow IPC file.
+
+    The filters *start*, *stop*, *can_filters* and *channels* of the reader
+    are applied to every record batch while it is read. Use :meth:`iter_batches` to get the messages
+    as :class:`~can.MessageBatch` objects, or :meth:`read_table` to get a
+    :class:`pyarrow.Table`, without creating a :class:`~can.Message` for
+    every row.
+    """
+
+    def _file_format(self) -> "ds.FileFormat":
+        return ds.IpcFileFormat()
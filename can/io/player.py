@@ -3,41 +3,65 @@ This module contains the generic :class:`LogReader` as
 well as :class:`MessageSync` which plays back messages
 in the recorded order and time intervals.
 """
+import bisect
+import concurrent.futures
+import contextlib
+import copy
 import gzip
+import heapq
+import io
+import itertools
+import locale
+import mmap
+import operator
+import os
 import pathlib
+import re
 import time
 from typing import (
     Any,
+    BinaryIO,
     Dict,
     Final,
     Generator,
     Iterable,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    TextIO,
     Tuple,
     Type,
     Union,
+    cast,
 )
 
 from .._entry_points import read_entry_points
 from ..message import Message
-from ..typechecking import AcceptedIOType, FileLike, StringPathLike
-from .asc import ASCReader
+from ..typechecking import AcceptedIOType, Channel, FileLike, StringPathLike
+from .asc import ASC_TRIGGER_REGEX, ASCReader
 from .blf import BLFReader
+from .canb import CANBReader
 from .canutils import CanutilsLogReader
 from .csv import CSVReader
 from .generic import BinaryIOMessageReader, MessageReader
 from .mf4 import MF4Reader
+from .parquet import ArrowReader, ParquetReader
 from .sqlite import SqliteReader
 from .trc import TRCReader
 
 #: A map of file suffixes to their corresponding
 #: :class:`can.io.generic.MessageReader` class
 MESSAGE_READERS: Final[Dict[str, Type[MessageReader]]] = {
+    ".arrow": ArrowReader,
     ".asc": ASCReader,
     ".blf": BLFReader,
+    ".canb": CANBReader,
     ".csv": CSVReader,
     ".db": SqliteReader,
     ".log": CanutilsLogReader,
     ".mf4": MF4Reader,
+    ".parquet": ParquetReader,
     ".trc": TRCReader,
 }
 
@@ -86,13 +110,18 @@ def LogReader(filename: StringPathLike, **kwargs: Any) -> MessageReader:  # noqa
     for a given file suffix.
 
     The format is determined from the file suffix which can be one of:
+      * .arrow :class:`can.ArrowReader`
+        (optional, depends on `pyarrow <https://arrow.apache.org/docs/python/>`_)
       * .asc :class:`can.ASCReader`
       * .blf :class:`can.BLFReader`
+      * .canb :class:`can.CANBReader`
       * .csv :class:`can.CSVReader`
       * .db :class:`can.SqliteReader`
       * .log :class:`can.CanutilsLogReader`
       * .mf4 :class:`can.MF4Reader`
         (optional, depends on `asammdf <https://github.com/danielhrisca/asammdf>`_)
+      * .parquet :class:`can.ParquetReader`
+        (optional, depends on `pyarrow <https://arrow.apache.org/docs/python/>`_)
       * .trc :class:`can.TRCReader`
 
     Gzip compressed files can be used as long as the original
@@ -104,6 +133,22 @@ def LogReader(filename: StringPathLike, **kwargs: Any) -> MessageReader:  # noqa
         for msg in can.LogReader("some/path/to/my_file.log"):
             print(msg)
 
+    All readers accept the keyword arguments *start*, *stop*, *can_filters*
+    and *channels* of :class:`~can.io.generic.MessageReader` to only read
+    some of the messages. The readers skip the other messages as early as
+    possible, e.g. the :class:`~can.BLFReader` skips whole log containers
+    outside of the time range and the :class:`~can.SqliteReader` queries
+    only the matching rows::
+
+        with can.LogReader(
+            "some/path/to/my_file.blf",
+            start=3600.0,
+            stop=3660.0,
+            can_filters=[{"can_id": 0x100, "can_mask": 0x700, "extended": False}],
+        ) as reader:
+            for msg in reader:
+                print(msg)
+
     :param filename:
         the filename/path of the file to read from
     :raises ValueError:
@@ -129,6 +174,325 @@ def LogReader(filename: StringPathLike, **kwargs: Any) -> MessageReader:  # noqa
     return reader_type(file=file_or_filename, **kwargs)
 
 
+class _MergedLogReader(MessageReader):
+    """Merges sorted message streams, see :func:`merge_logs`."""
+
+    def __init__(
+        self, logs: List[Iterable[Message]], readers: List[MessageReader]
+    ) -> None:
+        super().__init__(None)
+        self._logs = logs
+        self._readers = readers
+
+    def __iter__(self) -> Generator[Message, None, None]:
+        yield from heapq.merge(*self._logs, key=operator.attrgetter("timestamp"))
+        self.stop()
+
+    def stop(self) -> None:
+        for reader in self._readers:
+            reader.stop()
+        super().stop()
+
+
+def _remap_channels(
+    messages: Iterable[Message], channel: Union[Channel, Mapping[Any, Channel]]
+) -> Generator[Message, None, None]:
+    # the messages are copied, since they might be shared with the caller
+    if isinstance(channel, Mapping):
+        for msg in messages:
+            msg_copy = copy.copy(msg)
+            msg_copy.channel = channel.get(msg.channel, msg.channel)
+            yield msg_copy
+    else:
+        for msg in messages:
+            msg_copy = copy.copy(msg)
+            msg_copy.channel = channel
+            yield msg_copy
+
+
+def merge_logs(
+    *logs: Union[StringPathLike, Iterable[Message]],
+    channels: Optional[Sequence[Union[None, Channel, Mapping[Any, Channel]]]] = None,
+    **kwargs: Any,
+) -> MessageReader:
+    """Merge several logs into a single stream of messages ordered by timestamp.
+
+    Only the next message of every log is kept in memory, so each log has
+    to be sorted by timestamp already. Messages with equal timestamps are
+    returned in the order of the logs. Recording each channel to a separate
+    file and replaying them together looks like::
+
+        with can.io.merge_logs("can0.asc", "can1.blf", channels=[0, 1]) as reader:
+            for msg in can.MessageSync(reader):
+                bus.send(msg)
+
+    :param logs:
+        filenames, which are opened with :func:`LogReader`, or any other
+        iterables of messages like :class:`~can.io.generic.MessageReader`
+        instances
+    :param channels:
+        one entry per log to change the channels of its messages, either
+        a channel to assign to every message, a mapping from the original to
+        the new channels or `None` to leave the channels as they are
+    :param kwargs:
+        passed on to :func:`LogReader` for the given filenames
+    :return:
+        a :class:`~can.io.generic.MessageReader`, which also closes
+        all given readers when stopped
+    :raises ValueError:
+        if the number of channels does not match the number of logs
+    """
+    if channels is not None and len(channels) != len(logs):
+        raise ValueError(
+            f"Got {len(channels)} channels for {len(logs)} logs, "
+            "expected one entry per log"
+        )
+
+    readers: List[MessageReader] = []
+    streams: List[Iterable[Message]] = []
+    with contextlib.ExitStack() as stack:
+        for index, log in enumerate(logs):
+            messages: Iterable[Message]
+            if isinstance(log, (str, os.PathLike)):
+                messages = stack.enter_context(LogReader(log, **kwargs))
+            else:
+                messages = log
+            if isinstance(messages, MessageReader):
+                readers.append(messages)
+            if channels is not None and channels[index] is not None:
+                messages = _remap_channels(
+                    messages, channels[index]  # type: ignore[arg-type]
+                )
+            streams.append(messages)
+        # the merged reader closes the files from now on
+        stack.pop_all()
+    return _MergedLogReader(streams, readers)
+
+
+_ShardedMessageReader = Union[ASCReader, CanutilsLogReader, TRCReader]
+
+#: The line based formats which :func:`parallel_read` can split into shards
+SHARDED_MESSAGE_READERS: Final[Dict[str, Type[_ShardedMessageReader]]] = {
+    ".asc": ASCReader,
+    ".log": CanutilsLogReader,
+    ".trc": TRCReader,
+}
+
+_ASC_TRIGGER_BYTES_REGEX: Final = re.compile(rb"begin\s+triggerblock", re.IGNORECASE)
+
+
+class _LineCounter(io.TextIOBase):
+    """Decodes the lines of a binary file and counts the bytes read.
+
+    Unlike :class:`io.TextIOWrapper`, it does not read ahead, so the count
+    ends at the last line that a reader consumed.
+    """
+
+    def __init__(self, file: BinaryIO, encoding: str) -> None:
+        super().__init__()
+        self._file = file
+        self._encoding = encoding
+        self.size = 0
+
+    # text files return str, although IOBase.readline is typed to return bytes
+    def readline(self, size: Optional[int] = -1) -> str:  # type: ignore[override]
+        line = self._file.readline(-1 if size is None else size)
+        self.size += len(line)
+        return line.decode(self._encoding)
+
+
+def _header_size(
+    reader_type: Type[_ShardedMessageReader],
+    file: BinaryIO,
+    encoding: str,
+    kwargs: Dict[str, Any],
+) -> int:
+    """Return the number of bytes that the reader consumes for the header."""
+    lines = _LineCounter(file, encoding)
+    with reader_type(cast(TextIO, lines), **kwargs) as reader:
+        # only the header is read without any lines to parse
+        for _ in reader.read_lines(()):
+            pass
+    return lines.size
+
+
+def _shard_prefixes(
+    reader_type: Type[_ShardedMessageReader], data: Any, offsets: List[int]
+) -> List[str]:
+    """Find the lines which set up the parser state at the start of each shard.
+
+    For ASC files this is the last ``Begin Triggerblock`` line before the
+    shard, since it defines the start time of the following messages.
+    """
+    if not issubclass(reader_type, ASCReader):
+        return [""] * len(offsets)
+
+    trigger_offsets: List[int] = []
+    trigger_lines: List[str] = []
+    for match in _ASC_TRIGGER_BYTES_REGEX.finditer(data):
+        line_start = data.rfind(b"\n", 0, match.start()) + 1
+        line_end = data.find(b"\n", match.end())
+        line = bytes(data[line_start : line_end if line_end >= 0 else len(data)])
+        if ASC_TRIGGER_REGEX.match(line.decode("ascii", "replace").strip()):
+            trigger_offsets.append(line_start)
+            trigger_lines.append(line.decode("ascii", "replace").strip() + "\n")
+
+    prefixes = []
+    for offset in offsets:
+        index = bisect.bisect_left(trigger_offsets, offset)
+        prefixes.append(trigger_lines[index - 1] if index else "")
+    return prefixes
+
+
+def _read_shard(
+    reader_type: Type[_ShardedMessageReader],
+    filename: StringPathLike,
+    begin: int,
+    end: int,
+    prefix: str,
+    encoding: str,
+    kwargs: Dict[str, Any],
+) -> List[tuple]:
+    """Parse the lines between two byte offsets in a worker process.
+
+    The messages are returned as tuples of the positional arguments of
+    :class:`~can.Message`, since these can be pickled much faster.
+    """
+    with open(filename, "rb") as file:
+        file.seek(begin)
+        lines = io.TextIOWrapper(io.BytesIO(file.read(end - begin)), encoding)
+
+    if begin == 0:
+        # the first shard contains the whole header
+        with reader_type(lines, **kwargs) as reader:
+            return [_message_record(msg) for msg in reader]
+
+    with reader_type(filename, **kwargs) as reader:
+        messages = reader.read_lines(
+            itertools.chain((prefix,), lines) if prefix else lines
+        )
+        return [_message_record(msg) for msg in messages]
+
+
+def _message_record(msg: Message) -> tuple:
+    return (
+        msg.timestamp,
+        msg.arbitration_id,
+        msg.is_extended_id,
+        msg.is_remote_frame,
+        msg.is_error_frame,
+        msg.channel,
+        msg.dlc,
+        msg.data,
+        msg.is_fd,
+        msg.is_rx,
+        msg.bitrate_switch,
+        msg.error_state_indicator,
+    )
+
+
+def parallel_read(
+    filename: StringPathLike,
+    workers: Optional[int] = None,
+    ordered: bool = True,
+    shard_size: int = 4 * 1024 * 1024,
+    sort: bool = True,
+    **kwargs: Any,
+) -> Union[Iterable[Message], Iterable[List[Message]]]:
+    """Read a line based log file with several processes.
+
+    The file is split at line boundaries into shards of about *shard_size*
+    bytes, which are parsed in a process pool. The header of the file, like
+    the base and the start time of an ASC file, is read by every worker, so
+    the messages are the same as the ones read with :func:`LogReader`.
+    By default they are however sorted by their timestamp instead of being
+    returned in the order of the file, which differs for example for ASC
+    files with several trigger blocks and relative timestamps. With
+    ``sort=False`` the order is the same as with :func:`LogReader`.
+
+    Supported are the formats in :data:`SHARDED_MESSAGE_READERS`::
+
+        for msg in can.io.player.parallel_read("some/path/to/my_file.asc"):
+            print(msg)
+
+    :param filename:
+        the filename/path of the file to read from
+    :param workers:
+        the number of worker processes, defaults to the number of processors
+    :param ordered:
+        If `True`, the messages of all shards are returned in one list, which
+        is sorted by their timestamp (see *sort*). Messages with equal
+        timestamps keep their order in the file. This waits until every shard
+        has been parsed.
+        If `False`, lists of messages are returned as soon as the shards are
+        parsed, in no particular order.
+    :param shard_size:
+        the approximate size of the shards in bytes
+    :param sort:
+        If `False` and *ordered* is `True`, the shards are joined in the order
+        of the file and the messages are not sorted by their timestamp.
+    :param kwargs:
+        passed on to the reader, e.g. `relative_timestamp` of
+        :class:`~can.ASCReader`
+    :raises ValueError:
+        if the format cannot be read in parallel
+    """
+    suffix = pathlib.PurePath(filename).suffix.lower()
+    try:
+        reader_type = SHARDED_MESSAGE_READERS[suffix]
+    except KeyError:
+        raise ValueError(
+            f'No parallel read support for log format "{suffix}"'
+        ) from None
+    if workers is not None and workers < 1:
+        raise ValueError("workers must be at least 1")
+    if shard_size < 1:
+        raise ValueError("shard_size must be at least 1")
+
+    encoding = kwargs.get("encoding", locale.getpreferredencoding(False))
+    with open(filename, "rb") as file:
+        size = os.fstat(file.fileno()).st_size
+        if not size:
+            return [] if ordered else iter(())
+        header_size = _header_size(reader_type, file, encoding, kwargs)
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            offsets = [0]
+            while offsets[-1] + shard_size < size:
+                newline = data.find(
+                    b"\n", max(offsets[-1] + shard_size, header_size) - 1
+                )
+                if newline < 0 or newline + 1 >= size:
+                    break
+                offsets.append(newline + 1)
+            prefixes = _shard_prefixes(reader_type, data, offsets)
+    offsets.append(size)
+
+    executor = concurrent.futures.ProcessPoolExecutor(workers)
+    futures = [
+        executor.submit(
+            _read_shard, reader_type, filename, begin, end, prefix, encoding, kwargs
+        )
+        for begin, end, prefix in zip(offsets, offsets[1:], prefixes)
+    ]
+    executor.shutdown(wait=False)
+
+    if not ordered:
+        return (
+            [Message(*record) for record in future.result()]
+            for future in concurrent.futures.as_completed(futures)
+        )
+
+    if not sort:
+        return [Message(*record) for future in futures for record in future.result()]
+
+    shards = []
+    for future in futures:
+        shard = [Message(*record) for record in future.result()]
+        shard.sort(key=operator.attrgetter("timestamp"))
+        shards.append(shard)
+    return list(heapq.merge(*shards, key=operator.attrgetter("timestamp")))
+
+
 class MessageSync:
     """
     Used to iterate over some given messages in the recorded time.
@@ -5,26 +5,51 @@ Implements an SQL database writer and reader for storing CAN messages.
 """
 
 import logging
+import queue
 import sqlite3
 import threading
 import time
-from typing import Any, Generator
+from typing import Any, Collection, Generator, Iterable, List, Optional, Tuple
 
 from can.listener import BufferedReader
 from can.message import Message
 
-from ..typechecking import StringPathLike
+from ..typechecking import Channel, StringPathLike
+from ..util import CompiledFilters
 from .generic import MessageReader, MessageWriter
 
 log = logging.getLogger("can.io.sqlite")
 
+#: The version of the table schema, which is stored as ``user_version``
+#: in new databases. Version 1 only had the columns up to ``data``.
+SCHEMA_VERSION = 2
+
+# The columns of the table in the order of the arguments of Message()
+_COLUMNS_V1 = "ts, arbitration_id, extended, remote, error, NULL, dlc, data"
+_COLUMNS = (
+    "ts, arbitration_id, extended, remote, error, channel, dlc, data, "
+    "fd, rx, bitrate_switch, error_state_indicator"
+)
+
+# The masks, which keep all bits of standard and extended IDs
+_FULL_MASKS = (0x7FF, 0x1FFFFFFF)
+
+
+def _schema_version(conn: sqlite3.Connection, table_name: str) -> Optional[int]:
+    """Return the schema version of an existing table or `None`."""
+    columns = {row[1] for row in conn.execute(f"PRAGMA table_info({table_name})")}
+    if not columns:
+        return None
+    return SCHEMA_VERSION if "channel" in columns else 1
+
 
 class SqliteReader(MessageReader):
     """
     Reads recorded CAN messages from a simple SQL database.
 
     This class can be iterated over or used to fetch all messages in the
-    database with :meth:`~SqliteReader.read_all`.
+    database with :meth:`~SqliteReader.read_all`. Single signals can be
+    looked up quickly with :meth:`~SqliteReader.query`.
 
     Calling :func:`len` on this object might not run in constant time.
 
@@ -48,39 +73,156 @@ class SqliteReader(MessageReader):
                      do not accept file-like objects as the `file` parameter.
                      It also runs in ``append=True`` mode all the time.
         """
-        super().__init__(file=None)
+        super().__init__(file=None, **kwargs)
         self._conn = sqlite3.connect(file)
         self._cursor = self._conn.cursor()
         self.table_name = table_name
+        self.schema_version = _schema_version(self._conn, table_name)
+        self._columns = _COLUMNS_V1 if self.schema_version == 1 else _COLUMNS
+        self._where, self._parameters = self._where_clause(
+            self._start, self._stop, self._compiled_filters, self._channels
+        )
+
+    def _where_clause(
+        self,
+        start: Optional[float],
+        stop: Optional[float],
+        compiled_filters: Optional[CompiledFilters],
+        channels: Optional[Collection[Optional[Channel]]],
+    ) -> Tuple[List[str], List[Any]]:
+        """Translate filters into the conditions of an SQL ``WHERE`` clause."""
+        conditions = []
+        parameters: List[Any] = []
+        if start is not None:
+            conditions.append("ts >= ?")
+            parameters.append(start)
+        if stop is not None:
+            conditions.append("ts < ?")
+            parameters.append(stop)
+        if compiled_filters is not None:
+            alternatives = []
+            for can_mask, standard_ids, extended_ids in compiled_filters:
+                for extended, ids in enumerate((standard_ids, extended_ids)):
+                    if not ids:
+                        continue
+                    # the IDs are integers, so they can be inserted directly
+                    # instead of running into the limit of SQL parameters
+                    id_list = ",".join(str(int(can_id)) for can_id in sorted(ids))
+                    if can_mask & _FULL_MASKS[extended] == _FULL_MASKS[extended]:
+                        # this can use the index
+                        id_condition = f"arbitration_id IN ({id_list})"
+                    else:
+                        id_condition = (
+                            f"(arbitration_id & {int(can_mask)}) IN ({id_list})"
+                        )
+                    alternatives.append(f"(extended = {extended} AND {id_condition})")
+            conditions.append(f"({' OR '.join(alternatives)})")
+        if channels is not None:
+            if self.schema_version == 1:
+                if None not in channels:
+                    # the channel is not stored
+                    conditions.append("0")
+            else:
+                channel_conditions = ["channel IS NULL"] if None in channels else []
+                values = [channel for channel in channels if channel is not None]
+                if values:
+                    channel_conditions.append(
+                        f"channel IN ({','.join('?' * len(values))})"
+                    )
+                    parameters.extend(values)
+                conditions.append(f"({' OR '.join(channel_conditions) or '0'})")
+        return conditions, parameters
+
+    def _select(
+        self,
+        columns: str,
+        conditions: Iterable[str] = (),
+        parameters: Iterable[Any] = (),
+        order_by: str = "",
+    ) -> sqlite3.Cursor:
+        conditions = [*self._where, *conditions]
+        where = f" WHERE {' AND '.join(conditions)}" if conditions else ""
+        return self._cursor.execute(
+            f"SELECT {columns} FROM {self.table_name}{where}{order_by}",
+            [*self._parameters, *parameters],
+        )
 
     def __iter__(self) -> Generator[Message, None, None]:
-        for frame_data in self._cursor.execute(f"SELECT * FROM {self.table_name}"):
+        # the indexes might return the messages in another order than written
+        for frame_data in self._select(self._columns, order_by=" ORDER BY rowid"):
+            yield SqliteReader._assemble_message(frame_data)
+
+    def query(
+        self,
+        arbitration_ids: Optional[Iterable[int]] = None,
+        start: Optional[float] = None,
+        stop: Optional[float] = None,
+        channels: Optional[Iterable[Channel]] = None,
+    ) -> Generator[Message, None, None]:
+        """Return the messages matching all the given criteria, ordered by
+        their timestamp.
+
+        The indexes of the table are used to find the messages, so looking up
+        the messages of a single arbitration ID does not scan the whole table.
+        The filters of the reader apply as well.
+
+        :param arbitration_ids: only return messages with one of these arbitration IDs
+        :param start: only return messages with a timestamp at or after ``start``
+        :param stop: only return messages with a timestamp before ``stop``
+        :param channels: only return messages of these channels
+        """
+        conditions, parameters = self._where_clause(
+            start, stop, None, None if channels is None else set(channels)
+        )
+        if arbitration_ids is not None:
+            id_list = ",".join(str(int(can_id)) for can_id in set(arbitration_ids))
+            conditions.append(f"arbitration_id IN ({id_list})")
+        for frame_data in self._select(
+            self._columns, conditions, parameters, " ORDER BY ts"
+        ):
             yield SqliteReader._assemble_message(frame_data)
 
     @staticmethod
     def _assemble_message(frame_data):
-        timestamp, can_id, is_extended, is_remote, is_error, dlc, data = frame_data
+        (
+            timestamp,
+            can_id,
+            is_extended,
+            is_remote,
+            is_error,
+            channel,
+            dlc,
+            data,
+            *flags,
+        ) = frame_data
+        is_fd, is_rx, bitrate_switch, error_state_indicator = flags or (0, 1, 0, 0)
         return Message(
             timestamp=timestamp,
             is_remote_frame=bool(is_remote),
             is_extended_id=bool(is_extended),
             is_error_frame=bool(is_error),
             arbitration_id=can_id,
+            channel=channel,
             dlc=dlc,
             data=data,
+            is_fd=bool(is_fd),
+            is_rx=bool(is_rx),
+            bitrate_switch=bool(bitrate_switch),
+            error_state_indicator=bool(error_state_indicator),
         )
 
     def __len__(self):
         # this might not run in constant time
-        result = self._cursor.execute(f"SELECT COUNT(*) FROM {self.table_name}")
+        result = self._select("COUNT(*)")
         return int(result.fetchone()[0])
 
     def read_all(self):
-        """Fetches all messages in the database.
+        """Fetches all messages in the database, which pass the filters
+        of the reader.
 
         :rtype: Generator[can.Message]
         """
-        result = self._cursor.execute(f"SELECT * FROM {self.table_name}").fetchall()
+        result = self._select(self._columns, order_by=" ORDER BY rowid").fetchall()
         return (SqliteReader._assemble_message(frame) for frame in result)
 
     def stop(self):
@@ -105,6 +247,12 @@ class SqliteWriter(MessageWriter, BufferedReader):
                           excludes messages that are still buffered
     :attr float last_write: the last time a message war actually written to the database,
                             as given by ``time.time()``
+    :attr int num_commits: the number of transactions committed to the database
+    :attr int max_queue_depth: the largest number of messages that were waiting in
+                               the internal queue when a batch was started
+    :attr float last_commit_latency: the number of seconds the last transaction
+                                     took to insert and commit its batch
+    :attr float max_commit_latency: the longest time a single transaction took
 
     .. note::
 
@@ -118,8 +266,21 @@ class SqliteWriter(MessageWriter, BufferedReader):
 
         However if the bus is still saturated with messages, the Listener
         will continue receiving until the :attr:`~can.SqliteWriter.MAX_TIME_BETWEEN_WRITES`
-        timeout is reached or more than
-        :attr:`~can.SqliteWriter.MAX_BUFFER_SIZE_BEFORE_WRITES` messages are buffered.
+        timeout is reached or the batch is full. A batch holds at least
+        :attr:`~can.SqliteWriter.MAX_BUFFER_SIZE_BEFORE_WRITES` messages. When
+        more messages are already waiting in the internal queue, the batch grows
+        up to :attr:`~can.SqliteWriter.MAX_BATCH_SIZE` messages, so that a
+        backlog is written with few transactions.
+
+    .. note::
+
+        By default the database is opened in
+        `write-ahead logging <https://www.sqlite.org/wal.html>`__ mode with
+        ``synchronous=NORMAL``. This makes commits much cheaper and still allows
+        :class:`~can.SqliteReader` to read the database while it is being written.
+        The last transactions might be lost on a power failure, though. Pass
+        ``journal_mode=None`` and ``synchronous=None`` to keep the defaults of
+        SQLite.
 
     .. note:: The database schema is given in the documentation of the loggers.
 
@@ -132,18 +293,28 @@ class SqliteWriter(MessageWriter, BufferedReader):
     """Maximum number of seconds to wait between writes to the database"""
 
     MAX_BUFFER_SIZE_BEFORE_WRITES = 500
-    """Maximum number of messages to buffer before writing to the database"""
+    """Maximum number of messages to buffer before writing to the database,
+    if no more messages are waiting in the internal queue"""
+
+    MAX_BATCH_SIZE = 50_000
+    """Maximum number of messages written to the database in one transaction"""
 
     def __init__(
         self,
         file: StringPathLike,
         table_name: str = "messages",
+        journal_mode: Optional[str] = "WAL",
+        synchronous: Optional[str] = "NORMAL",
         **kwargs: Any,
     ) -> None:
         """
         :param file: a `str` or path like object that points
                      to the database file to use
         :param str table_name: the name of the table to store messages in
+        :param journal_mode: the ``PRAGMA journal_mode`` of the database,
+                             or `None` to leave it unchanged
+        :param synchronous: the ``PRAGMA synchronous`` setting of the connection,
+                            or `None` to leave it unchanged
 
         .. warning:: In contrary to all other readers/writers the Sqlite handlers
                      do not accept file-like objects as the `file` parameter.
@@ -156,15 +327,26 @@ class SqliteWriter(MessageWriter, BufferedReader):
         super().__init__(file=None)
         self.table_name = table_name
         self._db_filename = file
+        self._journal_mode = journal_mode
+        self._synchronous = synchronous
         self._stop_running_event = threading.Event()
         self._conn = None
-        self._writer_thread = threading.Thread(target=self._db_writer_thread)
-        self._writer_thread.start()
+        # both are set when the database is opened in the writer thread
+        self._insert_template = ""
+        self.schema_version = SCHEMA_VERSION
         self.num_frames = 0
         self.last_write = time.time()
-        self._insert_template = (
-            f"INSERT INTO {self.table_name} VALUES (?, ?, ?, ?, ?, ?, ?)"
-        )
+        self.num_commits = 0
+        self.max_queue_depth = 0
+        self.last_commit_latency = 0.0
+        self.max_commit_latency = 0.0
+        self._writer_thread = threading.Thread(target=self._db_writer_thread)
+        self._writer_thread.start()
+
+    @property
+    def queue_depth(self) -> int:
+        """The approximate number of messages waiting to be written."""
+        return self.buffer.qsize()
 
     def _create_db(self):
         """Creates a new databae or opens a connection to an existing one.
@@ -175,48 +357,119 @@ class SqliteWriter(MessageWriter, BufferedReader):
         """
         log.debug("Creating sqlite database")
         self._conn = sqlite3.connect(self._db_filename)
+        if self._journal_mode is not None:
+            self._conn.execute(f"PRAGMA journal_mode = {self._journal_mode}")
+        if self._synchronous is not None:
+            self._conn.execute(f"PRAGMA synchronous = {self._synchronous}")
+
+        # messages are appended to tables of older versions in their format
+        schema_version = _schema_version(self._conn, self.table_name)
+        if schema_version is None:
+            # create table structure
+            self._conn.execute(
+                f"""CREATE TABLE {self.table_name}
+                (
+                  ts REAL,
+                  arbitration_id INTEGER,
+                  extended INTEGER,
+                  remote INTEGER,
+                  error INTEGER,
+                  dlc INTEGER,
+                  data BLOB,
+                  channel,
+                  fd INTEGER,
+                  rx INTEGER,
+                  bitrate_switch INTEGER,
+                  error_state_indicator INTEGER
+                )"""
+            )
+            self._conn.execute(
+                f"CREATE INDEX {self.table_name}_ts ON {self.table_name} (ts)"
+            )
+            self._conn.execute(
+                f"CREATE INDEX {self.table_name}_arbitration_id_ts "
+                f"ON {self.table_name} (arbitration_id, ts)"
+            )
+            self._conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+            schema_version = SCHEMA_VERSION
+        self._conn.commit()
 
-        # create table structure
-        self._conn.cursor().execute(
-            f"""CREATE TABLE IF NOT EXISTS {self.table_name}
-            (
-              ts REAL,
-              arbitration_id INTEGER,
-              extended INTEGER,
-              remote INTEGER,
-              error INTEGER,
-              dlc INTEGER,
-              data BLOB
-            )"""
+        self.schema_version = schema_version
+        if schema_version == SCHEMA_VERSION:
+            columns, count = _COLUMNS, 12
+        else:
+            columns, count = "ts, arbitration_id, extended, remote, error, dlc, data", 7
+        self._insert_template = (
+            f"INSERT INTO {self.table_name} ({columns}) "
+            f"VALUES ({', '.join('?' * count)})"
         )
-        self._conn.commit()
+
+    def _drain(self, messages: List[Message], batch_size: int) -> None:
+        """Moves the messages that are already queued to *messages* without
+        blocking, until the batch is full."""
+        get_nowait = self.buffer.get_nowait
+        try:
+            for _ in range(batch_size - len(messages)):
+                messages.append(get_nowait())
+        except queue.Empty:
+            pass
+
+    def _to_rows(self, messages: List[Message]) -> List[tuple]:
+        if self.schema_version == SCHEMA_VERSION:
+            return [
+                (
+                    msg.timestamp,
+                    msg.arbitration_id,
+                    msg.is_extended_id,
+                    msg.is_remote_frame,
+                    msg.is_error_frame,
+                    msg.channel,
+                    msg.dlc,
+                    memoryview(msg.data),
+                    msg.is_fd,
+                    msg.is_rx,
+                    msg.bitrate_switch,
+                    msg.error_state_indicator,
+                )
+                for msg in messages
+            ]
+        return [
+            (
+                msg.timestamp,
+                msg.arbitration_id,
+                msg.is_extended_id,
+                msg.is_remote_frame,
+                msg.is_error_frame,
+                msg.dlc,
+                memoryview(msg.data),
+            )
+            for msg in messages
+        ]
 
     def _db_writer_thread(self):
         self._create_db()
 
         try:
             while True:
-                messages = []  # reset buffer
+                messages: List[Message] = []  # reset buffer
 
                 msg = self.get_message(self.GET_MESSAGE_TIMEOUT)
+
+                # grow the batch with the backlog, so that a full queue
+                # is written with few and large transactions
+                queue_depth = self.buffer.qsize() + (msg is not None)
+                self.max_queue_depth = max(self.max_queue_depth, queue_depth)
+                batch_size = min(
+                    max(queue_depth, self.MAX_BUFFER_SIZE_BEFORE_WRITES),
+                    self.MAX_BATCH_SIZE,
+                )
                 while msg is not None:
-                    # log.debug("SqliteWriter: buffering message")
-
-                    messages.append(
-                        (
-                            msg.timestamp,
-                            msg.arbitration_id,
-                            msg.is_extended_id,
-                            msg.is_remote_frame,
-                            msg.is_error_frame,
-                            msg.dlc,
-                            memoryview(msg.data),
-                        )
-                    )
+                    messages.append(msg)
+                    self._drain(messages, batch_size)
 
                     if (
                         time.time() - self.last_write > self.MAX_TIME_BETWEEN_WRITES
-                        or len(messages) > self.MAX_BUFFER_SIZE_BEFORE_WRITES
+                        or len(messages) >= batch_size
                     ):
                         break
 
@@ -225,15 +478,21 @@ class SqliteWriter(MessageWriter, BufferedReader):
 
                 count = len(messages)
                 if count > 0:
+                    rows = self._to_rows(messages)
+                    started = time.perf_counter()
                     with self._conn:
                         # log.debug("Writing %d frames to db", count)
-                        self._conn.executemany(self._insert_template, messages)
-                        self._conn.commit()  # make the changes visible to the entire database
+                        self._conn.executemany(self._insert_template, rows)
+                    latency = time.perf_counter() - started
+                    self.last_commit_latency = latency
+                    self.max_commit_latency = max(self.max_commit_latency, latency)
+                    self.num_commits += 1
                     self.num_frames += count
                     self.last_write = time.time()
 
-                # check if we are still supposed to run and go back up if yes
-                if self._stop_running_event.is_set():
+                # check if we are still supposed to run and go back up if yes,
+                # a backlog is written completely before stopping
+                if self._stop_running_event.is_set() and self.buffer.empty():
                     break
 
         finally:
@@ -11,7 +11,17 @@ import logging
 import os
 from datetime import datetime, timedelta, timezone
 from enum import Enum
-from typing import Any, Callable, Dict, Generator, List, Optional, TextIO, Union
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Generator,
+    Iterable,
+    List,
+    Optional,
+    TextIO,
+    Union,
+)
 
 from ..message import Message
 from ..typechecking import StringPathLike
@@ -56,7 +66,7 @@ class TRCReader(TextIOMessageReader):
                      If this is a file-like object, is has to opened in text
                      read mode, not binary read mode.
         """
-        super().__init__(file, mode="r")
+        super().__init__(file, mode="r", **kwargs)
         self.file_version = TRCFileVersion.UNKNOWN
         self.start_time: Optional[datetime] = None
         self.columns: Dict[str, int] = {}
@@ -116,100 +126,137 @@ class TRCReader(TextIOMessageReader):
             logger.info(
                 "TRCReader: No file version was found, so version 1.0 is assumed"
             )
-            self._parse_cols = self._parse_msg_v1_0
+            self._parse_cols = self._make_parser_v1_0()
         elif self.file_version == TRCFileVersion.V1_0:
-            self._parse_cols = self._parse_msg_v1_0
+            self._parse_cols = self._make_parser_v1_0()
         elif self.file_version == TRCFileVersion.V1_1:
-            self._parse_cols = self._parse_cols_v1_1
+            self._parse_cols = self._make_parser_v1_1()
         elif self.file_version in [TRCFileVersion.V2_0, TRCFileVersion.V2_1]:
-            self._parse_cols = self._parse_cols_v2_x
+            self._parse_cols = self._make_parser_v2_x()
         else:
             raise NotImplementedError("File version not fully implemented for reading")
 
         return line
 
-    def _parse_msg_v1_0(self, cols: List[str]) -> Optional[Message]:
-        arbit_id = cols[2]
-        if arbit_id == "FFFFFFFF":
-            logger.info("TRCReader: Dropping bus info line")
-            return None
+    # The parsers below are created once per file, so that the column layout
+    # is resolved before the first message instead of for every line.
+
+    def _make_parser_v1_0(self) -> Callable[[List[str]], Optional[Message]]:
+        filtering = self._filtering
+        accepts = self._accepts
+
+        def parse(cols: List[str]) -> Optional[Message]:
+            arbit_id = cols[2]
+            if arbit_id == "FFFFFFFF":
+                logger.info("TRCReader: Dropping bus info line")
+                return None
+
+            timestamp = float(cols[1]) / 1000
+            arbitration_id = int(arbit_id, 16)
+            is_extended_id = len(arbit_id) > 4
+            if filtering and not accepts(timestamp, arbitration_id, is_extended_id, 1):
+                return None
+
+            dlc = int(cols[3])
+            return Message(
+                timestamp=timestamp,
+                arbitration_id=arbitration_id,
+                is_extended_id=is_extended_id,
+                channel=1,
+                dlc=dlc,
+                data=_decode_data(cols, 4, dlc),
+            )
 
-        msg = Message()
-        msg.timestamp = float(cols[1]) / 1000
-        msg.arbitration_id = int(arbit_id, 16)
-        msg.is_extended_id = len(arbit_id) > 4
-        msg.channel = 1
-        msg.dlc = int(cols[3])
-        msg.data = bytearray([int(cols[i + 4], 16) for i in range(msg.dlc)])
-        return msg
-
-    def _parse_msg_v1_1(self, cols: List[str]) -> Optional[Message]:
-        arbit_id = cols[3]
-
-        msg = Message()
-        if isinstance(self.start_time, datetime):
-            msg.timestamp = (
-                self.start_time + timedelta(milliseconds=float(cols[1]))
-            ).timestamp()
-        else:
-            msg.timestamp = float(cols[1]) / 1000
-        msg.arbitration_id = int(arbit_id, 16)
-        msg.is_extended_id = len(arbit_id) > 4
-        msg.channel = 1
-        msg.dlc = int(cols[4])
-        msg.data = bytearray([int(cols[i + 5], 16) for i in range(msg.dlc)])
-        msg.is_rx = cols[2] == "Rx"
-        return msg
-
-    def _parse_msg_v2_x(self, cols: List[str]) -> Optional[Message]:
-        type_ = cols[self.columns["T"]]
-        bus = self.columns.get("B", None)
-
-        if "l" in self.columns:
-            length = int(cols[self.columns["l"]])
-            dlc = len2dlc(length)
-        elif "L" in self.columns:
-            dlc = int(cols[self.columns["L"]])
-            length = dlc2len(dlc)
-        else:
-            raise ValueError("No length/dlc columns present.")
+        return parse
+
+    def _make_parser_v1_1(self) -> Callable[[List[str]], Optional[Message]]:
+        filtering = self._filtering
+        accepts = self._accepts
+        start = self.start_time.timestamp() if self.start_time else 0.0
+
+        def parse(cols: List[str]) -> Optional[Message]:
+            dtype = cols[2]
+            if dtype not in ("Tx", "Rx"):
+                logger.info("TRCReader: Unsupported type '%s'", dtype)
+                return None
+
+            arbit_id = cols[3]
+            timestamp = start + float(cols[1]) / 1000
+            arbitration_id = int(arbit_id, 16)
+            is_extended_id = len(arbit_id) > 4
+            if filtering and not accepts(timestamp, arbitration_id, is_extended_id, 1):
+                return None
+
+            dlc = int(cols[4])
+            return Message(
+                timestamp=timestamp,
+                arbitration_id=arbitration_id,
+                is_extended_id=is_extended_id,
+                channel=1,
+                dlc=dlc,
+                data=_decode_data(cols, 5, dlc),
+                is_rx=dtype == "Rx",
+            )
 
-        msg = Message()
-        if isinstance(self.start_time, datetime):
-            msg.timestamp = (
-                self.start_time + timedelta(milliseconds=float(cols[self.columns["O"]]))
-            ).timestamp()
+        return parse
+
+    def _make_parser_v2_x(self) -> Callable[[List[str]], Optional[Message]]:
+        filtering = self._filtering
+        accepts = self._accepts
+        start = self.start_time.timestamp() if self.start_time else 0.0
+
+        columns = self.columns
+        col_type = columns["T"]
+        col_offset = columns["O"]
+        col_id = columns["I"]
+        col_dir = columns["d"]
+        col_data = columns["D"]
+        col_bus = columns.get("B")
+        if "l" in columns:
+            col_length = columns["l"]
+            length_is_dlc = False
+        elif "L" in columns:
+            col_length = columns["L"]
+            length_is_dlc = True
         else:
-            msg.timestamp = float(cols[1]) / 1000
-        msg.arbitration_id = int(cols[self.columns["I"]], 16)
-        msg.is_extended_id = len(cols[self.columns["I"]]) > 4
-        msg.channel = int(cols[bus]) if bus is not None else 1
-        msg.dlc = dlc
-        msg.data = bytearray(
-            [int(cols[i + self.columns["D"]], 16) for i in range(length)]
-        )
-        msg.is_rx = cols[self.columns["d"]] == "Rx"
-        msg.is_fd = type_ in ["FD", "FB", "FE", "BI"]
-        msg.bitrate_switch = type_ in ["FB", " FE"]
-        msg.error_state_indicator = type_ in ["FE", "BI"]
+            raise ValueError("No length/dlc columns present.")
 
-        return msg
+        def parse(cols: List[str]) -> Optional[Message]:
+            dtype = cols[col_type]
+            if dtype not in ("DT", "FD", "FB"):
+                logger.info("TRCReader: Unsupported type '%s'", dtype)
+                return None
 
-    def _parse_cols_v1_1(self, cols: List[str]) -> Optional[Message]:
-        dtype = cols[2]
-        if dtype in ("Tx", "Rx"):
-            return self._parse_msg_v1_1(cols)
-        else:
-            logger.info("TRCReader: Unsupported type '%s'", dtype)
-            return None
+            if length_is_dlc:
+                dlc = int(cols[col_length])
+                length = dlc2len(dlc)
+            else:
+                length = int(cols[col_length])
+                dlc = len2dlc(length)
+
+            timestamp = start + float(cols[col_offset]) / 1000
+            arbit_id = cols[col_id]
+            arbitration_id = int(arbit_id, 16)
+            is_extended_id = len(arbit_id) > 4
+            channel = int(cols[col_bus]) if col_bus is not None else 1
+            if filtering and not accepts(
+                timestamp, arbitration_id, is_extended_id, channel
+            ):
+                return None
+
+            return Message(
+                timestamp=timestamp,
+                arbitration_id=arbitration_id,
+                is_extended_id=is_extended_id,
+                channel=channel,
+                dlc=dlc,
+                data=_decode_data(cols, col_data, length),
+                is_rx=cols[col_dir] == "Rx",
+                is_fd=dtype != "DT",
+                bitrate_switch=dtype == "FB",
+            )
 
-    def _parse_cols_v2_x(self, cols: List[str]) -> Optional[Message]:
-        dtype = cols[self.columns["T"]]
-        if dtype in ["DT", "FD", "FB"]:
-            return self._parse_msg_v2_x(cols)
-        else:
-            logger.info("TRCReader: Unsupported type '%s'", dtype)
-            return None
+        return parse
 
     def _parse_line(self, line: str) -> Optional[Message]:
         logger.debug("TRCReader: Parse '%s'", line)
@@ -228,21 +275,44 @@ class TRCReader(TextIOMessageReader):
             if msg is not None:
                 yield msg
 
-        for line in self.file:
-            temp = line.strip()
-            if temp.startswith(";"):
-                # Comment line
-                continue
+        yield from self._parse_lines(self.file)
+        self.stop()
 
-            if len(temp) == 0:
-                # Empty line
+    def read_lines(self, lines: Iterable[str]) -> Generator[Message, None, None]:
+        """Read the header of the file and then parse the given lines instead
+        of the rest of the file.
+
+        This is used by :func:`~can.io.player.parallel_read` to parse a part
+        of a large file.
+        """
+        # the first line after the header belongs to the rest of the file
+        self._extract_header()
+        yield from self._parse_lines(lines)
+
+    def _parse_lines(self, lines: Iterable[str]) -> Generator[Message, None, None]:
+        """Parse the lines following the header."""
+        parse_cols = self._parse_cols
+        for line in lines:
+            cols = line.split()
+            if not cols or cols[0].startswith(";"):
+                # Empty or comment line
                 continue
 
-            msg = self._parse_line(temp)
+            try:
+                msg = parse_cols(cols)
+            except IndexError:
+                logger.warning("TRCReader: Failed to parse message '%s'", line.strip())
+                continue
             if msg is not None:
                 yield msg
 
-        self.stop()
+
+def _decode_data(cols: List[str], first: int, length: int) -> bytearray:
+    """Decode the data bytes, which are given as one column per byte."""
+    data = cols[first : first + length]
+    if len(data) < length:
+        raise IndexError("Missing data bytes")
+    return bytearray.fromhex(" ".join(data))
 
 
 class TRCWriter(TextIOMessageWriter):
@@ -266,6 +336,7 @@ class TRCWriter(TextIOMessageWriter):
         self,
         file: Union[StringPathLike, TextIO],
         channel: int = 1,
+        buffer_size: int = 0,
         **kwargs: Any,
     ) -> None:
         """
@@ -274,6 +345,9 @@ class TRCWriter(TextIOMessageWriter):
                      write mode, not binary write mode.
         :param channel: a default channel to use when the message does not
                         have a channel set
+        :param buffer_size: if set, this many lines are collected and written
+                            to the file at once. The buffer is written when
+                            the writer is flushed or stopped.
         """
         super().__init__(file, mode="w")
         self.channel = channel
@@ -290,6 +364,9 @@ class TRCWriter(TextIOMessageWriter):
         self.file_version = TRCFileVersion.V2_1
         self._msg_fmt_string = self.FORMAT_MESSAGE_V1_0
         self._format_message = self._format_message_init
+        self.buffer_size = buffer_size
+        self._lines: List[str] = []
+        self._buffered_size = 0
 
     def _write_header_v1_0(self, start_time: datetime) -> None:
         lines = [
@@ -355,17 +432,49 @@ class TRCWriter(TextIOMessageWriter):
         )
         return serialized
 
+    def _format_message_v1_0(self, msg, _channel):
+        arb_id = (
+            f"{msg.arbitration_id:07X}"
+            if msg.is_extended_id
+            else f"{msg.arbitration_id:04X}"
+        )
+        return (
+            f"{self.msgnr:>6}) {(msg.timestamp - self.first_timestamp) * 1000:7.0f} "
+            f"{arb_id:>8} {msg.dlc:<1} {msg.data.hex(' ').upper()}"
+        )
+
+    def _format_message_v2_1(self, msg, channel):
+        arb_id = (
+            f"{msg.arbitration_id:07X}"
+            if msg.is_extended_id
+            else f"{msg.arbitration_id:04X}"
+        )
+        return (
+            f"{self.msgnr:>7} {(msg.timestamp - self.first_timestamp) * 1000:13.3f} "
+            f"DT {channel:>2} {arb_id:>8} {'Rx' if msg.is_rx else 'Tx'} -  "
+            f"{msg.dlc:<4} {msg.data.hex(' ').upper()}"
+        )
+
     def _format_message_init(self, msg, channel):
+        # the format string is only interpreted if it was overridden
         if self.file_version == TRCFileVersion.V1_0:
-            self._format_message = self._format_message_by_format
             self._msg_fmt_string = self.FORMAT_MESSAGE_V1_0
+            self._format_message = (
+                self._format_message_v1_0
+                if self._msg_fmt_string == TRCWriter.FORMAT_MESSAGE_V1_0
+                else self._format_message_by_format
+            )
         elif self.file_version == TRCFileVersion.V2_1:
-            self._format_message = self._format_message_by_format
             self._msg_fmt_string = self.FORMAT_MESSAGE
+            self._format_message = (
+                self._format_message_v2_1
+                if self._msg_fmt_string == TRCWriter.FORMAT_MESSAGE
+                else self._format_message_by_format
+            )
         else:
             raise NotImplementedError("File format is not supported")
 
-        return self._format_message_by_format(msg, channel)
+        return self._format_message(msg, channel)
 
     def write_header(self, timestamp: float) -> None:
         # write start of file header
@@ -383,7 +492,30 @@ class TRCWriter(TextIOMessageWriter):
         if not self.header_written:
             self.write_header(timestamp)
 
-        self.file.write(message + "\n")
+        line = message + "\n"
+        if not self.buffer_size:
+            self.file.write(line)
+            return
+
+        self._lines.append(line)
+        self._buffered_size += len(line)
+        if len(self._lines) >= self.buffer_size:
+            self.flush()
+
+    def flush(self) -> None:
+        """Write the buffered lines to the file."""
+        if self._lines:
+            self.file.writelines(self._lines)
+            self._lines = []
+            self._buffered_size = 0
+
+    def file_size(self) -> int:
+        """Return the size of the file including the buffered lines."""
+        return self.file.tell() + self._buffered_size
+
+    def stop(self) -> None:
+        self.flush()
+        super().stop()
 
     def on_message_received(self, msg: Message) -> None:
         if self.first_timestamp is None:
@@ -5,8 +5,10 @@ Convert a log file from one format to another.
 import argparse
 import errno
 import sys
+from typing import Union
 
-from can import Logger, LogReader, SizedRotatingLogger
+from can import Logger, SizedRotatingLogger
+from can.io import merge_logs
 
 
 class ArgumentParser(argparse.ArgumentParser):
@@ -15,9 +17,15 @@ class ArgumentParser(argparse.ArgumentParser):
         self.exit(errno.EINVAL, f"{self.prog}: error: {message}\n")
 
 
+def _parse_channel(channel: str) -> Union[int, str]:
+    channel = channel.strip()
+    return int(channel) if channel.isdigit() else channel
+
+
 def main():
     parser = ArgumentParser(
-        description="Convert a log file from one format to another.",
+        description="Convert a log file from one format to another. "
+        "Several input files are merged into one file ordered by timestamp.",
     )
 
     parser.add_argument(
@@ -29,10 +37,31 @@ def main():
         default=None,
     )
 
+    parser.add_argument(
+        "-w",
+        "--workers",
+        dest="workers",
+        type=int,
+        help="Number of processes used to decode the input file, if supported by "
+        "its format (currently only BLF).",
+        default=1,
+    )
+
+    parser.add_argument(
+        "-c",
+        "--channels",
+        dest="channels",
+        type=str,
+        help="Comma separated channels to assign to the messages of each input "
+        "file, e.g. '0,1'. Numbers are converted to integers.",
+        default=None,
+    )
+
     parser.add_argument(
         "input",
         metavar="INFILE",
         type=str,
+        nargs="+",
         help="Input filename. The type is dependent on the suffix, see can.LogReader.",
     )
 
@@ -45,7 +74,13 @@ def main():
 
     args = parser.parse_args()
 
-    with LogReader(args.input) as reader:
+    channels = None
+    if args.channels is not None:
+        channels = [_parse_channel(channel) for channel in args.channels.split(",")]
+        if len(channels) != len(args.input):
+            parser.error("expected one channel per input file")
+
+    with merge_logs(*args.input, channels=channels, workers=args.workers) as reader:
         if args.file_size:
             logger = SizedRotatingLogger(
                 base_filename=args.output, max_bytes=args.file_size
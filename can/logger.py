@@ -1,5 +1,6 @@
 import argparse
 import errno
+import pathlib
 import re
 import sys
 from datetime import datetime
@@ -154,7 +155,9 @@ def main() -> None:
         "-f",
         "--file_name",
         dest="log_file",
-        help="Path and base log filename, for supported types see can.Logger.",
+        help="Path and base log filename, for supported types see can.Logger. "
+        "Files without suffix are written in the CANB format (.canb), which "
+        "keeps up with the highest message rates.",
         default=None,
     )
 
@@ -216,17 +219,21 @@ def main() -> None:
     print(f"Connected to {bus.__class__.__name__}: {bus.channel_info}")
     print(f"Can Logger (Started on {datetime.now()})")
 
+    log_file = results.log_file
+    if log_file is not None and not pathlib.PurePath(log_file).suffix:
+        log_file += ".canb"
+
     logger: Union[MessageWriter, BaseRotatingLogger]
     if results.file_size:
         logger = SizedRotatingLogger(
-            base_filename=results.log_file,
+            base_filename=log_file,
             max_bytes=results.file_size,
             append=results.append,
             **additional_config,
         )
     else:
         logger = Logger(
-            filename=results.log_file,
+            filename=log_file,
             append=results.append,
             **additional_config,
         )
@@ -0,0 +1,403 @@
+"""
+This module contains the implementation of :class:`can.MessageBatch`, a
+columnar container for large numbers of CAN messages.
+"""
+
+from typing import (
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+    overload,
+)
+
+from . import typechecking
+from .message import Message
+
+try:
+    import numpy as np
+except ImportError:
+    np = None  # type: ignore[assignment]
+
+
+#: Flag bits of :attr:`MessageBatch.flags`
+FLAG_EXTENDED_ID = 0x01
+FLAG_REMOTE_FRAME = 0x02
+FLAG_ERROR_FRAME = 0x04
+FLAG_FD = 0x08
+FLAG_RX = 0x10
+FLAG_BITRATE_SWITCH = 0x20
+FLAG_ERROR_STATE_INDICATOR = 0x40
+
+#: Number of payload bytes stored for every message
+MAX_DATA_LENGTH = 64
+
+
+def _check_numpy() -> None:
+    if np is None:
+        raise NotImplementedError(
+            "The numpy package was not found. Install python-can with "
+            "the optional dependency [batch] to use the MessageBatch."
+        )
+
+
+class MessageBatch:
+    """
+    A :class:`~can.MessageBatch` stores many CAN messages column by column in
+    `NumPy <https://numpy.org>`__ arrays instead of one :class:`~can.Message`
+    object per frame. This needs a fraction of the memory and allows to
+    select messages with vectorized operations::
+
+        batch = can.MessageBatch.from_messages(can.LogReader("recording.blf"))
+        engine = batch[(batch.arbitration_id >= 0x100) & (batch.arbitration_id < 0x200)]
+        for msg in engine.select(start=3600, stop=3660):
+            print(msg)
+
+    The columns are:
+
+    - :attr:`timestamp` (``float64``)
+    - :attr:`arbitration_id` (``uint32``)
+    - :attr:`flags` (``uint8``), a bit field of the boolean attributes
+      of :class:`~can.Message`, see the ``FLAG_*`` constants of this module
+    - :attr:`dlc` (``uint8``), the data length in bytes like :attr:`can.Message.dlc`
+    - :attr:`channel_index` (``int16``), an index into :attr:`channels` or -1
+      if the message has no channel
+    - :attr:`data` (``uint8``), a matrix with 64 bytes per message where the
+      unused bytes are zero
+
+    Indexing with an integer returns a :class:`~can.Message`. Indexing with a
+    slice, a boolean mask or an array of indices returns a new
+    :class:`~can.MessageBatch`, which (like NumPy) shares the memory of the
+    original batch when slicing.
+
+    Requires the optional dependency ``numpy``.
+    """
+
+    __slots__ = (
+        "timestamp",
+        "arbitration_id",
+        "flags",
+        "dlc",
+        "channel_index",
+        "data",
+        "channels",
+    )
+
+    def __init__(
+        self,
+        timestamp: "np.ndarray",
+        arbitration_id: "np.ndarray",
+        flags: "np.ndarray",
+        dlc: "np.ndarray",
+        data: "np.ndarray",
+        channel_index: Optional["np.ndarray"] = None,
+        channels: Sequence[typechecking.Channel] = (),
+    ) -> None:
+        """
+        :param timestamp: the timestamps of the messages
+        :param arbitration_id: the arbitration IDs of the messages
+        :param flags: the flags of the messages, see the ``FLAG_*`` constants
+        :param dlc: the data lengths of the messages
+        :param data: a matrix with one row of up to 64 payload bytes per message
+        :param channel_index: indices into ``channels``, -1 if a message has no channel
+        :param channels: the distinct channels of the messages
+
+        :raises NotImplementedError: if numpy is not installed
+        :raises ValueError: if the columns do not have the same length
+        """
+        _check_numpy()
+
+        size = len(timestamp)
+        if channel_index is None:
+            channel_index = np.full(size, -1, dtype=np.int16)
+
+        self.timestamp = np.asarray(timestamp, dtype=np.float64)
+        self.arbitration_id = np.asarray(arbitration_id, dtype=np.uint32)
+        self.flags = np.asarray(flags, dtype=np.uint8)
+        self.dlc = np.asarray(dlc, dtype=np.uint8)
+        self.channel_index = np.asarray(channel_index, dtype=np.int16)
+        self.data = np.asarray(data, dtype=np.uint8)
+        self.channels: Tuple[typechecking.Channel, ...] = tuple(channels)
+
+        for name in ("arbitration_id", "flags", "dlc", "channel_index", "data"):
+            if len(getattr(self, name)) != size:
+                raise ValueError(f"column {name} does not have {size} entries")
+        if self.data.ndim != 2 or self.data.shape[1] != MAX_DATA_LENGTH:
+            raise ValueError(
+                f"data must have the shape ({size}, {MAX_DATA_LENGTH}), "
+                f"got {self.data.shape}"
+            )
+
+    @classmethod
+    def empty(cls, size: int = 0) -> "MessageBatch":
+        """Create a batch with ``size`` zeroed messages."""
+        _check_numpy()
+
+        return cls(
+            timestamp=np.zeros(size, dtype=np.float64),
+            arbitration_id=np.zeros(size, dtype=np.uint32),
+            flags=np.zeros(size, dtype=np.uint8),
+            dlc=np.zeros(size, dtype=np.uint8),
+            data=np.zeros((size, MAX_DATA_LENGTH), dtype=np.uint8),
+        )
+
+    @classmethod
+    def from_messages(cls, messages: Iterable[Message]) -> "MessageBatch":
+        """Create a batch from any iterable of messages, like a list or a
+        :class:`~can.io.generic.MessageReader`."""
+        _check_numpy()
+
+        timestamps: List[float] = []
+        arbitration_ids: List[int] = []
+        flags: List[int] = []
+        dlcs: List[int] = []
+        channel_indices: List[int] = []
+        channels: Dict[Any, int] = {}
+        payload = bytearray()
+
+        for msg in messages:
+            timestamps.append(msg.timestamp)
+            arbitration_ids.append(msg.arbitration_id)
+            flags.append(
+                (FLAG_EXTENDED_ID if msg.is_extended_id else 0)
+                | (FLAG_REMOTE_FRAME if msg.is_remote_frame else 0)
+                | (FLAG_ERROR_FRAME if msg.is_error_frame else 0)
+                | (FLAG_FD if msg.is_fd else 0)
+                | (FLAG_RX if msg.is_rx else 0)
+                | (FLAG_BITRATE_SWITCH if msg.bitrate_switch else 0)
+                | (FLAG_ERROR_STATE_INDICATOR if msg.error_state_indicator else 0)
+            )
+            dlcs.append(msg.dlc)
+
+            if msg.channel is None:
+                channel_indices.append(-1)
+            else:
+                channel_indices.append(channels.setdefault(msg.channel, len(channels)))
+
+            data = msg.data[:MAX_DATA_LENGTH]
+            payload += data
+            payload += bytes(MAX_DATA_LENGTH - len(data))
+
+        return cls(
+            timestamp=np.array(timestamps, dtype=np.float64),
+            arbitration_id=np.array(arbitration_ids, dtype=np.uint32),
+            flags=np.array(flags, dtype=np.uint8),
+            dlc=np.array(dlcs, dtype=np.uint8),
+            data=np.frombuffer(payload, dtype=np.uint8).reshape(-1, MAX_DATA_LENGTH),
+            channel_index=np.array(channel_indices, dtype=np.int16),
+            channels=list(channels),
+        )
+
+    @classmethod
+    def concatenate(cls, batches: Iterable["MessageBatch"]) -> "MessageBatch":
+        """Join several batches into a new one, keeping their order."""
+        batches = list(batches)
+        if not batches:
+            return cls.empty()
+
+        channels: Dict[Any, int] = {}
+        channel_indices = []
+        for batch in batches:
+            mapping = np.array(
+                [channels.setdefault(ch, len(channels)) for ch in batch.channels]
+                + [-1],
+                dtype=np.int16,
+            )
+            # index -1 maps to the trailing -1 of the mapping
+            channel_indices.append(mapping[batch.channel_index])
+
+        return cls(
+            timestamp=np.concatenate([batch.timestamp for batch in batches]),
+            arbitration_id=np.concatenate([batch.arbitration_id for batch in batches]),
+            flags=np.concatenate([batch.flags for batch in batches]),
+            dlc=np.concatenate([batch.dlc for batch in batches]),
+            data=np.concatenate([batch.data for batch in batches]),
+            channel_index=np.concatenate(channel_indices),
+            channels=list(channels),
+        )
+
+    def __len__(self) -> int:
+        return len(self.timestamp)
+
+    @overload
+    def __getitem__(self, index: int) -> Message:
+        ...
+
+    @overload
+    def __getitem__(
+        self, index: Union[slice, "np.ndarray", Sequence[int]]
+    ) -> "MessageBatch":
+        ...
+
+    def __getitem__(
+        self, index: Union[int, slice, "np.ndarray", Sequence[int]]
+    ) -> Union[Message, "MessageBatch"]:
+        if isinstance(index, (int, np.integer)):
+            if index < 0:
+                index += len(self)
+            if not 0 <= index < len(self):
+                raise IndexError("MessageBatch index out of range")
+            return self._message(int(index))
+
+        return MessageBatch(
+            timestamp=self.timestamp[index],
+            arbitration_id=self.arbitration_id[index],
+            flags=self.flags[index],
+            dlc=self.dlc[index],
+            data=self.data[index],
+            channel_index=self.channel_index[index],
+            channels=self.channels,
+        )
+
+    def __iter__(self) -> Iterator[Message]:
+        channels = self.channels
+        payload = self.data.tobytes()
+        rows = zip(
+            self.timestamp.tolist(),
+            self.arbitration_id.tolist(),
+            self.flags.tolist(),
+            self.dlc.tolist(),
+            self.channel_index.tolist(),
+        )
+        for row, (timestamp, arbitration_id, flags, dlc, channel_index) in enumerate(
+            rows
+        ):
+            is_remote_frame = bool(flags & FLAG_REMOTE_FRAME)
+            offset = row * MAX_DATA_LENGTH
+            yield Message(
+                timestamp=timestamp,
+                arbitration_id=arbitration_id,
+                is_extended_id=bool(flags & FLAG_EXTENDED_ID),
+                is_remote_frame=is_remote_frame,
+                is_error_frame=bool(flags & FLAG_ERROR_FRAME),
+                channel=channels[channel_index] if channel_index >= 0 else None,
+                dlc=dlc,
+                data=None if is_remote_frame else payload[offset : offset + dlc],
+                is_fd=bool(flags & FLAG_FD),
+                is_rx=bool(flags & FLAG_RX),
+                bitrate_switch=bool(flags & FLAG_BITRATE_SWITCH),
+                error_state_indicator=bool(flags & FLAG_ERROR_STATE_INDICATOR),
+            )
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(<{len(self)} messages>)"
+
+    def _message(self, row: int) -> Message:
+        flags = int(self.flags[row])
+        channel_index = int(self.channel_index[row])
+        dlc = int(self.dlc[row])
+        is_remote_frame = bool(flags & FLAG_REMOTE_FRAME)
+        return Message(
+            timestamp=float(self.timestamp[row]),
+            arbitration_id=int(self.arbitration_id[row]),
+            is_extended_id=bool(flags & FLAG_EXTENDED_ID),
+            is_remote_frame=is_remote_frame,
+            is_error_frame=bool(flags & FLAG_ERROR_FRAME),
+            channel=self.channels[channel_index] if channel_index >= 0 else None,
+            dlc=dlc,
+            data=None if is_remote_frame else self.data[row, :dlc].tobytes(),
+            is_fd=bool(flags & FLAG_FD),
+            is_rx=bool(flags & FLAG_RX),
+            bitrate_switch=bool(flags & FLAG_BITRATE_SWITCH),
+            error_state_indicator=bool(flags & FLAG_ERROR_STATE_INDICATOR),
+        )
+
+    def to_messages(self) -> List[Message]:
+        """Convert the batch into a list of :class:`~can.Message` objects."""
+        return list(self)
+
+    def select(
+        self,
+        arbitration_ids: Optional[Iterable[int]] = None,
+        start: Optional[float] = None,
+        stop: Optional[float] = None,
+        channel: Optional[typechecking.Channel] = None,
+    ) -> "MessageBatch":
+        """Return the messages matching all the given criteria.
+
+        :param arbitration_ids: only keep messages with one of these arbitration IDs
+        :param start: only keep messages with a timestamp at or after ``start``
+        :param stop: only keep messages with a timestamp before ``stop``
+        :param channel: only keep messages of this channel
+        """
+        return self[self.mask(arbitration_ids, start, stop, channel)]
+
+    def mask(
+        self,
+        arbitration_ids: Optional[Iterable[int]] = None,
+        start: Optional[float] = None,
+        stop: Optional[float] = None,
+        channel: Optional[typechecking.Channel] = None,
+    ) -> "np.ndarray":
+        """Like :meth:`select`, but return the boolean mask of the matching messages."""
+        mask = np.ones(len(self), dtype=bool)
+        if arbitration_ids is not None:
+            ids = np.fromiter(arbitration_ids, dtype=np.uint32)
+            mask &= np.isin(self.arbitration_id, ids)
+        if start is not None:
+            mask &= self.timestamp >= start
+        if stop is not None:
+            mask &= self.timestamp < stop
+        if channel is not None:
+            if channel in self.channels:
+                mask &= self.channel_index == self.channels.index(channel)
+            else:
+                mask[:] = False
+        return mask
+
+    @property
+    def nbytes(self) -> int:
+        """The number of bytes used by the columns."""
+        columns: Tuple["np.ndarray", ...] = (
+            self.timestamp,
+            self.arbitration_id,
+            self.flags,
+            self.dlc,
+            self.channel_index,
+            self.data,
+        )
+        return sum(column.nbytes for column in columns)
+
+    def _flag(self, flag: int) -> "np.ndarray":
+        is_set: "np.ndarray" = (self.flags & flag) != 0
+        return is_set
+
+    @property
+    def is_extended_id(self) -> "np.ndarray":
+        """Boolean array of :attr:`can.Message.is_extended_id`."""
+        return self._flag(FLAG_EXTENDED_ID)
+
+    @property
+    def is_remote_frame(self) -> "np.ndarray":
+        """Boolean array of :attr:`can.Message.is_remote_frame`."""
+        return self._flag(FLAG_REMOTE_FRAME)
+
+    @property
+    def is_error_frame(self) -> "np.ndarray":
+        """Boolean array of :attr:`can.Message.is_error_frame`."""
+        return self._flag(FLAG_ERROR_FRAME)
+
+    @property
+    def is_fd(self) -> "np.ndarray":
+        """Boolean array of :attr:`can.Message.is_fd`."""
+        return self._flag(FLAG_FD)
+
+    @property
+    def is_rx(self) -> "np.ndarray":
+        """Boolean array of :attr:`can.Message.is_rx`."""
+        return self._flag(FLAG_RX)
+
+    @property
+    def bitrate_switch(self) -> "np.ndarray":
+        """Boolean array of :attr:`can.Message.bitrate_switch`."""
+        return self._flag(FLAG_BITRATE_SWITCH)
+
+    @property
+    def error_state_indicator(self) -> "np.ndarray":
+        """Boolean array of :attr:`can.Message.error_state_indicator`."""
+        return self._flag(FLAG_ERROR_STATE_INDICATOR)
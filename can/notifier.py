@@ -3,11 +3,31 @@ This module contains the implementation of :class:`~can.Notifier`.
 """
 
 import asyncio
+import collections
+import contextlib
 import functools
 import logging
+import selectors
+import socket
 import threading
 import time
-from typing import Awaitable, Callable, Iterable, List, Optional, Union, cast
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    ContextManager,
+    Coroutine,
+    Deque,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+    cast,
+)
 
 from can.bus import BusABC
 from can.listener import Listener
@@ -17,6 +37,315 @@ logger = logging.getLogger("can.Notifier")
 
 MessageRecipient = Union[Listener, Callable[[Message], Union[Awaitable[None], None]]]
 
+#: The policies of :class:`ListenerQueue` for messages arriving at a full queue
+OVERFLOW_POLICIES = ("block", "drop_oldest", "drop_newest")
+
+
+class LatencyHistogram:
+    """Counts durations in buckets of a relative width, like an HDR histogram.
+
+    The bucket boundaries have four significant bits in nanoseconds, so every
+    value is stored with a relative error of less than 12.5 %, using eight
+    buckets for every power of two.
+    """
+
+    def __init__(self) -> None:
+        #: The sum of the recorded durations in seconds
+        self.total = 0.0
+        #: The longest recorded duration in seconds
+        self.max = 0.0
+        # durations of up to 2**64 ns, see _bucket_bound()
+        self._counts = [0] * (64 * 8 + 16)
+
+    @property
+    def count(self) -> int:
+        """The number of recorded durations."""
+        return sum(self._counts)
+
+    def record(self, seconds: float) -> None:
+        """Add a duration in seconds."""
+        nanoseconds = int(seconds * 1e9)
+        shift = nanoseconds.bit_length() - 4
+        if shift > 0:
+            # the exponent and the upper three bits below the leading one
+            self._counts[(shift << 3) + (nanoseconds >> shift)] += 1
+        else:
+            self._counts[nanoseconds] += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    @staticmethod
+    def _bucket_bound(index: int) -> float:
+        """Return the lower bound of a bucket in seconds."""
+        if index < 16:
+            return index / 1e9
+        return ((index & 7) + 8 << (index >> 3) - 1) / 1e9
+
+    def _buckets(self) -> Iterator[Tuple[float, int]]:
+        for index, count in enumerate(self._counts):
+            if count:
+                yield self._bucket_bound(index), count
+
+    def percentile(self, percent: float) -> float:
+        """Return the lower bound of the bucket containing the given percentile
+        in seconds, or ``0.0`` if nothing was recorded.
+        """
+        rank = percent / 100 * self.count
+        seen = 0
+        for bound, count in self._buckets():
+            seen += count
+            if seen >= rank:
+                return bound
+        return 0.0
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return the statistics and the non-empty buckets, which map the lower
+        bound of each bucket in seconds to its count.
+        """
+        count = self.count
+        return {
+            "count": count,
+            "mean": self.total / count if count else 0.0,
+            "max": self.max,
+            "p50": self.percentile(50),
+            "p90": self.percentile(90),
+            "p99": self.percentile(99),
+            "p99.9": self.percentile(99.9),
+            "buckets": dict(self._buckets()),
+        }
+
+
+class ListenerStats:
+    """Statistics of a single listener of a :class:`~can.Notifier`."""
+
+    def __init__(self, name: str) -> None:
+        #: The representation of the listener
+        self.name = name
+        #: The number of messages passed to the listener
+        self.calls = 0
+        #: The number of exceptions raised by the listener
+        self.errors = 0
+        #: The time from the reception of a message until the listener is called
+        self.latency = LatencyHistogram()
+        #: The time the listener takes to handle a message
+        self.duration = LatencyHistogram()
+        #: The queue of the listener, if it has one
+        self.queue: Optional["ListenerQueue"] = None
+
+    def record(self, received_at: float, start: float, end: float) -> None:
+        """Record a call of the listener, with times of :func:`time.perf_counter`."""
+        self.calls += 1
+        self.latency.record(start - received_at)
+        self.duration.record(end - start)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return the statistics as a dictionary."""
+        snapshot: Dict[str, Any] = {
+            "listener": self.name,
+            "calls": self.calls,
+            "errors": self.errors,
+            "latency": self.latency.snapshot(),
+            "duration": self.duration.snapshot(),
+        }
+        if self.queue is not None:
+            snapshot["queue_depth"] = self.queue.depth
+            snapshot["max_queue_depth"] = self.queue.max_depth
+            snapshot["dropped"] = self.queue.dropped
+        return snapshot
+
+
+class NotifierStats:
+    """Statistics of a :class:`~can.Notifier` created with ``stats=True``.
+
+    The counters are updated by the threads of the notifier without locking
+    and are meant for monitoring, use :meth:`snapshot` to read them.
+    """
+
+    def __init__(self) -> None:
+        #: The number of exceptions raised while receiving or dispatching
+        self.errors = 0
+        self._received: Dict[str, int] = {}
+        self._listeners: Dict[int, ListenerStats] = {}
+
+    def count_received(self, bus: BusABC, count: int = 1) -> None:
+        """Count messages received from a bus."""
+        name = str(bus.channel_info)
+        self._received[name] = self._received.get(name, 0) + count
+
+    def listener(self, listener: MessageRecipient) -> ListenerStats:
+        """Return the statistics of a listener, which are created on first use."""
+        stats = self._listeners.get(id(listener))
+        if stats is None:
+            stats = self._listeners[id(listener)] = ListenerStats(repr(listener))
+        return stats
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return all statistics as a dictionary, for example to be logged
+        as JSON.
+
+        It contains the number of messages received per bus (by its
+        ``channel_info``), the number of ``errors`` and the
+        :meth:`~ListenerStats.snapshot` of every listener.
+        """
+        return {
+            "received": dict(self._received),
+            "errors": self.errors,
+            "listeners": [stats.snapshot() for stats in self._listeners.values()],
+        }
+
+
+class ListenerQueue:
+    """A bounded queue with a worker thread, which calls a single listener.
+
+    These are created by a :class:`~can.Notifier` with a ``listener_queue_size``
+    and can be found in :attr:`~can.Notifier.listener_queues`.
+    """
+
+    def __init__(
+        self,
+        listener: MessageRecipient,
+        maxsize: int,
+        overflow: str = "block",
+        on_error: Optional[Callable[[Exception], bool]] = None,
+        stats: Optional[ListenerStats] = None,
+    ) -> None:
+        """
+        :param listener: The listener to call with every message.
+        :param maxsize: The maximum number of messages in the queue.
+        :param overflow:
+            What to do with a message if the queue is full, one of
+            :data:`OVERFLOW_POLICIES`:
+
+            * ``"block"`` waits until the listener has taken a message
+            * ``"drop_oldest"`` discards the oldest message in the queue
+            * ``"drop_newest"`` discards the new message
+        :param on_error:
+            Called with exceptions raised by the listener. If it returns
+            ``False`` or is not given, they are logged.
+        :param stats: The statistics to record the calls of the listener in.
+        :raises ValueError: If ``maxsize`` or ``overflow`` are invalid.
+        """
+        if maxsize < 1:
+            raise ValueError(f"maxsize must be positive, got {maxsize}")
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(
+                f"overflow must be one of {OVERFLOW_POLICIES}, got {overflow!r}"
+            )
+
+        self.listener = listener
+        self.maxsize = maxsize
+        self.overflow = overflow
+
+        #: The number of messages discarded because the queue was full
+        self.dropped = 0
+        #: The largest number of messages that were in the queue at once
+        self.max_depth = 0
+
+        self._on_error = on_error
+        self._stats = stats
+        if stats is not None:
+            stats.queue = self
+        # appending to and popping from a deque is thread-safe without a lock,
+        # the events are only used to wait for an empty or a full queue
+        # with statistics, the items are tuples of a message and its reception time
+        self._items: Deque[Any] = collections.deque()
+        self._not_empty = threading.Event()
+        self._not_full = threading.Event()
+        self._running = True
+        self._thread = threading.Thread(
+            target=self._worker,
+            name=f"can.notifier listener {listener!r}",
+            daemon=True,
+        )
+        self._thread.start()
+
+    @property
+    def depth(self) -> int:
+        """The number of messages waiting in the queue."""
+        return len(self._items)
+
+    def put(self, msg: Message, received_at: Optional[float] = None) -> None:
+        """Add a message to the queue, applying the overflow policy if it is full.
+
+        :param msg: The message.
+        :param received_at:
+            The :func:`time.perf_counter` at the reception of the message,
+            which is only used with statistics.
+        """
+        items = self._items
+        if len(items) >= self.maxsize:
+            if self.overflow == "drop_newest":
+                self.dropped += 1
+                return
+            if self.overflow == "drop_oldest":
+                try:
+                    items.popleft()
+                    self.dropped += 1
+                except IndexError:
+                    # the worker has taken it in the meantime
+                    pass
+            else:
+                while len(items) >= self.maxsize and self._running:
+                    self._not_full.clear()
+                    if len(items) < self.maxsize:
+                        break
+                    self._not_full.wait(0.1)
+
+        if self._stats is None:
+            items.append(msg)
+        else:
+            items.append((msg, received_at or time.perf_counter()))
+        if len(items) > self.max_depth:
+            self.max_depth = len(items)
+        if not self._not_empty.is_set():
+            self._not_empty.set()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """Stop the worker thread after it has passed on the queued messages.
+
+        :param timeout: Max time in seconds to wait for the worker thread.
+        """
+        self._running = False
+        self._not_empty.set()
+        self._not_full.set()
+        if self._thread is not threading.current_thread():
+            self._thread.join(timeout)
+
+    def _worker(self) -> None:
+        items = self._items
+        listener = self.listener
+        stats = self._stats
+        while True:
+            try:
+                item = items.popleft()
+            except IndexError:
+                if not self._running:
+                    break
+                self._not_empty.clear()
+                # a message might have been added or stop() might have been
+                # called before the event was cleared
+                if not items and self._running:
+                    self._not_empty.wait()
+                continue
+
+            if not self._not_full.is_set():
+                self._not_full.set()
+
+            try:
+                if stats is None:
+                    listener(item)
+                else:
+                    msg, received_at = item
+                    start = time.perf_counter()
+                    listener(msg)
+                    stats.record(received_at, start, time.perf_counter())
+            except Exception as exc:  # pylint: disable=broad-except
+                if stats is not None:
+                    stats.errors += 1
+                if self._on_error is None or not self._on_error(exc):
+                    logger.exception("Unhandled exception in listener %r", listener)
+
 
 class Notifier:
     def __init__(
@@ -25,6 +354,10 @@ class Notifier:
         listeners: Iterable[MessageRecipient],
         timeout: float = 1.0,
         loop: Optional[asyncio.AbstractEventLoop] = None,
+        shared_reader: bool = False,
+        listener_queue_size: int = 0,
+        overflow: str = "block",
+        stats: bool = False,
     ) -> None:
         """Manages the distribution of :class:`~can.Message` instances to listeners.
 
@@ -42,11 +375,44 @@ class Notifier:
             and return nothing.
         :param timeout: An optional maximum number of seconds to wait for any :class:`~can.Message`.
         :param loop: An :mod:`asyncio` event loop to schedule the ``listeners`` in.
+        :param shared_reader:
+            If set and no ``loop`` is given, all buses that support
+            :meth:`~can.BusABC.fileno` are read by a single thread, which waits
+            for any of them with a :mod:`selectors` selector and reads all
+            available messages of the ready buses. :meth:`stop` wakes this
+            thread up immediately. Other buses still get a thread each.
+            A bus whose error is not handled by a listener is no longer read,
+            while the other buses still are.
+        :param listener_queue_size:
+            If set and no ``loop`` is given, every listener gets a
+            :class:`~can.notifier.ListenerQueue` of this size with a worker
+            thread of its own, so that a slow listener does not delay the
+            reception or the other listeners.
+        :param overflow:
+            What to do with messages for a listener whose queue is full, one of
+            ``"block"``, ``"drop_oldest"`` and ``"drop_newest"``.
+            See :class:`~can.notifier.ListenerQueue`.
+        :param stats:
+            If set, the number of received messages, errors and the latency
+            and duration of every listener call are recorded in
+            :attr:`stats`.
+        :raises ValueError:
+            If ``listener_queue_size`` is used together with a ``loop``.
         """
+        if listener_queue_size and loop is not None:
+            raise ValueError("Listener queues can not be used with an event loop")
+
         self.listeners: List[MessageRecipient] = list(listeners)
         self.bus = bus
         self.timeout = timeout
         self._loop = loop
+        self._shared_reader = shared_reader
+        self._selector: Optional[selectors.BaseSelector] = None
+        # the buses to be registered by the shared reader thread, without the
+        # lock, which the thread holds while listeners may call add_bus()
+        self._selector_buses: Deque[BusABC] = collections.deque()
+        self._wakeup_recv: Optional[socket.socket] = None
+        self._wakeup_send: Optional[socket.socket] = None
 
         #: Exception raised in thread
         self.exception: Optional[Exception] = None
@@ -54,6 +420,20 @@ class Notifier:
         self._running = True
         self._lock = threading.Lock()
 
+        #: The statistics if the notifier was created with ``stats=True``,
+        #: else ``None``
+        self.stats: Optional[NotifierStats] = NotifierStats() if stats else None
+
+        self._listener_queue_size = listener_queue_size
+        self._overflow = overflow
+        #: The queues of the listeners if a ``listener_queue_size`` was given,
+        #: else ``None``
+        self.listener_queues: Optional[List[ListenerQueue]] = None
+        if listener_queue_size:
+            self.listener_queues = [
+                self._create_listener_queue(listener) for listener in self.listeners
+            ]
+
         self._readers: List[Union[int, threading.Thread]] = []
         buses = self.bus if isinstance(self.bus, list) else [self.bus]
         for each_bus in buses:
@@ -76,6 +456,8 @@ class Notifier:
             # Use bus file descriptor to watch for messages
             self._loop.add_reader(reader, self._on_message_available, bus)
             self._readers.append(reader)
+        elif self._loop is None and self._shared_reader and reader >= 0:
+            self._add_selector_bus(bus)
         else:
             reader_thread = threading.Thread(
                 target=self._rx_thread,
@@ -91,10 +473,12 @@ class Notifier:
         and call :meth:`~can.Listener.stop` on each Listener.
 
         :param timeout:
-            Max time in seconds to wait for receive threads to finish.
+            Max time in seconds to wait for receive threads to finish,
+            and for the listener queues to be processed.
             Should be longer than timeout given at instantiation.
         """
         self._running = False
+        self._wakeup()
         end_time = time.time() + timeout
         for reader in self._readers:
             if isinstance(reader, threading.Thread):
@@ -104,6 +488,8 @@ class Notifier:
             elif self._loop:
                 # reader is a file descriptor
                 self._loop.remove_reader(reader)
+        for listener_queue in self.listener_queues or []:
+            listener_queue.stop(max(end_time - time.time(), 0.0))
         for listener in self.listeners:
             if hasattr(listener, "stop"):
                 listener.stop()
@@ -118,13 +504,31 @@ class Notifier:
                 self._loop.call_soon_threadsafe, self._on_message_received
             ),
         )
+        stats = self.stats
+        handle_message_with_stats = cast(
+            Callable[[Message, float], None],
+            self._on_message_received_with_stats
+            if self._loop is None
+            else functools.partial(
+                self._loop.call_soon_threadsafe, self._on_message_received_with_stats
+            ),
+        )
 
+        lock = self._handler_lock()
         while self._running:
             try:
                 if msg := bus.recv(self.timeout):
-                    with self._lock:
-                        handle_message(msg)
+                    if stats is None:
+                        with lock:
+                            handle_message(msg)
+                    else:
+                        received_at = time.perf_counter()
+                        stats.count_received(bus)
+                        with lock:
+                            handle_message_with_stats(msg, received_at)
             except Exception as exc:  # pylint: disable=broad-except
+                if stats is not None:
+                    stats.errors += 1
                 self.exception = exc
                 if self._loop is not None:
                     self._loop.call_soon_threadsafe(self._on_error, exc)
@@ -137,17 +541,158 @@ class Notifier:
                     # It was handled, so only log it
                     logger.debug("suppressed exception: %s", exc)
 
+    def _add_selector_bus(self, bus: BusABC) -> None:
+        if self._selector is None:
+            self._selector = selectors.DefaultSelector()
+            # a socket pair works with the selectors of all platforms
+            self._wakeup_recv, self._wakeup_send = socket.socketpair()
+            self._wakeup_recv.setblocking(False)
+            self._selector.register(self._wakeup_recv, selectors.EVENT_READ)
+            reader_thread = threading.Thread(
+                target=self._selector_thread,
+                args=(self._selector,),
+                name="can.notifier shared reader",
+            )
+            reader_thread.daemon = True
+            reader_thread.start()
+            self._readers.append(reader_thread)
+
+        # the reader thread registers the bus, since selectors are not thread-safe
+        self._selector_buses.append(bus)
+        self._wakeup()
+
+    def _wakeup(self) -> None:
+        if self._wakeup_send is not None:
+            try:
+                self._wakeup_send.send(b"\0")
+            except OSError:
+                # the buffer is full of wakeups the reader thread has not read
+                # yet, or the reader thread has already closed the socket
+                pass
+
+    def _selector_thread(self, selector: selectors.BaseSelector) -> None:
+        stats = self.stats
+        lock = self._handler_lock()
+        try:
+            while self._running:
+                for key, _events in selector.select():
+                    bus = key.data
+                    if bus is None:
+                        self._on_wakeup(selector)
+                        continue
+
+                    try:
+                        messages = bus.recv_batch(timeout=0)
+                        if stats is None:
+                            with lock:
+                                for msg in messages:
+                                    self._on_message_received(msg)
+                        else:
+                            received_at = time.perf_counter()
+                            stats.count_received(bus, len(messages))
+                            with lock:
+                                for msg in messages:
+                                    self._on_message_received_with_stats(
+                                        msg, received_at
+                                    )
+                    except Exception as exc:  # pylint: disable=broad-except
+                        if stats is not None:
+                            stats.errors += 1
+                        self.exception = exc
+                        if self._on_error(exc):
+                            logger.debug("suppressed exception: %s", exc)
+                        else:
+                            # only stop reading this bus, like its own reader
+                            # thread would, but keep reading the others
+                            selector.unregister(key.fileobj)
+                            logger.error(
+                                "Stopped reading %s after an unhandled exception",
+                                bus.channel_info,
+                                exc_info=exc,
+                            )
+        finally:
+            selector.close()
+            for sock in (self._wakeup_recv, self._wakeup_send):
+                if sock is not None:
+                    sock.close()
+
+    def _on_wakeup(self, selector: selectors.BaseSelector) -> None:
+        wakeup_recv = cast(socket.socket, self._wakeup_recv)
+        try:
+            while wakeup_recv.recv(4096):
+                pass
+        except BlockingIOError:
+            pass
+
+        buses = self._selector_buses
+        while buses:
+            bus = buses.popleft()
+            try:
+                selector.register(bus.fileno(), selectors.EVENT_READ, bus)
+            except KeyError:
+                # the bus, or another one with the same file descriptor,
+                # is already read
+                logger.warning("%s is already read by this notifier", bus.channel_info)
+
+    def _handler_lock(self) -> ContextManager[Any]:
+        """Return the lock of the reader threads around the message handling."""
+        if self.listener_queues is None:
+            return self._lock
+        # the listener queues do not need to be protected against several readers
+        return contextlib.nullcontext()
+
     def _on_message_available(self, bus: BusABC) -> None:
         if msg := bus.recv(0):
-            self._on_message_received(msg)
+            if self.stats is None:
+                self._on_message_received(msg)
+            else:
+                self.stats.count_received(bus)
+                self._on_message_received_with_stats(msg, time.perf_counter())
+
+    def _create_listener_queue(self, listener: MessageRecipient) -> ListenerQueue:
+        return ListenerQueue(
+            listener,
+            self._listener_queue_size,
+            self._overflow,
+            self._on_error,
+            self.stats.listener(listener) if self.stats is not None else None,
+        )
 
     def _on_message_received(self, msg: Message) -> None:
+        if self.listener_queues is not None:
+            for listener_queue in self.listener_queues:
+                listener_queue.put(msg)
+            return
+
         for callback in self.listeners:
             res = callback(msg)
             if res and self._loop and asyncio.iscoroutine(res):
                 # Schedule coroutine
                 self._loop.create_task(res)
 
+    def _on_message_received_with_stats(self, msg: Message, received_at: float) -> None:
+        stats = cast(NotifierStats, self.stats)
+        if self.listener_queues is not None:
+            for listener_queue in self.listener_queues:
+                listener_queue.put(msg, received_at)
+            return
+
+        start = time.perf_counter()
+        for callback in self.listeners:
+            listener_stats = stats.listener(callback)
+            try:
+                res = callback(msg)
+            except Exception:
+                listener_stats.errors += 1
+                raise
+            end = time.perf_counter()
+            listener_stats.record(received_at, start, end)
+            # the next listener is called right away
+            start = end
+            if res and self._loop and asyncio.iscoroutine(res):
+                # Schedule coroutine
+                self._loop.create_task(res)
+
     def _on_error(self, exc: Exception) -> bool:
         """Calls ``on_error()`` for all listeners if they implement it.
 
@@ -174,6 +719,12 @@ class Notifier:
         :param listener: Listener to be added to the list to be notified
         """
         self.listeners.append(listener)
+        if self.listener_queues is not None:
+            # copy on write, since the reader threads iterate over the list
+            self.listener_queues = [
+                *self.listener_queues,
+                self._create_listener_queue(listener),
+            ]
 
     def remove_listener(self, listener: MessageRecipient) -> None:
         """Remove a listener from the notification list. This method
@@ -184,3 +735,259 @@ class Notifier:
         :raises ValueError: if `listener` was never added to this notifier
         """
         self.listeners.remove(listener)
+        if self.listener_queues is not None:
+            for index, listener_queue in enumerate(self.listener_queues):
+                if listener_queue.listener == listener:
+                    self.listener_queues = [
+                        *self.listener_queues[:index],
+                        *self.listener_queues[index + 1 :],
+                    ]
+                    listener_queue.stop()
+                    break
+
+
+class AsyncNotifier(Notifier):
+    """A :class:`~can.Notifier` that runs entirely in an :mod:`asyncio` event loop.
+
+    Buses with a file descriptor are watched by the event loop itself. On every
+    readiness event, all available messages (up to ``max_batch_size``) are read
+    with :meth:`~can.BusABC.recv_batch` instead of a single one.
+
+    All buses without a file descriptor share one reader thread. It collects the
+    messages of all these buses and hands them over to the event loop in
+    batches, so that a burst of messages costs only a single
+    :meth:`~asyncio.loop.call_soon_threadsafe`.
+
+    Listeners are called in the event loop. Coroutines returned by them are run
+    as concurrent tasks, of which at most ``max_tasks`` are active at the same
+    time. Further coroutines wait in order until a task has finished.
+
+    Exceptions of listeners are passed to the ``on_error()`` method of the
+    listeners, like errors while receiving. If no listener handles them, they
+    are logged. A bus whose error is not handled is no longer read, while the
+    other buses still are.
+    """
+
+    #: Seconds the shared reader thread waits on each bus in turn while
+    #: several buses without a file descriptor are idle
+    POLL_INTERVAL = 0.002
+
+    def __init__(
+        self,
+        bus: Union[BusABC, List[BusABC]],
+        listeners: Iterable[MessageRecipient],
+        timeout: float = 1.0,
+        loop: Optional[asyncio.AbstractEventLoop] = None,
+        max_batch_size: int = 256,
+        max_tasks: int = 64,
+    ) -> None:
+        """
+        :param bus: A :ref:`bus` or a list of buses to listen to.
+        :param listeners:
+            An iterable of :class:`~can.Listener` or callables that receive a
+            :class:`~can.Message` and return nothing or a coroutine.
+        :param timeout:
+            The maximum number of seconds the shared reader thread waits for
+            a message, which bounds the time :meth:`stop` takes.
+        :param loop:
+            The :mod:`asyncio` event loop to use. Defaults to the running loop.
+        :param max_batch_size:
+            The maximum number of messages read from a bus at once.
+        :param max_tasks:
+            The maximum number of listener coroutines running at the same time.
+        :raises RuntimeError:
+            If no ``loop`` is given and no event loop is running.
+        """
+        if max_batch_size < 1:
+            raise ValueError(f"max_batch_size must be positive, got {max_batch_size}")
+        if max_tasks < 1:
+            raise ValueError(f"max_tasks must be positive, got {max_tasks}")
+
+        self.max_batch_size = max_batch_size
+        self.max_tasks = max_tasks
+
+        self._thread_buses: List[BusABC] = []
+        self._thread_buses_added = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._pending: List[Message] = []
+        self._handoff_scheduled = False
+        self._tasks: Set["asyncio.Task[None]"] = set()
+        self._waiting: Deque[Coroutine[None, None, None]] = collections.deque()
+
+        super().__init__(
+            bus,
+            listeners,
+            timeout=timeout,
+            loop=loop if loop is not None else asyncio.get_running_loop(),
+        )
+
+    @property
+    def _event_loop(self) -> asyncio.AbstractEventLoop:
+        return cast(asyncio.AbstractEventLoop, self._loop)
+
+    def add_bus(self, bus: BusABC) -> None:
+        """Add a bus for notification.
+
+        :param bus:
+            CAN bus instance.
+        """
+        try:
+            fd = bus.fileno()
+        except NotImplementedError:
+            fd = -1
+
+        if fd >= 0:
+            try:
+                self._event_loop.add_reader(fd, self._on_readable, bus, fd)
+            except NotImplementedError:
+                # e.g. the proactor event loop on Windows
+                pass
+            else:
+                self._readers.append(fd)
+                return
+
+        self._add_thread_bus(bus)
+        if self._thread is None:
+            self._thread = threading.Thread(
+                target=self._shared_rx_thread,
+                name="can.AsyncNotifier reader",
+                daemon=True,
+            )
+            self._thread.start()
+            self._readers.append(self._thread)
+
+    def _add_thread_bus(self, bus: BusABC) -> None:
+        # copy on write, since the reader thread iterates over the list
+        with self._lock:
+            self._thread_buses = [*self._thread_buses, bus]
+        self._thread_buses_added.set()
+
+    def _remove_thread_bus(self, bus: BusABC) -> None:
+        with self._lock:
+            self._thread_buses = [
+                each_bus for each_bus in self._thread_buses if each_bus is not bus
+            ]
+
+    def stop(self, timeout: float = 5) -> None:
+        """Stop notifying Listeners when new :class:`~can.Message` objects arrive
+        and call :meth:`~can.Listener.stop` on each Listener.
+
+        Listener coroutines which are already running are not cancelled, but
+        the ones still waiting for a free task are discarded.
+
+        :param timeout:
+            Max time in seconds to wait for the shared reader thread to finish.
+        """
+        while self._waiting:
+            self._waiting.popleft().close()
+        self._running = False
+        self._thread_buses_added.set()
+        super().stop(timeout)
+
+    def _on_readable(self, bus: BusABC, fd: int) -> None:
+        try:
+            messages = bus.recv_batch(self.max_batch_size, timeout=0)
+        except Exception as exc:  # pylint: disable=broad-except
+            self.exception = exc
+            if not self._on_error(exc):
+                self._event_loop.remove_reader(fd)
+                raise
+            logger.debug("suppressed exception: %s", exc)
+            return
+        self._dispatch(messages)
+
+    def _shared_rx_thread(self) -> None:
+        index = 0
+        while self._running:
+            buses = self._thread_buses
+            if not buses:
+                self._thread_buses_added.wait(self.timeout)
+                self._thread_buses_added.clear()
+                continue
+
+            messages: List[Message] = []
+            for bus in buses:
+                messages += self._recv_batch_from_thread(bus, 0)
+
+            if not messages:
+                # wait on one bus at a time, all of them in turn
+                index = (index + 1) % len(buses)
+                if len(buses) == 1:
+                    wait = self.timeout
+                else:
+                    wait = min(self.POLL_INTERVAL, self.timeout)
+                messages = self._recv_batch_from_thread(buses[index], wait)
+                if not messages:
+                    continue
+
+            with self._lock:
+                self._pending += messages
+                if self._handoff_scheduled:
+                    # the event loop has not yet taken the previous batch
+                    continue
+                self._handoff_scheduled = True
+            self._event_loop.call_soon_threadsafe(self._on_handoff)
+
+    def _recv_batch_from_thread(self, bus: BusABC, timeout: float) -> List[Message]:
+        try:
+            return bus.recv_batch(self.max_batch_size, timeout)
+        except Exception as exc:  # pylint: disable=broad-except
+            # the other buses are still read, while the listeners decide in
+            # the event loop whether this one is read again
+            self._remove_thread_bus(bus)
+            self._event_loop.call_soon_threadsafe(self._on_thread_bus_error, bus, exc)
+            return []
+
+    def _on_thread_bus_error(self, bus: BusABC, exc: Exception) -> None:
+        self.exception = exc
+        if not self._on_error(exc):
+            raise exc
+        logger.debug("suppressed exception: %s", exc)
+        if self._running:
+            self._add_thread_bus(bus)
+
+    def _on_handoff(self) -> None:
+        with self._lock:
+            messages = self._pending
+            self._pending = []
+            self._handoff_scheduled = False
+        self._dispatch(messages)
+
+    def _dispatch(self, messages: List[Message]) -> None:
+        if not self._running:
+            return
+
+        for msg in messages:
+            self._on_message_received(msg)
+
+    def _on_message_received(self, msg: Message) -> None:
+        for callback in self.listeners:
+            try:
+                res = callback(msg)
+            except Exception as exc:  # pylint: disable=broad-except
+                # the other listeners still receive the message
+                self._on_listener_error(exc)
+                continue
+            if res is not None and asyncio.iscoroutine(res):
+                self._start_task(res)
+
+    def _start_task(self, coro: Coroutine[None, None, None]) -> None:
+        if len(self._tasks) >= self.max_tasks:
+            self._waiting.append(coro)
+            return
+
+        task = self._event_loop.create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._on_task_done)
+
+    def _on_task_done(self, task: "asyncio.Task[None]") -> None:
+        self._tasks.discard(task)
+        if not task.cancelled() and (exc := task.exception()) is not None:
+            self._on_listener_error(cast(Exception, exc))
+        if self._waiting:
+            self._start_task(self._waiting.popleft())
+
+    def _on_listener_error(self, exc: Exception) -> None:
+        self.exception = exc
+        if not self._on_error(exc):
+            logger.error("Unhandled exception in listener", exc_info=exc)
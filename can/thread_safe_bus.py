@@ -52,6 +52,14 @@ class ThreadSafeBus(ObjectProxy):  # pylint: disable=abstract-method
         with self._lock_recv:
             return self.__wrapped__.recv(timeout=timeout, *args, **kwargs)
 
+    def recv_batch(
+        self, max_messages=256, timeout=None, *args, **kwargs
+    ):  # pylint: disable=keyword-arg-before-vararg
+        with self._lock_recv:
+            return self.__wrapped__.recv_batch(
+                max_messages=max_messages, timeout=timeout, *args, **kwargs
+            )
+
     def send(
         self, msg, timeout=None, *args, **kwargs
     ):  # pylint: disable=keyword-arg-before-vararg
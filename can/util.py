@@ -16,8 +16,11 @@ from typing import (
     Any,
     Callable,
     Dict,
+    FrozenSet,
     Iterable,
+    List,
     Optional,
+    Set,
     Tuple,
     TypeVar,
     Union,
@@ -328,6 +331,83 @@ def channel2int(channel: Optional[typechecking.Channel]) -> Optional[int]:
     return None
 
 
+#: The precompiled form of :data:`can.typechecking.CanFilters`, see :func:`compile_filters`
+CompiledFilters = List[Tuple[int, FrozenSet[int], FrozenSet[int]]]
+
+
+def compile_filters(
+    filters: Optional[typechecking.CanFilters],
+) -> Optional[CompiledFilters]:
+    """Precompile CAN filters for fast matching with :func:`match_filters`.
+
+    Filters are grouped by their mask. For every distinct mask, the masked
+    IDs of the filters are stored in one hash set for standard and one for
+    extended frames. Matching a message then requires only a single set
+    lookup per distinct mask, regardless of the total number of filters.
+
+    :param filters:
+        See :meth:`can.BusABC.set_filters` for details.
+
+    :returns:
+        A list of ``(mask, standard_ids, extended_ids)`` tuples, or ``None`` if
+        all messages are matched.
+    """
+    if not filters:
+        return None
+
+    groups: Dict[int, Tuple[Set[int], Set[int]]] = {}
+    for _filter in filters:
+        can_mask = _filter["can_mask"]
+        can_id = _filter["can_id"] & can_mask
+        standard_ids, extended_ids = groups.setdefault(can_mask, (set(), set()))
+
+        if "extended" not in _filter:
+            if can_mask == 0:
+                # this filter matches everything
+                return None
+            standard_ids.add(can_id)
+            extended_ids.add(can_id)
+        elif cast(typechecking.CanFilterExtended, _filter)["extended"]:
+            extended_ids.add(can_id)
+        else:
+            standard_ids.add(can_id)
+
+    return [
+        (can_mask, frozenset(standard_ids), frozenset(extended_ids))
+        for can_mask, (standard_ids, extended_ids) in groups.items()
+    ]
+
+
+def match_filters(
+    compiled_filters: Optional[CompiledFilters],
+    arbitration_id: int,
+    is_extended_id: bool,
+) -> bool:
+    """Check whether a message matches at least one of the given filters.
+
+    A filter matches, when ``arbitration_id & can_mask == can_id & can_mask``
+    and, if the filter sets ``extended``, when the frame format matches as well.
+
+    :param compiled_filters:
+        Filters as returned by :func:`compile_filters`.
+    :param arbitration_id:
+        The arbitration ID of the message.
+    :param is_extended_id:
+        Whether the message uses an extended (29-bit) arbitration ID.
+
+    :returns: Whether the message matches.
+    """
+    if compiled_filters is None:
+        return True
+
+    for mask, standard_ids, extended_ids in compiled_filters:
+        ids = extended_ids if is_extended_id else standard_ids
+        if arbitration_id & mask in ids:
+            return True
+
+    return False
+
+
 P1 = ParamSpec("P1")
 T1 = TypeVar("T1")
 
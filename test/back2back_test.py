@@ -336,6 +336,14 @@ class BasicTestUdpMulticastBusIPv6(Back2BackTestCase):
             super().test_unique_message_instances()
 
 
+@unittest.skipUnless(IS_UNIX, "only supported on Unix systems")
+class BasicTestShmVirtual(Back2BackTestCase):
+    INTERFACE_1 = "shm_virtual"
+    CHANNEL_1 = "shm_virtual_channel_0"
+    INTERFACE_2 = "shm_virtual"
+    CHANNEL_2 = "shm_virtual_channel_0"
+
+
 TEST_INTERFACE_ETAS = False
 try:
     bus_class = can.interface._get_class_for_interface("etas")
@@ -0,0 +1,82 @@
+#!/usr/bin/env python
+
+"""
+Benchmarks reading ASC files with :class:`can.ASCReader`.
+
+The line parser for common classic and CAN FD data frames is compared
+against the regular expression based parser, which is still used for all
+other lines.
+
+Run with::
+
+    python test/benchmarks/bench_asc.py
+"""
+
+import os
+import random
+import tempfile
+import timeit
+from typing import Optional
+
+import can
+
+NUMBER_OF_MESSAGES = 200_000
+
+
+class RegexASCReader(can.ASCReader):
+    """Always uses the regular expression based parser."""
+
+    def _parse_message_fast(self, parts) -> Optional[can.Message]:
+        return None
+
+
+def write_test_file(path: str, rng: random.Random) -> None:
+    """Mostly classic frames with some CAN FD frames, like a typical trace."""
+    with can.ASCWriter(path) as writer:
+        timestamp = 0.0
+        for index in range(NUMBER_OF_MESSAGES):
+            timestamp += rng.random() * 1e-3
+            is_fd = index % 5 == 0
+            is_extended_id = rng.random() < 0.3
+            writer.on_message_received(
+                can.Message(
+                    timestamp=timestamp,
+                    arbitration_id=rng.getrandbits(29 if is_extended_id else 11),
+                    is_extended_id=is_extended_id,
+                    is_fd=is_fd,
+                    bitrate_switch=is_fd,
+                    is_rx=rng.random() < 0.9,
+                    channel=rng.randrange(4),
+                    data=bytes(
+                        rng.getrandbits(8)
+                        for _ in range(rng.choice((8, 16, 64) if is_fd else (2, 8)))
+                    ),
+                )
+            )
+
+
+def main() -> None:
+    rng = random.Random(0)
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "bench.asc")
+        write_test_file(path, rng)
+
+        print(f"{'parser':>8} {'lines/s':>12} {'speedup':>8}")
+        results = {}
+        for name, reader_type in (("regex", RegexASCReader), ("fast", can.ASCReader)):
+            duration = min(
+                timeit.repeat(
+                    lambda reader_type=reader_type: sum(1 for _ in reader_type(path)),
+                    number=1,
+                    repeat=3,
+                )
+            )
+            results[name] = duration
+            print(
+                f"{name:>8} {NUMBER_OF_MESSAGES / duration:>12,.0f} "
+                f"{results['regex'] / duration:>7.1f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+#!/usr/bin/env python
+
+"""
+Benchmarks writing and reading :class:`can.CANBWriter` files compared to
+other binary and text formats.
+
+Run with::
+
+    python test/benchmarks/bench_canb.py
+"""
+
+import os
+import tempfile
+import time
+
+import can
+
+NUMBER_OF_MESSAGES = 200_000
+
+
+def main() -> None:
+    messages = [
+        can.Message(
+            timestamp=index * 1e-4,
+            arbitration_id=index & 0x7FF,
+            channel=index % 4,
+            data=index.to_bytes(8, "little"),
+        )
+        for index in range(NUMBER_OF_MESSAGES)
+    ]
+
+    print(f"{'format':>10} {'write msgs/s':>14} {'read msgs/s':>14} {'bytes':>12}")
+    with tempfile.TemporaryDirectory() as directory:
+        for name, suffix, kwargs in (
+            ("canb", ".canb", {}),
+            ("canb+zlib", ".canb", {"compression": "zlib"}),
+            ("blf", ".blf", {}),
+            ("asc", ".asc", {}),
+        ):
+            path = os.path.join(directory, name + suffix)
+            start = time.perf_counter()
+            with can.Logger(path, **kwargs) as writer:
+                for msg in messages:
+                    writer(msg)
+            written = time.perf_counter()
+            with can.LogReader(path) as reader:
+                for _ in reader:
+                    pass
+            read = time.perf_counter()
+            print(
+                f"{name:>10} {NUMBER_OF_MESSAGES / (written - start):>14,.0f} "
+                f"{NUMBER_OF_MESSAGES / (read - written):>14,.0f} "
+                f"{os.path.getsize(path):>12,}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+#!/usr/bin/env python
+
+"""
+Benchmarks writing and reading ``candump -L`` log files with
+:class:`can.CanutilsLogWriter` and :class:`can.CanutilsLogReader`.
+
+The default of 500 000 frames corresponds to a few minutes of a busy bus and
+produces a file of about 22 MB, like ``candump -L`` would. The reader is
+compared line by line and in blocks, the writer line by line and buffered.
+
+Run with::
+
+    python test/benchmarks/bench_canutils.py [number of messages]
+"""
+
+import os
+import random
+import sys
+import tempfile
+import timeit
+
+import can
+
+NUMBER_OF_MESSAGES = 500_000
+
+
+def create_messages(count: int, rng: random.Random):
+    """Mostly classic frames with some CAN FD frames on three channels."""
+    timestamp = 1_700_000_000.0
+    messages = []
+    for index in range(count):
+        timestamp += rng.random() * 1e-3
+        is_fd = index % 10 == 0
+        is_extended_id = rng.random() < 0.3
+        messages.append(
+            can.Message(
+                timestamp=timestamp,
+                arbitration_id=rng.getrandbits(29 if is_extended_id else 11),
+                is_extended_id=is_extended_id,
+                is_fd=is_fd,
+                bitrate_switch=is_fd,
+                channel=f"can{index % 3}",
+                data=bytes(
+                    rng.getrandbits(8)
+                    for _ in range(rng.choice((12, 64) if is_fd else (4, 8)))
+                ),
+            )
+        )
+    return messages
+
+
+def write(path, messages, **kwargs) -> None:
+    with can.CanutilsLogWriter(path, **kwargs) as writer:
+        for msg in messages:
+            writer.on_message_received(msg)
+
+
+def read(path, **kwargs) -> int:
+    with can.CanutilsLogReader(path, **kwargs) as reader:
+        return sum(1 for _ in reader)
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else NUMBER_OF_MESSAGES
+    messages = create_messages(count, random.Random(0))
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "candump.log")
+        print(f"{'mode':>20} {'msgs/s':>12} {'MB/s':>8}")
+        for name, function in (
+            ("write lines", lambda: write(path, messages)),
+            ("write buffered", lambda: write(path, messages, buffer_size=1000)),
+            ("read lines", lambda: read(path)),
+            ("read blocks", lambda: read(path, block_size=1 << 20)),
+        ):
+            try:
+                duration = min(timeit.repeat(function, number=1, repeat=3))
+            except TypeError:
+                # the mode is not supported by this version
+                continue
+            size = os.path.getsize(path) / 1e6
+            print(f"{name:>20} {count / duration:>12,.0f} {size / duration:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+#!/usr/bin/env python
+
+"""
+Benchmarks the software message filtering of :class:`can.BusABC`.
+
+The precompiled filters used by :meth:`can.BusABC._matches_filters` are
+compared against evaluating every filter one after another, which is how
+the filters were matched before.
+
+Run with::
+
+    python test/benchmarks/bench_filters.py
+"""
+
+import random
+import timeit
+from typing import List
+
+import can
+from can.typechecking import CanFilters
+
+NUMBER_OF_MESSAGES = 10_000
+
+
+def matches_linear(filters: CanFilters, msg: can.Message) -> bool:
+    for _filter in filters:
+        if "extended" in _filter and _filter["extended"] != msg.is_extended_id:
+            continue
+        if (_filter["can_id"] ^ msg.arbitration_id) & _filter["can_mask"] == 0:
+            return True
+    return False
+
+
+def make_filters(count: int, rng: random.Random) -> CanFilters:
+    """A gateway-like whitelist: mostly exact IDs, some ranges."""
+    filters = []
+    for index in range(count):
+        extended = index % 4 == 0
+        if index % 10 == 0:
+            can_mask = 0x1FFFFF00 if extended else 0x7F0
+        else:
+            can_mask = 0x1FFFFFFF if extended else 0x7FF
+        can_id = rng.getrandbits(29 if extended else 11)
+        filters.append({"can_id": can_id, "can_mask": can_mask, "extended": extended})
+    return filters
+
+
+def make_messages(rng: random.Random) -> List[can.Message]:
+    messages = []
+    for _ in range(NUMBER_OF_MESSAGES):
+        is_extended_id = rng.random() < 0.25
+        messages.append(
+            can.Message(
+                arbitration_id=rng.getrandbits(29 if is_extended_id else 11),
+                is_extended_id=is_extended_id,
+            )
+        )
+    return messages
+
+
+def main() -> None:
+    rng = random.Random(0)
+    messages = make_messages(rng)
+
+    print(
+        f"{'filters':>8} {'linear [µs/msg]':>16} {'compiled [µs/msg]':>18} {'speedup':>8}"
+    )
+    with can.Bus(interface="virtual", channel="bench_filters") as bus:
+        for count in (1, 10, 100, 1000):
+            filters = make_filters(count, rng)
+            bus.set_filters(filters)
+
+            linear = min(
+                timeit.repeat(
+                    lambda filters=filters: [
+                        matches_linear(filters, m) for m in messages
+                    ],
+                    number=1,
+                    repeat=3,
+                )
+            )
+            compiled = min(
+                timeit.repeat(
+                    lambda: [bus._matches_filters(m) for m in messages],
+                    number=1,
+                    repeat=3,
+                )
+            )
+
+            linear_us = linear / NUMBER_OF_MESSAGES * 1e6
+            compiled_us = compiled / NUMBER_OF_MESSAGES * 1e6
+            print(
+                f"{count:>8} {linear_us:>16.3f} {compiled_us:>18.3f} "
+                f"{linear / compiled:>7.1f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
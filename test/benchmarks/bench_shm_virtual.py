@@ -0,0 +1,79 @@
+#!/usr/bin/env python
+
+"""
+Benchmarks the shm_virtual interface with one sending process and M
+receiving processes on one channel.
+
+The sender sends a number of messages as fast as possible, which every
+receiver reads with :meth:`~can.BusABC.recv_batch`. Messages that were
+overwritten before a receiver read them are reported as dropped.
+
+Run with::
+
+    python test/benchmarks/bench_shm_virtual.py [messages]
+"""
+
+import multiprocessing
+import sys
+import time
+
+import can
+
+MESSAGES = 200_000
+RECEIVERS = (1, 2, 4)
+SLOT_COUNT = 65536
+
+
+def receive(channel: str, count: int, ready, results) -> None:
+    with can.Bus(channel, interface="shm_virtual") as bus:
+        ready.release()
+        received = 0
+        while received + bus.dropped < count:
+            received += len(bus.recv_batch(1024, timeout=1.0))
+        results.put((received, bus.dropped))
+
+
+def run(receivers: int, count: int):
+    """Return the sent messages per second, and the received and dropped
+    messages of all receivers.
+    """
+    channel = f"bench-shm-{receivers}"
+    context = multiprocessing.get_context("spawn")
+    ready = context.Semaphore(0)
+    results = context.Queue()
+    with can.Bus(channel, interface="shm_virtual", slot_count=SLOT_COUNT) as bus:
+        processes = [
+            context.Process(target=receive, args=(channel, count, ready, results))
+            for _ in range(receivers)
+        ]
+        for process in processes:
+            process.start()
+        for _ in processes:
+            ready.acquire()
+
+        msg = can.Message(arbitration_id=0x123, data=bytes(8), is_extended_id=False)
+        start = time.perf_counter()
+        for _ in range(count):
+            bus.send(msg)
+        duration = time.perf_counter() - start
+
+        received = dropped = 0
+        for _ in processes:
+            rx, lost = results.get()
+            received += rx
+            dropped += lost
+        for process in processes:
+            process.join()
+    return count / duration, received, dropped
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else MESSAGES
+    print(f"{'receivers':>10} {'sent msgs/s':>14} {'received':>10} {'dropped':>10}")
+    for receivers in RECEIVERS:
+        rate, received, dropped = run(receivers, count)
+        print(f"{receivers:>10} {rate:>14,.0f} {received:>10,} {dropped:>10,}")
+
+
+if __name__ == "__main__":
+    main()
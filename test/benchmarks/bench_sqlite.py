@@ -0,0 +1,68 @@
+#!/usr/bin/env python
+
+"""
+Benchmarks writing messages with :class:`can.SqliteWriter`.
+
+A backlog of messages, like several saturated channels would produce, is
+written with the default settings (write-ahead logging, adaptive batches)
+and with the defaults of SQLite and fixed batches.
+
+Run with::
+
+    python test/benchmarks/bench_sqlite.py
+"""
+
+import os
+import tempfile
+import time
+
+import can
+
+NUMBER_OF_MESSAGES = 200_000
+
+
+class FixedBatchSqliteWriter(can.SqliteWriter):
+    """Never grows a batch beyond the minimum size."""
+
+    MAX_BATCH_SIZE = can.SqliteWriter.MAX_BUFFER_SIZE_BEFORE_WRITES
+
+
+def write(path: str, writer_type: type, **kwargs) -> can.SqliteWriter:
+    messages = [
+        can.Message(
+            timestamp=index * 1e-4,
+            arbitration_id=index & 0x7FF,
+            channel=index % 4,
+            data=index.to_bytes(8, "little"),
+        )
+        for index in range(NUMBER_OF_MESSAGES)
+    ]
+    with writer_type(path, **kwargs) as writer:
+        for msg in messages:
+            writer(msg)
+    return writer
+
+
+def main() -> None:
+    print(f"{'writer':>8} {'msgs/s':>12} {'commits':>8} {'max latency':>12}")
+    with tempfile.TemporaryDirectory() as directory:
+        for name, writer_type, kwargs in (
+            (
+                "legacy",
+                FixedBatchSqliteWriter,
+                {"journal_mode": None, "synchronous": None},
+            ),
+            ("default", can.SqliteWriter, {}),
+        ):
+            path = os.path.join(directory, f"{name}.db")
+            start = time.perf_counter()
+            writer = write(path, writer_type, **kwargs)
+            duration = time.perf_counter() - start
+            print(
+                f"{name:>8} {NUMBER_OF_MESSAGES / duration:>12,.0f} "
+                f"{writer.num_commits:>8} {writer.max_commit_latency * 1e3:>10.1f}ms"
+            )
+
+
+if __name__ == "__main__":
+    main()
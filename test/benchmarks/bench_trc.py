@@ -0,0 +1,79 @@
+#!/usr/bin/env python
+
+"""
+Benchmarks writing and reading PCAN trace files with :class:`can.TRCWriter`
+and :class:`can.TRCReader` in the file versions 1.0 and 2.1.
+
+Run with::
+
+    python test/benchmarks/bench_trc.py [number of messages]
+"""
+
+import os
+import random
+import sys
+import tempfile
+import timeit
+
+import can
+
+NUMBER_OF_MESSAGES = 200_000
+
+
+def create_messages(count: int, rng: random.Random):
+    timestamp = 1_700_000_000.0
+    messages = []
+    for _ in range(count):
+        timestamp += rng.random() * 1e-3
+        is_extended_id = rng.random() < 0.3
+        messages.append(
+            can.Message(
+                timestamp=timestamp,
+                arbitration_id=rng.getrandbits(29 if is_extended_id else 11),
+                is_extended_id=is_extended_id,
+                is_rx=rng.random() < 0.9,
+                channel=0,
+                data=bytes(rng.getrandbits(8) for _ in range(rng.choice((2, 8)))),
+            )
+        )
+    return messages
+
+
+def write(path, messages, file_version, **kwargs) -> None:
+    with can.TRCWriter(path, **kwargs) as writer:
+        writer.file_version = file_version
+        for msg in messages:
+            writer.on_message_received(msg)
+
+
+def read(path) -> int:
+    with can.TRCReader(path) as reader:
+        return sum(1 for _ in reader)
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else NUMBER_OF_MESSAGES
+    messages = create_messages(count, random.Random(0))
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "trace.trc")
+        print(f"{'version':>8} {'mode':>16} {'msgs/s':>12} {'MB/s':>8}")
+        for file_version in (can.TRCFileVersion.V1_0, can.TRCFileVersion.V2_1):
+            for name, function in (
+                ("write", lambda: write(path, messages, file_version)),
+                (
+                    "write buffered",
+                    lambda: write(path, messages, file_version, buffer_size=1000),
+                ),
+                ("read", lambda: read(path)),
+            ):
+                duration = min(timeit.repeat(function, number=1, repeat=3))
+                size = os.path.getsize(path) / 1e6
+                print(
+                    f"{file_version.name:>8} {name:>16} "
+                    f"{count / duration:>12,.0f} {size / duration:>8.1f}"
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+#!/usr/bin/env python
+
+"""
+Benchmarks the virtual interface with N senders and M receivers on one
+channel, with and without ``zero_copy``.
+
+Every sender sends the same number of messages, which every receiver reads.
+The senders and the receivers run in one thread each, so the numbers show the
+cost of the fan-out itself.
+
+Run with::
+
+    python test/benchmarks/bench_virtual.py [messages per sender]
+"""
+
+import sys
+import threading
+import time
+
+import can
+
+MESSAGES_PER_SENDER = 2_000
+TOPOLOGIES = ((1, 1), (1, 10), (4, 10), (4, 30), (30, 30))
+
+
+def run(senders: int, receivers: int, count: int, zero_copy: bool) -> float:
+    """Return the number of delivered messages per second."""
+    channel = f"bench-{senders}x{receivers}-{zero_copy}"
+    tx_buses = [
+        can.Bus(channel, interface="virtual", zero_copy=zero_copy)
+        for _ in range(senders)
+    ]
+    rx_buses = [
+        can.Bus(channel, interface="virtual", zero_copy=zero_copy)
+        for _ in range(receivers)
+    ]
+    # every bus receives the messages of the other buses
+    expected = senders * count * (senders + receivers - 1)
+    msg = can.Message(arbitration_id=0x123, data=bytes(8), is_extended_id=False)
+
+    def receive(buses):
+        for bus in buses:
+            while bus.recv(0) is not None:
+                pass
+
+    start = time.perf_counter()
+    sender = threading.Thread(
+        target=lambda: [bus.send(msg) for _ in range(count) for bus in tx_buses]
+    )
+    sender.start()
+    while sender.is_alive():
+        receive(rx_buses)
+        time.sleep(0.001)
+    receive(rx_buses)
+    receive(tx_buses)
+    duration = time.perf_counter() - start
+
+    for bus in tx_buses + rx_buses:
+        bus.shutdown()
+    return expected / duration
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else MESSAGES_PER_SENDER
+    print(f"{'senders x receivers':>20} {'copy msgs/s':>14} {'zero-copy msgs/s':>18}")
+    for senders, receivers in TOPOLOGIES:
+        copying = run(senders, receivers, count, zero_copy=False)
+        zero_copy = run(senders, receivers, count, zero_copy=True)
+        print(f"{senders:>9} x {receivers:<8} {copying:>14,.0f} {zero_copy:>18,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -11,10 +11,13 @@ comments.
 
 TODO: correctly set preserves_channel and adds_default_channel
 """
+import io
 import locale
 import logging
 import os
+import sqlite3
 import tempfile
+import threading
 import unittest
 from abc import ABCMeta, abstractmethod
 from contextlib import contextmanager
@@ -27,6 +30,7 @@ from parameterized import parameterized
 
 import can
 from can.io import blf
+from can.io._blf_container import MappedContainers
 from .data.example_data import (
     TEST_COMMENTS,
     TEST_MESSAGES_BASE,
@@ -44,6 +48,11 @@ try:
 except ModuleNotFoundError:
     asammdf = None
 
+try:
+    import pyarrow
+except ModuleNotFoundError:
+    pyarrow = None
+
 
 @contextmanager
 def override_locale(category: int, locale_str: str) -> None:
@@ -96,6 +105,9 @@ class ReaderWriterExtensionTest(unittest.TestCase):
     def test_extension_matching_txt(self):
         self._test_extension(".txt")
 
+    def test_extension_matching_canb(self):
+        self._test_extension(".canb")
+
     def test_extension_matching_mf4(self):
         try:
             self._test_extension(".mf4")
@@ -103,6 +115,20 @@ class ReaderWriterExtensionTest(unittest.TestCase):
             if asammdf is not None:
                 raise
 
+    def test_extension_matching_parquet(self):
+        try:
+            self._test_extension(".parquet")
+        except NotImplementedError:
+            if pyarrow is not None:
+                raise
+
+    def test_extension_matching_arrow(self):
+        try:
+            self._test_extension(".arrow")
+        except NotImplementedError:
+            if pyarrow is not None:
+                raise
+
 
 class ReaderWriterTest(unittest.TestCase, ComparingMessagesTestCase, metaclass=ABCMeta):
     """Tests a pair of writer and reader by writing all data first and
@@ -365,6 +391,56 @@ class ReaderWriterTest(unittest.TestCase, ComparingMessagesTestCase, metaclass=A
 
         self.assertMessagesEqual(self.original_messages, read_messages)
 
+    def test_filters(self):
+        """testing that the readers skip messages by time, ID and channel"""
+        with self.writer_constructor(self.test_file_name) as writer:
+            self._write_all(writer)
+        with self.reader_constructor(self.test_file_name) as reader:
+            all_messages = list(reader)
+
+        timestamps = sorted(msg.timestamp for msg in all_messages)
+        start = timestamps[len(timestamps) // 4]
+        stop = timestamps[3 * len(timestamps) // 4]
+        can_filters = [
+            {
+                "can_id": msg.arbitration_id,
+                "can_mask": 0x1FFFFFFF,
+                "extended": msg.is_extended_id,
+            }
+            for msg in all_messages[::3]
+        ]
+        channels = [all_messages[-1].channel]
+        compiled_filters = can.util.compile_filters(can_filters)
+
+        for kwargs in (
+            {"start": start},
+            {"stop": stop},
+            {"can_filters": can_filters},
+            {"channels": channels},
+            {
+                "start": start,
+                "stop": stop,
+                "can_filters": can_filters,
+                "channels": channels,
+            },
+        ):
+            with self.subTest(filters=sorted(kwargs)):
+                expected = [
+                    msg
+                    for msg in all_messages
+                    if msg.timestamp >= kwargs.get("start", msg.timestamp)
+                    and msg.timestamp < kwargs.get("stop", msg.timestamp + 1)
+                    and msg.channel in kwargs.get("channels", [msg.channel])
+                    and (
+                        "can_filters" not in kwargs
+                        or can.util.match_filters(
+                            compiled_filters, msg.arbitration_id, msg.is_extended_id
+                        )
+                    )
+                ]
+                with self.reader_constructor(self.test_file_name, **kwargs) as reader:
+                    self.assertMessagesEqual(expected, list(reader))
+
     def _write_all(self, writer):
         """Writes messages and insert comments here and there."""
         # Note: we make no assumptions about the length of original_messages and original_comments
@@ -651,6 +727,86 @@ class TestAscFileFormat(ReaderWriterTest):
 
         self.assertEqual(expected_file.read_text(), actual_file.read_text())
 
+    def test_fast_parser_matches_regex_parser(self):
+        with patch.object(can.ASCReader, "_parse_message_fast", return_value=None):
+            expected = {
+                path.name: self._read_log_file(path.name)
+                for path in self._get_logfile_location(".").glob("*.asc")
+            }
+        for filename, expected_messages in expected.items():
+            with self.subTest(filename=filename):
+                actual_messages = self._read_log_file(filename)
+                self.assertMessagesEqual(expected_messages, actual_messages)
+                for expected_msg, actual_msg in zip(expected_messages, actual_messages):
+                    self.assertEqual(expected_msg.channel, actual_msg.channel)
+
+    def test_parallel_read(self):
+        lines = [
+            "date Sat Sep 30 10:06:13.191 PM 2017",
+            "base hex  timestamps absolute",
+            "internal events logged",
+        ]
+        for trigger_time in (
+            "Sat Sep 30 10:06:13.191 PM 2017",
+            "Sun Oct 01 09:00:00.000 AM 2017",
+        ):
+            lines.append(f"Begin Triggerblock {trigger_time}")
+            lines.extend(
+                f"   {index / 10:.6f} 1  {index:X}             Rx   d 1 {index:02X}"
+                for index in range(20)
+            )
+            lines.append("End TriggerBlock")
+
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, "test.asc")
+            with open(filename, "w") as file:
+                file.write("\n".join(lines) + "\n")
+
+            for relative_timestamp in (True, False):
+                in_file_order = self._read_log_file(
+                    filename, relative_timestamp=relative_timestamp
+                )
+                expected = sorted(in_file_order, key=lambda msg: msg.timestamp)
+                for shard_size in (1, 200, 1 << 20):
+                    with self.subTest(
+                        relative_timestamp=relative_timestamp, shard_size=shard_size
+                    ):
+                        actual = can.io.parallel_read(
+                            filename,
+                            workers=2,
+                            shard_size=shard_size,
+                            relative_timestamp=relative_timestamp,
+                        )
+                        self.assertMessagesEqual(expected, actual)
+
+                        actual = can.io.parallel_read(
+                            filename,
+                            workers=2,
+                            shard_size=shard_size,
+                            sort=False,
+                            relative_timestamp=relative_timestamp,
+                        )
+                        self.assertMessagesEqual(in_file_order, actual)
+
+                        chunks = can.io.parallel_read(
+                            filename,
+                            workers=2,
+                            ordered=False,
+                            shard_size=shard_size,
+                            relative_timestamp=relative_timestamp,
+                        )
+                        self.assertMessagesEqual(
+                            expected,
+                            sorted(
+                                (msg for chunk in chunks for msg in chunk),
+                                key=lambda msg: msg.timestamp,
+                            ),
+                        )
+
+    def test_parallel_read_unsupported_format(self):
+        with self.assertRaises(ValueError):
+            can.io.parallel_read("test.blf")
+
 
 class TestBlfFileFormat(ReaderWriterTest):
     """Tests can.BLFWriter and can.BLFReader.
@@ -750,6 +906,123 @@ class TestBlfFileFormat(ReaderWriterTest):
         self.assertMessagesEqual(actual, [expected] * 2)
         self.assertEqual(actual[0].channel, expected.channel)
 
+    def _write_test_file(self, **kwargs):
+        with can.BLFWriter(self.test_file_name, **kwargs) as writer:
+            self._write_all(writer)
+
+    def test_objects_across_containers(self):
+        for compression_level in (-1, 0):
+            self._write_test_file(
+                max_container_size=100, compression_level=compression_level
+            )
+            with can.BLFReader(self.test_file_name) as reader:
+                self.assertIsNotNone(reader._containers)
+                read_messages = list(reader)
+            self.assertMessagesEqual(self.original_messages, read_messages)
+
+            with can.BLFReader(self.test_file_name, use_mmap=False) as reader:
+                self.assertIsNone(reader._containers)
+                read_messages = list(reader)
+            self.assertMessagesEqual(self.original_messages, read_messages)
+
+    def test_start_stop(self):
+        self._write_test_file(max_container_size=100)
+        timestamps = sorted(msg.timestamp for msg in self.original_messages)
+        for start, stop in (
+            (None, None),
+            (timestamps[3], None),
+            (None, timestamps[-3]),
+            (timestamps[2], timestamps[7]),
+            (timestamps[-1] + 1, None),
+        ):
+            expected = [
+                msg
+                for msg in self.original_messages
+                if (start is None or msg.timestamp >= start)
+                and (stop is None or msg.timestamp < stop)
+            ]
+            for use_mmap in (True, False):
+                with can.BLFReader(
+                    self.test_file_name, start=start, stop=stop, use_mmap=use_mmap
+                ) as reader:
+                    read_messages = list(reader)
+                self.assertMessagesEqual(expected, read_messages)
+
+    def test_parallel_decoding(self):
+        self._write_test_file(max_container_size=100)
+        timestamps = sorted(msg.timestamp for msg in self.original_messages)
+        with can.BLFReader(self.test_file_name, workers=2) as reader:
+            read_messages = list(reader)
+        self.assertMessagesEqual(self.original_messages, read_messages)
+
+        with can.BLFReader(
+            self.test_file_name, start=timestamps[2], use_mmap=False, workers=2
+        ) as reader:
+            read_messages = list(reader)
+        self.assertMessagesEqual(
+            [msg for msg in self.original_messages if msg.timestamp >= timestamps[2]],
+            read_messages,
+        )
+
+        with self.assertRaises(ValueError):
+            can.BLFReader(self.test_file_name, workers=0)
+
+    def test_container_index(self):
+        self._write_test_file(max_container_size=100)
+        index_file = self.test_file_name + ".idx"
+        self.addCleanup(os.remove, index_file)
+        with can.BLFReader(self.test_file_name, index_file=index_file) as reader:
+            index = reader.container_index
+        self.assertGreater(len(index), 1)
+        self.assertEqual(index[0].skip, 0)
+        first_timestamps = [info.first_timestamp for info in index if info.skip >= 0]
+        self.assertEqual(first_timestamps, sorted(first_timestamps))
+
+        # the index is loaded from the sidecar file
+        with patch.object(MappedContainers, "build_index") as build_index:
+            with can.BLFReader(self.test_file_name, index_file=index_file) as reader:
+                self.assertEqual(index, reader.container_index)
+            build_index.assert_not_called()
+
+        # in-memory files are read sequentially without an index
+        with open(self.test_file_name, "rb") as file:
+            data = file.read()
+        with can.BLFReader(io.BytesIO(data)) as reader:
+            with self.assertRaises(NotImplementedError):
+                _ = reader.container_index
+
+    def test_compression_workers(self):
+        for compression_level in (-1, 0):
+            with can.BLFWriter(
+                self.test_file_name,
+                max_container_size=100,
+                compression_level=compression_level,
+                compression_workers=2,
+            ) as writer:
+                self._write_all(writer)
+                # includes the containers which are still being compressed
+                self.assertGreaterEqual(writer.file_size(), writer.file.tell())
+                self.assertGreater(writer.file_size(), blf.FILE_HEADER_SIZE)
+            with can.BLFReader(self.test_file_name) as reader:
+                read_messages = list(reader)
+            self.assertMessagesEqual(self.original_messages, read_messages)
+
+        with self.assertRaises(ValueError):
+            can.BLFWriter(self.test_file_name, compression_workers=-1)
+
+    def test_on_messages_received(self):
+        with can.BLFWriter(self.test_file_name, max_container_size=100) as writer:
+            writer.on_messages_received(self.original_messages[:5])
+            # an object which is larger than a container
+            writer.log_event("x" * 300)
+            writer.on_messages_received(iter(self.original_messages[5:]))
+        # messages after stop() are discarded
+        writer.on_messages_received(self.original_messages)
+
+        with can.BLFReader(self.test_file_name) as reader:
+            read_messages = list(reader)
+        self.assertMessagesEqual(self.original_messages, read_messages)
+
     def test_timestamp_to_systemtime(self):
         self.assertAlmostEqual(
             1636485425.999,
@@ -777,6 +1050,49 @@ class TestCanutilsFileFormat(ReaderWriterTest):
             adds_default_channel="vcan0",
         )
 
+    def test_parallel_read(self):
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, "test.log")
+            with can.CanutilsLogWriter(filename) as writer:
+                self._write_all(writer)
+            with can.CanutilsLogReader(filename) as reader:
+                expected = sorted(reader, key=lambda msg: msg.timestamp)
+
+            for shard_size in (1, 100, 1 << 20):
+                with self.subTest(shard_size=shard_size):
+                    actual = can.io.parallel_read(
+                        filename, workers=2, shard_size=shard_size
+                    )
+                    self.assertMessagesEqual(expected, actual)
+
+    def test_buffered_writer_and_block_reader(self):
+        with can.CanutilsLogWriter(self.test_file_name) as writer:
+            self._write_all(writer)
+        with open(self.test_file_name) as file:
+            expected_text = file.read()
+        with can.CanutilsLogReader(self.test_file_name) as reader:
+            expected = list(reader)
+
+        for buffer_size in (1, 3, 1000):
+            with self.subTest(buffer_size=buffer_size):
+                with can.CanutilsLogWriter(
+                    self.test_file_name, buffer_size=buffer_size
+                ) as writer:
+                    self._write_all(writer)
+                    self.assertGreaterEqual(writer.file_size(), writer.file.tell())
+                with open(self.test_file_name) as file:
+                    self.assertEqual(expected_text, file.read())
+
+        # blocks which end within a line, and a last line without newline
+        with open(self.test_file_name, "w") as file:
+            file.write(expected_text.rstrip("\n"))
+        for block_size in (1, 7, 1 << 20):
+            with self.subTest(block_size=block_size):
+                with can.CanutilsLogReader(
+                    self.test_file_name, block_size=block_size
+                ) as reader:
+                    self.assertMessagesEqual(expected, list(reader))
+
 
 class TestCsvFileFormat(ReaderWriterTest):
     """Tests can.CSVWriter and can.CSVReader"""
@@ -793,6 +1109,89 @@ class TestCsvFileFormat(ReaderWriterTest):
         )
 
 
+class TestCANBFileFormat(ReaderWriterTest):
+    """Tests can.CANBWriter and can.CANBReader"""
+
+    def _setup_instance(self):
+        super()._setup_instance_helper(
+            can.CANBWriter,
+            can.CANBReader,
+            binary_file=True,
+            check_comments=False,
+            test_append=True,
+            preserves_channel=True,
+            adds_default_channel=None,
+        )
+
+    def _write_test_file(self, **kwargs):
+        with can.CANBWriter(self.test_file_name, **kwargs) as writer:
+            self._write_all(writer)
+        return writer.blocks
+
+    def test_compression(self):
+        for compression in ("zlib", "lz4", "zstd"):
+            with self.subTest(compression=compression):
+                try:
+                    self._write_test_file(compression=compression)
+                except NotImplementedError:
+                    continue
+                with can.CANBReader(self.test_file_name) as reader:
+                    self.assertMessagesEqual(self.original_messages, list(reader))
+
+        with self.assertRaises(ValueError):
+            can.CANBWriter(self.test_file_name, compression="unknown")
+
+    def test_seek_by_time(self):
+        blocks = self._write_test_file(block_size=1)
+        self.assertEqual(len(blocks), len(self.original_messages))
+        start = self.original_messages[3].timestamp
+        stop = self.original_messages[6].timestamp
+        with can.CANBReader(self.test_file_name, start=start, stop=stop) as reader:
+            self.assertEqual(reader.blocks, blocks)
+            self.assertEqual(reader._block_range(), (3, 6))
+            self.assertMessagesEqual(self.original_messages[3:6], list(reader))
+
+    def test_interrupted_recording(self):
+        """All complete blocks are used if the footer is missing."""
+        blocks = self._write_test_file(block_size=1)
+        with open(self.test_file_name, "r+b") as file:
+            # cut the last block and the footer
+            file.truncate(blocks[-1].offset + 10)
+
+        with can.CANBReader(self.test_file_name) as reader:
+            self.assertEqual(reader.blocks, blocks[:-1])
+            self.assertMessagesEqual(self.original_messages[:-1], list(reader))
+
+        # appending replaces the incomplete block
+        with can.CANBWriter(self.test_file_name, append=True) as writer:
+            writer(self.original_messages[-1])
+        with can.CANBReader(self.test_file_name) as reader:
+            self.assertMessagesEqual(self.original_messages, list(reader))
+
+    def test_corrupted_block(self):
+        blocks = self._write_test_file(block_size=1)
+        with open(self.test_file_name, "r+b") as file:
+            file.seek(blocks[2].offset + can.io.canb.BLOCK_HEADER_STRUCT.size)
+            file.write(b"\xff\xff")
+
+        with self.assertRaises(can.io.canb.CANBParseError):
+            with can.CANBReader(self.test_file_name) as reader:
+                list(reader)
+
+    def test_not_a_canb_file(self):
+        with open(self.test_file_name, "wb") as file:
+            file.write(b"LOGG" + bytes(100))
+        with self.assertRaises(can.io.canb.CANBParseError):
+            can.CANBReader(self.test_file_name)
+
+    def test_file_size_includes_buffered_messages(self):
+        with can.CANBWriter(self.test_file_name, flush_interval=None) as writer:
+            initial_size = writer.file_size()
+            self._write_all(writer)
+            self.assertFalse(writer.blocks)
+            self.assertGreater(writer.file_size(), initial_size)
+
+
 @unittest.skipIf(asammdf is None, "MF4 is unavailable")
 class TestMF4FileFormat(ReaderWriterTest):
     """Tests can.MF4Writer and can.MF4Reader"""
@@ -808,6 +1207,150 @@ class TestMF4FileFormat(ReaderWriterTest):
             adds_default_channel=0,
         )
 
+    def _write_test_file(self):
+        with can.MF4Writer(self.test_file_name) as writer:
+            self._write_all(writer)
+
+    def test_read_in_small_chunks(self):
+        """Chunks contain records of several channel groups and end within groups."""
+        self._write_test_file()
+        for chunk_size in (1, 3, 7):
+            with can.MF4Reader(self.test_file_name, chunk_size=chunk_size) as reader:
+                read_messages = list(reader)
+            self.assertMessagesEqual(self.original_messages, read_messages)
+
+    def test_small_write_buffers(self):
+        for buffer_size in (1, 2, 5):
+            with can.MF4Writer(
+                self.test_file_name, buffer_size=buffer_size, flush_interval=None
+            ) as writer:
+                self._write_all(writer)
+            with can.MF4Reader(self.test_file_name) as reader:
+                read_messages = list(reader)
+            self.assertMessagesEqual(self.original_messages, read_messages)
+
+    def test_file_size_includes_buffered_messages(self):
+        with can.MF4Writer(self.test_file_name, flush_interval=None) as writer:
+            initial_size = writer.file_size()
+            self._write_all(writer)
+            self.assertGreater(writer.file_size(), initial_size)
+
+    def test_iter_batches(self):
+        self._write_test_file()
+        with can.MF4Reader(self.test_file_name, chunk_size=5) as reader:
+            batches = list(reader.iter_batches())
+
+        self.assertTrue(all(len(batch) <= 5 for batch in batches))
+        read_messages = can.MessageBatch.concatenate(batches).to_messages()
+        self.assertMessagesEqual(self.original_messages, read_messages)
+
+
+@unittest.skipIf(pyarrow is None, "pyarrow is unavailable")
+class TestParquetFileFormat(ReaderWriterTest):
+    """Tests can.ParquetWriter and can.ParquetReader"""
+
+    def _setup_instance(self):
+        super()._setup_instance_helper(
+            can.ParquetWriter,
+            can.ParquetReader,
+            binary_file=True,
+            check_comments=False,
+            preserves_channel=True,
+            adds_default_channel=None,
+        )
+
+    def test_small_row_groups(self):
+        for row_group_size, batch_size in ((1, 1), (2, 7), (5, 3)):
+            with self.writer_constructor(
+                self.test_file_name, row_group_size=row_group_size
+            ) as writer:
+                self._write_all(writer)
+            with self.reader_constructor(
+                self.test_file_name, batch_size=batch_size
+            ) as reader:
+                read_messages = list(reader)
+            self.assertMessagesEqual(self.original_messages, read_messages)
+
+    def test_uncompressed(self):
+        with self.writer_constructor(self.test_file_name, compression=None) as writer:
+            self._write_all(writer)
+        with self.reader_constructor(self.test_file_name) as reader:
+            self.assertMessagesEqual(self.original_messages, list(reader))
+
+    def test_file_size_includes_buffered_messages(self):
+        with self.writer_constructor(self.test_file_name) as writer:
+            initial_size = writer.file_size()
+            self._write_all(writer)
+            self.assertGreater(writer.file_size(), initial_size)
+
+    def test_iter_batches(self):
+        with self.writer_constructor(self.test_file_name) as writer:
+            self._write_all(writer)
+        with self.reader_constructor(self.test_file_name, batch_size=5) as reader:
+            batches = list(reader.iter_batches())
+
+        self.assertTrue(all(len(batch) <= 5 for batch in batches))
+        read_messages = can.MessageBatch.concatenate(batches).to_messages()
+        self.assertMessagesEqual(self.original_messages, read_messages)
+
+    def test_read_table(self):
+        with self.writer_constructor(self.test_file_name) as writer:
+            self._write_all(writer)
+        arbitration_ids = {0xABCDEF, 0x123}
+        with self.reader_constructor(
+            self.test_file_name,
+            can_filters=[
+                {"can_id": can_id, "can_mask": 0x1FFFFFFF} for can_id in arbitration_ids
+            ],
+        ) as reader:
+            table = reader.read_table()
+
+        expected = [
+            msg
+            for msg in self.original_messages
+            if msg.arbitration_id in arbitration_ids
+        ]
+        self.assertTrue(expected)
+        self.assertEqual(table.column_names, can.io.parquet.SCHEMA.names)
+        self.assertEqual(
+            table.column("timestamp").to_pylist(), [msg.timestamp for msg in expected]
+        )
+        self.assertEqual(
+            table.column("data").to_pylist(), [bytes(msg.data) for msg in expected]
+        )
+
+    def test_append_is_not_supported(self):
+        with self.assertRaises(ValueError):
+            self.writer_constructor(self.test_file_name, append=True)
+
+    def test_row_groups_are_skipped(self):
+        with self.writer_constructor(self.test_file_name, row_group_size=1) as writer:
+            self._write_all(writer)
+        start = self.original_messages[-3].timestamp
+        with self.reader_constructor(self.test_file_name, start=start) as reader:
+            fragment = reader._fragment.subset(reader._filter_expression())
+            self.assertEqual(fragment.num_row_groups, 3)
+            self.assertMessagesEqual(self.original_messages[-3:], list(reader))
+
+
+@unittest.skipIf(pyarrow is None, "pyarrow is unavailable")
+class TestArrowFileFormat(TestParquetFileFormat):
+    """Tests can.ArrowWriter and can.ArrowReader"""
+
+    def _setup_instance(self):
+        super()._setup_instance_helper(
+            can.ArrowWriter,
+            can.ArrowReader,
+            binary_file=True,
+            check_comments=False,
+            preserves_channel=True,
+            adds_default_channel=None,
+        )
+
+    @unittest.skip("Arrow IPC files have no statistics")
+    def test_row_groups_are_skipped(self):
+        pass
+
 
 class TestSqliteDatabaseFormat(ReaderWriterTest):
     """Tests can.SqliteWriter and can.SqliteReader"""
@@ -816,10 +1359,10 @@ class TestSqliteDatabaseFormat(ReaderWriterTest):
         super()._setup_instance_helper(
             can.SqliteWriter,
             can.SqliteReader,
-            check_fd=False,
+            check_fd=True,
             test_append=True,
             check_comments=False,
-            preserves_channel=False,
+            preserves_channel=True,
             adds_default_channel=None,
         )
 
@@ -854,6 +1397,130 @@ class TestSqliteDatabaseFormat(ReaderWriterTest):
 
         self.assertMessagesEqual(self.original_messages, read_messages)
 
+    def test_query(self):
+        with self.writer_constructor(self.test_file_name) as writer:
+            self._write_all(writer)
+
+        arbitration_ids = {0xABCDEF, 0x123}
+        start = self.original_messages[3].timestamp
+        stop = self.original_messages[-3].timestamp
+        with self.reader_constructor(self.test_file_name) as reader:
+            self.assertEqual(reader.schema_version, can.io.sqlite.SCHEMA_VERSION)
+            self.assertMessagesEqual(
+                sorted(
+                    (
+                        msg
+                        for msg in self.original_messages
+                        if msg.arbitration_id in arbitration_ids
+                        and start <= msg.timestamp < stop
+                    ),
+                    key=lambda msg: msg.timestamp,
+                ),
+                list(reader.query(arbitration_ids, start=start, stop=stop)),
+            )
+            self.assertMessagesEqual(
+                sorted(
+                    (msg for msg in self.original_messages if msg.channel is None),
+                    key=lambda msg: msg.timestamp,
+                ),
+                list(reader.query(channels=[None])),
+            )
+
+            # looking up an ID must not scan the whole table
+            plan = reader._conn.execute(
+                "EXPLAIN QUERY PLAN SELECT * FROM messages "
+                "WHERE arbitration_id IN (1, 2) AND ts >= 0 ORDER BY ts"
+            ).fetchall()
+            self.assertIn("USING INDEX messages_arbitration_id_ts", str(plan))
+            plan = reader._conn.execute(
+                "EXPLAIN QUERY PLAN SELECT * FROM messages WHERE ts >= 0 AND ts < 1"
+            ).fetchall()
+            self.assertIn("USING INDEX messages_ts", str(plan))
+
+    def test_schema_version_1(self):
+        """Tables of the first version are still read and appended to."""
+        with sqlite3.connect(self.test_file_name) as conn:
+            conn.execute(
+                """CREATE TABLE messages
+                (
+                  ts REAL,
+                  arbitration_id INTEGER,
+                  extended INTEGER,
+                  remote INTEGER,
+                  error INTEGER,
+                  dlc INTEGER,
+                  data BLOB
+                )"""
+            )
+        conn.close()
+
+        messages = [
+            msg for msg in self.original_messages if not msg.is_fd and msg.is_rx
+        ]
+        with self.writer_constructor(self.test_file_name) as writer:
+            for msg in messages:
+                writer(msg)
+
+        with self.reader_constructor(self.test_file_name) as reader:
+            self.assertEqual(reader.schema_version, 1)
+            read_messages = list(reader)
+        self.assertEqual(len(messages), len(read_messages))
+        for expected, actual in zip(messages, read_messages):
+            self.assertIsNone(actual.channel)
+            self.assertTrue(
+                expected.equals(actual, timestamp_delta=0.0, check_channel=False)
+            )
+
+    def test_journal_mode(self):
+        with self.writer_constructor(self.test_file_name) as writer:
+            self._write_all(writer)
+        with sqlite3.connect(self.test_file_name) as conn:
+            (journal_mode,) = conn.execute("PRAGMA journal_mode").fetchone()
+        conn.close()
+        self.assertEqual(journal_mode, "wal")
+
+        other_file_name = self.test_file_name + ".other"
+        self.addCleanup(os.remove, other_file_name)
+        with self.writer_constructor(
+            other_file_name, journal_mode=None, synchronous=None
+        ) as writer:
+            self._write_all(writer)
+        with sqlite3.connect(other_file_name) as conn:
+            (journal_mode,) = conn.execute("PRAGMA journal_mode").fetchone()
+        conn.close()
+        self.assertEqual(journal_mode, "delete")
+
+    def test_backlog(self):
+        """A backlog is written in large batches, even after stopping the writer."""
+        opened = threading.Event()
+        count = 4 * can.SqliteWriter.MAX_BUFFER_SIZE_BEFORE_WRITES
+
+        class SlowStartWriter(can.SqliteWriter):
+            MAX_BATCH_SIZE = count // 2
+
+            def _create_db(self):
+                opened.wait(5)
+                super()._create_db()
+
+        messages = [
+            can.Message(timestamp=index, arbitration_id=index & 0x7FF)
+            for index in range(count)
+        ]
+        with SlowStartWriter(self.test_file_name) as writer:
+            for msg in messages:
+                writer(msg)
+            self.assertEqual(writer.queue_depth, count)
+            opened.set()
+        self.assertEqual(writer.queue_depth, 0)
+        self.assertEqual(writer.num_frames, count)
+        self.assertEqual(writer.num_commits, 2)
+        self.assertEqual(writer.max_queue_depth, count)
+        self.assertGreater(writer.last_commit_latency, 0.0)
+        self.assertGreaterEqual(writer.max_commit_latency, writer.last_commit_latency)
+
+        with self.reader_constructor(self.test_file_name) as reader:
+            self.assertMessagesEqual(messages, list(reader))
+
 
 class TestPrinter(unittest.TestCase):
     """Tests that can.Printer does not crash.
@@ -993,6 +1660,22 @@ class TestTrcFileFormatGen(TestTrcFileFormatBase):
             actual = self._read_log_file(filename)
             self.assertMessagesEqual(actual, expected_messages)
 
+    @parameterized.expand(
+        [
+            ("V1_0", "test_CanMessage_V1_0_BUS1.trc"),
+            ("V1_1", "test_CanMessage_V1_1.trc"),
+            ("V2_0", "test_CanMessage_V2_0_BUS1.trc"),
+            ("V2_1", "test_CanMessage_V2_1.trc"),
+        ]
+    )
+    def test_parallel_read(self, name, filename):
+        logfile = os.path.join(os.path.dirname(__file__), "data", filename)
+        expected = sorted(self._read_log_file(filename), key=lambda msg: msg.timestamp)
+        for shard_size in (1, 100, 1 << 20):
+            with self.subTest(shard_size=shard_size):
+                actual = can.io.parallel_read(logfile, workers=2, shard_size=shard_size)
+                self.assertMessagesEqual(expected, actual)
+
     def test_not_supported_version(self):
         with tempfile.NamedTemporaryFile(mode="w") as f:
             with self.assertRaises(NotImplementedError):
@@ -1000,6 +1683,27 @@ class TestTrcFileFormatGen(TestTrcFileFormatBase):
                 writer.file_version = can.TRCFileVersion.UNKNOWN
                 writer.on_message_received(can.Message())
 
+    @parameterized.expand(
+        [
+            ("V1_0", can.TRCFileVersion.V1_0),
+            ("V2_1", can.TRCFileVersion.V2_1),
+        ]
+    )
+    def test_buffered_writer(self, name, file_version):
+        def write(**kwargs):
+            with can.TRCWriter(self.test_file_name, **kwargs) as writer:
+                writer.file_version = file_version
+                for msg in self.original_messages:
+                    writer.on_message_received(msg)
+                self.assertGreaterEqual(writer.file_size(), writer.file.tell())
+            with open(self.test_file_name) as file:
+                return file.read()
+
+        expected = write()
+        for buffer_size in (1, 3, 1000):
+            with self.subTest(buffer_size=buffer_size):
+                self.assertEqual(expected, write(buffer_size=buffer_size))
+
 
 class TestTrcFileFormatV1_0(TestTrcFileFormatBase):
     """Tests can.TRCWriter and can.TRCReader with file version 1.0"""
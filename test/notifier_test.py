@@ -1,11 +1,16 @@
 #!/usr/bin/env python
 
 import asyncio
+import collections
+import socket
+import threading
 import time
 import unittest
 
 import can
 
+from .config import IS_WINDOWS
+
 
 class NotifierTest(unittest.TestCase):
     def test_single_bus(self):
@@ -34,6 +39,318 @@ class NotifierTest(unittest.TestCase):
                 self.assertEqual(recv_msg.channel, 1)
                 notifier.stop()
 
+    def test_shared_reader(self):
+        buses = [PipeBus(channel) for channel in range(4)]
+        reader = can.BufferedReader()
+        notifier = can.Notifier(buses, [reader], timeout=10, shared_reader=True)
+        buses.append(PipeBus(4))
+        notifier.add_bus(buses[-1])
+        # one thread for all buses with a file descriptor
+        self.assertEqual(len(notifier._readers), 1)
+
+        for channel, bus in enumerate(buses):
+            bus.put(can.Message(arbitration_id=1, channel=channel))
+            bus.put(can.Message(arbitration_id=2, channel=channel))
+        received = [reader.get_message(1) for _ in range(2 * len(buses))]
+        self.assertEqual(
+            sorted((msg.channel, msg.arbitration_id) for msg in received),
+            [(channel, i) for channel in range(5) for i in (1, 2)],
+        )
+
+        # the reader thread is woken up instead of waiting for the timeout
+        start = time.perf_counter()
+        notifier.stop()
+        self.assertLess(time.perf_counter() - start, 5)
+        self.assertFalse(notifier._readers[0].is_alive())
+        for bus in buses:
+            bus.shutdown()
+
+    def test_shared_reader_add_bus_from_listener(self):
+        buses = [PipeBus(0), PipeBus(1)]
+        reader = can.BufferedReader()
+
+        def add_bus(msg):
+            if msg.channel == 0:
+                notifier.add_bus(buses[1])
+
+        notifier = can.Notifier(buses[0], [add_bus, reader], shared_reader=True)
+        buses[0].put(can.Message(channel=0))
+        self.assertEqual(reader.get_message(1).channel, 0)
+        buses[1].put(can.Message(channel=1))
+        received = reader.get_message(1)
+        self.assertIsNotNone(received)
+        self.assertEqual(received.channel, 1)
+        notifier.stop()
+        for bus in buses:
+            bus.shutdown()
+
+    def test_shared_reader_bus_without_fileno(self):
+        with can.Bus("test", interface="virtual", receive_own_messages=True) as bus:
+            with PipeBus() as pipe_bus:
+                reader = can.BufferedReader()
+                notifier = can.Notifier(
+                    [bus, pipe_bus], [reader], 0.1, shared_reader=True
+                )
+                self.assertEqual(len(notifier._readers), 2)
+                bus.send(can.Message(arbitration_id=1))
+                pipe_bus.put(can.Message(arbitration_id=2))
+                received = [reader.get_message(1) for _ in range(2)]
+                self.assertEqual(sorted(msg.arbitration_id for msg in received), [1, 2])
+                notifier.stop()
+
+    def test_shared_reader_error_of_one_bus(self):
+        failing, healthy = PipeBus(0), PipeBus(1)
+
+        def fail(max_messages=256, timeout=None):
+            raise can.CanOperationError("failed")
+
+        failing.recv_batch = fail
+        reader = can.BufferedReader()
+        notifier = can.Notifier([failing, healthy], [reader], shared_reader=True)
+        with self.assertLogs("can.Notifier", "WARNING") as logs:
+            failing.put(can.Message(channel=0))
+            # the failing bus is no longer read, but the healthy one is, also
+            # after the selection that contained both buses was processed
+            for _ in range(2):
+                healthy.put(can.Message(channel=1))
+                self.assertEqual(reader.get_message(1).channel, 1)
+            # adding a bus twice does not stop the reader thread either
+            notifier.add_bus(healthy)
+            for _ in range(2):
+                healthy.put(can.Message(channel=1))
+                self.assertEqual(reader.get_message(1).channel, 1)
+        self.assertEqual(
+            [record.levelname for record in logs.records], ["ERROR", "WARNING"]
+        )
+        self.assertEqual(str(notifier.exception), "failed")
+        self.assertTrue(notifier._readers[0].is_alive())
+        notifier.stop()
+        failing.shutdown()
+        healthy.shutdown()
+
+
+class ListenerQueueTest(unittest.TestCase):
+    def setUp(self):
+        self.received = []
+        self.release = threading.Event()
+
+    def listener(self, msg):
+        self.release.wait(5)
+        self.received.append(msg.arbitration_id)
+
+    def fill(self, listener_queue, count):
+        listener_queue.put(can.Message(arbitration_id=0))
+        # wait until the worker is blocked in the listener with the first message
+        while listener_queue.depth:
+            time.sleep(0.001)
+        for i in range(1, count):
+            listener_queue.put(can.Message(arbitration_id=i))
+
+    def test_invalid_arguments(self):
+        with self.assertRaises(ValueError):
+            can.notifier.ListenerQueue(self.listener, 0)
+        with self.assertRaises(ValueError):
+            can.notifier.ListenerQueue(self.listener, 1, overflow="drop_all")
+
+    def test_drop_newest(self):
+        listener_queue = can.notifier.ListenerQueue(
+            self.listener, 3, overflow="drop_newest"
+        )
+        self.fill(listener_queue, 10)
+        self.assertEqual(listener_queue.depth, 3)
+        self.assertEqual(listener_queue.max_depth, 3)
+        self.assertEqual(listener_queue.dropped, 6)
+        self.release.set()
+        listener_queue.stop(5)
+        self.assertEqual(self.received, [0, 1, 2, 3])
+
+    def test_drop_oldest(self):
+        listener_queue = can.notifier.ListenerQueue(
+            self.listener, 3, overflow="drop_oldest"
+        )
+        self.fill(listener_queue, 10)
+        self.assertEqual(listener_queue.dropped, 6)
+        self.release.set()
+        listener_queue.stop(5)
+        self.assertEqual(self.received, [0, 7, 8, 9])
+
+    def test_block(self):
+        listener_queue = can.notifier.ListenerQueue(self.listener, 3)
+        self.fill(listener_queue, 4)
+        producer = threading.Thread(target=self.fill, args=(listener_queue, 2))
+        producer.start()
+        producer.join(0.2)
+        self.assertTrue(producer.is_alive())
+        self.release.set()
+        producer.join(5)
+        listener_queue.stop(5)
+        self.assertEqual(self.received, [0, 1, 2, 3, 0, 1])
+        self.assertEqual(listener_queue.dropped, 0)
+
+    def test_stop_idle_queue(self):
+        for _ in range(200):
+            listener_queue = can.notifier.ListenerQueue(self.listener, 10)
+            listener_queue.stop(5)
+            self.assertFalse(listener_queue._thread.is_alive())
+
+    def test_stop_before_worker_waits(self):
+        listener_queue = can.notifier.ListenerQueue(self.listener, 10)
+
+        class StopBeforeClear(threading.Event):
+            def clear(self):
+                # stop() is called after the worker checked if it is running
+                listener_queue._running = False
+                self.set()
+                super().clear()
+
+        self.fill(listener_queue, 1)
+        listener_queue._not_empty = StopBeforeClear()
+        self.release.set()
+        listener_queue._thread.join(5)
+        self.assertFalse(listener_queue._thread.is_alive())
+        listener_queue.stop(5)
+
+    def test_errors_are_passed_on(self):
+        errors = []
+
+        def on_error(exc):
+            errors.append(exc)
+            return True
+
+        def failing_listener(msg):
+            raise ValueError(msg.arbitration_id)
+
+        listener_queue = can.notifier.ListenerQueue(
+            failing_listener, 10, on_error=on_error
+        )
+        listener_queue.put(can.Message(arbitration_id=1))
+        listener_queue.put(can.Message(arbitration_id=2))
+        listener_queue.stop(5)
+        self.assertEqual([exc.args for exc in errors], [(1,), (2,)])
+
+    def test_slow_listener_does_not_delay_others(self):
+        with can.Bus("test", interface="virtual", receive_own_messages=True) as bus:
+            reader = can.BufferedReader()
+            notifier = can.Notifier(
+                bus, [self.listener, reader], 0.1, listener_queue_size=100
+            )
+            self.assertEqual(len(notifier.listener_queues), 2)
+            for i in range(10):
+                bus.send(can.Message(arbitration_id=i))
+            for i in range(10):
+                self.assertEqual(reader.get_message(1).arbitration_id, i)
+            self.assertEqual(self.received, [])
+
+            added = can.BufferedReader()
+            notifier.add_listener(added)
+            notifier.remove_listener(reader)
+            self.assertEqual(
+                [q.listener for q in notifier.listener_queues], [self.listener, added]
+            )
+
+            self.release.set()
+            notifier.stop()
+            self.assertEqual(self.received, list(range(10)))
+
+    def test_not_with_loop(self):
+        async def run_it():
+            with can.Bus("test", interface="virtual") as bus:
+                with self.assertRaises(ValueError):
+                    can.Notifier(
+                        bus, [], loop=asyncio.get_running_loop(), listener_queue_size=1
+                    )
+
+        asyncio.run(run_it())
+
+
+class NotifierStatsTest(unittest.TestCase):
+    def test_histogram(self):
+        histogram = can.notifier.LatencyHistogram()
+        self.assertEqual(histogram.percentile(50), 0.0)
+        for microseconds in range(1, 1001):
+            histogram.record(microseconds * 1e-6)
+
+        snapshot = histogram.snapshot()
+        self.assertEqual(snapshot["count"], 1000)
+        self.assertAlmostEqual(snapshot["mean"], 500.5e-6)
+        self.assertAlmostEqual(snapshot["max"], 1e-3)
+        self.assertEqual(sum(snapshot["buckets"].values()), 1000)
+        self.assertLess(len(snapshot["buckets"]), 100)
+        # the lower bound of the bucket is within 12.5 % of the exact value
+        for percent in (50, 90, 99):
+            exact = percent * 10e-6
+            self.assertLessEqual(histogram.percentile(percent), exact)
+            self.assertGreater(histogram.percentile(percent), exact * 0.875)
+
+    def test_disabled(self):
+        with can.Bus("test", interface="virtual") as bus:
+            notifier = can.Notifier(bus, [], 0.1)
+            self.assertIsNone(notifier.stats)
+            notifier.stop()
+
+    def test_stats(self):
+        def failing_listener(msg):
+            if msg.arbitration_id == 3:
+                raise ValueError()
+
+        with can.Bus("test", interface="virtual", receive_own_messages=True) as bus:
+            reader = can.BufferedReader()
+            reader.on_error = lambda exc: None
+            notifier = can.Notifier(bus, [failing_listener, reader], 0.1, stats=True)
+            for i in range(5):
+                bus.send(can.Message(arbitration_id=i))
+            for _ in range(4):
+                self.assertIsNotNone(reader.get_message(1))
+            notifier.stop()
+
+        snapshot = notifier.stats.snapshot()
+        self.assertEqual(snapshot["received"], {bus.channel_info: 5})
+        self.assertEqual(snapshot["errors"], 1)
+        failing, buffered = snapshot["listeners"]
+        self.assertEqual(failing["calls"], 4)
+        self.assertEqual(failing["errors"], 1)
+        self.assertEqual(buffered["listener"], repr(reader))
+        self.assertEqual(buffered["calls"], 4)
+        self.assertEqual(buffered["latency"]["count"], 4)
+        self.assertEqual(buffered["duration"]["count"], 4)
+        self.assertNotIn("dropped", buffered)
+
+    def test_stats_with_listener_queues(self):
+        release = threading.Event()
+
+        def slow_listener(msg):
+            release.wait(5)
+
+        with can.Bus("test", interface="virtual", receive_own_messages=True) as bus:
+            notifier = can.Notifier(
+                bus,
+                [slow_listener],
+                0.1,
+                listener_queue_size=2,
+                overflow="drop_newest",
+                stats=True,
+            )
+            for i in range(10):
+                bus.send(can.Message(arbitration_id=i))
+            listener_queue = notifier.listener_queues[0]
+            for _ in range(100):
+                # the worker is blocked in the listener with the first message
+                if listener_queue.dropped + listener_queue.depth >= 9:
+                    break
+                time.sleep(0.01)
+            release.set()
+            notifier.stop()
+
+        snapshot = notifier.stats.snapshot()
+        self.assertEqual(snapshot["received"], {bus.channel_info: 10})
+        (slow,) = snapshot["listeners"]
+        self.assertEqual(slow["max_queue_depth"], 2)
+        self.assertEqual(slow["calls"] + slow["dropped"], 10)
+        self.assertIn(slow["calls"], (2, 3))
+        self.assertEqual(slow["queue_depth"], 0)
+        # the first message was handled immediately, the others had to wait
+        self.assertGreater(slow["latency"]["max"], slow["latency"]["p50"])
+
 
 class AsyncNotifierTest(unittest.TestCase):
     def test_asyncio_notifier(self):
@@ -51,5 +368,213 @@ class AsyncNotifierTest(unittest.TestCase):
         asyncio.run(run_it())
 
 
+class PipeBus(can.BusABC):
+    """A bus with a file descriptor, which becomes readable for each message."""
+
+    def __init__(self, channel=0, **kwargs):
+        super().__init__(channel, **kwargs)
+        self.channel_info = f"pipe {channel}"
+        self.messages = collections.deque()
+        self.recv_batch_calls = 0
+        self._read_sock, self._write_sock = socket.socketpair()
+
+    def put(self, msg):
+        self.messages.append(msg)
+        self._write_sock.send(b"x")
+
+    def send(self, msg, timeout=None):
+        self.put(msg)
+
+    def _recv_internal(self, timeout):
+        if not self.messages:
+            return None, False
+        self._read_sock.recv(1)
+        return self.messages.popleft(), False
+
+    def recv_batch(self, max_messages=256, timeout=None):
+        self.recv_batch_calls += 1
+        return super().recv_batch(max_messages, timeout)
+
+    def fileno(self):
+        return self._read_sock.fileno()
+
+    def shutdown(self):
+        super().shutdown()
+        self._read_sock.close()
+        self._write_sock.close()
+
+
+class AsyncNotifierClassTest(unittest.TestCase):
+    def test_requires_loop(self):
+        with can.Bus("test", interface="virtual") as bus:
+            with self.assertRaises(RuntimeError):
+                can.AsyncNotifier(bus, [])
+
+    def test_buses_without_fileno(self):
+        async def run_it():
+            with can.Bus(0, interface="virtual", receive_own_messages=True) as bus1:
+                with can.Bus(1, interface="virtual", receive_own_messages=True) as bus2:
+                    reader = can.AsyncBufferedReader()
+                    notifier = can.AsyncNotifier([bus1, bus2], [reader], 0.1)
+                    self.assertEqual(len(notifier._readers), 1)
+                    for i in range(100):
+                        (bus2 if i % 2 else bus1).send(can.Message(arbitration_id=i))
+
+                    received = [
+                        await asyncio.wait_for(reader.get_message(), 1)
+                        for _ in range(100)
+                    ]
+                    notifier.stop()
+
+            self.assertEqual(
+                [msg.arbitration_id for msg in received if msg.channel == 0],
+                list(range(0, 100, 2)),
+            )
+            self.assertEqual(
+                [msg.arbitration_id for msg in received if msg.channel == 1],
+                list(range(1, 100, 2)),
+            )
+
+        asyncio.run(run_it())
+
+    @unittest.skipIf(IS_WINDOWS, "the proactor event loop has no add_reader()")
+    def test_bus_with_fileno(self):
+        async def run_it():
+            with PipeBus() as bus:
+                for i in range(10):
+                    bus.put(can.Message(arbitration_id=i))
+                reader = can.AsyncBufferedReader()
+                notifier = can.AsyncNotifier(bus, [reader])
+                self.assertEqual(notifier._readers, [bus.fileno()])
+
+                received = [
+                    await asyncio.wait_for(reader.get_message(), 1) for _ in range(10)
+                ]
+                # all available messages are read at once
+                self.assertEqual(bus.recv_batch_calls, 1)
+                self.assertEqual(
+                    [msg.arbitration_id for msg in received], list(range(10))
+                )
+                notifier.stop()
+
+        asyncio.run(run_it())
+
+    def test_bounded_tasks(self):
+        async def run_it():
+            running = 0
+            max_running = 0
+            done = []
+
+            async def slow_listener(msg):
+                nonlocal running, max_running
+                running += 1
+                max_running = max(max_running, running)
+                await asyncio.sleep(0.01)
+                running -= 1
+                done.append(msg.arbitration_id)
+
+            with PipeBus() as bus:
+                notifier = can.AsyncNotifier(bus, [slow_listener], max_tasks=3)
+                for i in range(10):
+                    bus.put(can.Message(arbitration_id=i))
+                for _ in range(100):
+                    await asyncio.sleep(0.01)
+                    if len(done) == 10:
+                        break
+                notifier.stop()
+
+            self.assertEqual(sorted(done), list(range(10)))
+            self.assertEqual(max_running, 3)
+
+        asyncio.run(run_it())
+
+    def test_listener_error(self):
+        async def run_it():
+            errors = []
+
+            class FailingListener(can.Listener):
+                def on_message_received(self, msg):
+                    raise ValueError(msg.arbitration_id)
+
+                def on_error(self, exc):
+                    errors.append(exc)
+
+                def stop(self):
+                    pass
+
+            with PipeBus() as bus:
+                reader = can.AsyncBufferedReader()
+                notifier = can.AsyncNotifier(bus, [FailingListener(), reader])
+                bus.put(can.Message(arbitration_id=1))
+                bus.put(can.Message(arbitration_id=2))
+                await asyncio.wait_for(reader.get_message(), 1)
+                notifier.stop()
+
+            self.assertEqual([exc.args for exc in errors], [(1,), (2,)])
+            self.assertIsInstance(notifier.exception, ValueError)
+
+        asyncio.run(run_it())
+
+    def test_error_of_bus_without_fileno(self):
+        async def run_it(handled):
+            errors = []
+            loop_errors = []
+            asyncio.get_running_loop().set_exception_handler(
+                lambda loop, context: loop_errors.append(context["exception"])
+            )
+
+            class ErrorHandler(can.Listener):
+                def on_message_received(self, msg):
+                    pass
+
+                def on_error(self, exc):
+                    errors.append(exc)
+
+                def stop(self):
+                    pass
+
+            with can.Bus(0, interface="virtual") as failing, can.Bus(
+                1, interface="virtual"
+            ) as healthy, can.Bus(0, interface="virtual") as sender0, can.Bus(
+                1, interface="virtual"
+            ) as sender1:
+                receive = failing._recv_internal
+                failures = [can.CanOperationError("failed")]
+
+                def fail_once(timeout):
+                    if failures:
+                        raise failures.pop()
+                    return receive(timeout)
+
+                failing._recv_internal = fail_once
+                reader = can.AsyncBufferedReader()
+                listeners = [reader, ErrorHandler()] if handled else [reader]
+                notifier = can.AsyncNotifier([failing, healthy], listeners, 0.1)
+                await asyncio.sleep(0.1)
+
+                sender1.send(can.Message(arbitration_id=1))
+                sender0.send(can.Message(arbitration_id=0))
+                received = []
+                while True:
+                    try:
+                        msg = await asyncio.wait_for(reader.get_message(), 0.5)
+                    except asyncio.TimeoutError:
+                        break
+                    received.append(msg.arbitration_id)
+                notifier.stop()
+            return errors, loop_errors, received
+
+        errors, loop_errors, received = asyncio.run(run_it(handled=True))
+        self.assertEqual([str(exc) for exc in errors], ["failed"])
+        self.assertEqual(loop_errors, [])
+        self.assertEqual(sorted(received), [0, 1])
+
+        # the failing bus is no longer read, but the healthy one is
+        errors, loop_errors, received = asyncio.run(run_it(handled=False))
+        self.assertEqual(errors, [])
+        self.assertEqual([str(exc) for exc in loop_errors], ["failed"])
+        self.assertEqual(received, [1])
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -21,3 +21,31 @@ def test_bus_attempts_self_cleanup(mock_shutdown):
     del bus
     gc.collect()
     mock_shutdown.assert_called()
+
+
+def test_recv_batch():
+    with can.Bus(interface="virtual", channel="recv_batch") as bus_rx, can.Bus(
+        interface="virtual", channel="recv_batch"
+    ) as bus_tx:
+        assert bus_rx.recv_batch(timeout=0.0) == []
+
+        for arbitration_id in range(10):
+            bus_tx.send(can.Message(arbitration_id=arbitration_id))
+
+        first = bus_rx.recv_batch(max_messages=4, timeout=0.1)
+        rest = bus_rx.recv_batch(timeout=0.1)
+        assert [msg.arbitration_id for msg in first] == [0, 1, 2, 3]
+        assert [msg.arbitration_id for msg in rest] == [4, 5, 6, 7, 8, 9]
+
+
+def test_recv_batch_applies_filters():
+    with can.Bus(
+        interface="virtual",
+        channel="recv_batch_filtered",
+        can_filters=[{"can_id": 0x10, "can_mask": 0x7F0}],
+    ) as bus_rx, can.Bus(interface="virtual", channel="recv_batch_filtered") as bus_tx:
+        for arbitration_id in (0x01, 0x10, 0x11, 0x20, 0x1F):
+            bus_tx.send(can.Message(arbitration_id=arbitration_id))
+
+        messages = bus_rx.recv_batch(timeout=0.1)
+        assert [msg.arbitration_id for msg in messages] == [0x10, 0x11, 0x1F]
@@ -0,0 +1,148 @@
+#!/usr/bin/env python
+
+"""
+This module tests :meth:`can.interface.shm_virtual`.
+"""
+
+import multiprocessing
+import os
+import tempfile
+import time
+import unittest
+from multiprocessing import shared_memory
+from unittest import mock
+
+import can
+from can import Bus, Message
+from can.interfaces.shm_virtual import MAX_BUSES, _segment_name
+
+from .config import IS_UNIX
+
+EXAMPLE_MSG1 = Message(timestamp=1639739471.5565314, arbitration_id=0x481, data=b"\x01")
+
+
+def _send_messages(channel, count):
+    with Bus(channel, interface="shm_virtual") as bus:
+        for arbitration_id in range(count):
+            bus.send(
+                Message(arbitration_id=arbitration_id, data=[arbitration_id % 256])
+            )
+
+
+@unittest.skipUnless(IS_UNIX, "only supported on Unix systems")
+class TestShmVirtualBus(unittest.TestCase):
+    def setUp(self):
+        self.channel = f"test-shm-{self._testMethodName}"
+        self.node1 = Bus(
+            self.channel, interface="shm_virtual", preserve_timestamps=True
+        )
+        self.node2 = Bus(self.channel, interface="shm_virtual")
+
+    def tearDown(self):
+        self.node1.shutdown()
+        self.node2.shutdown()
+
+    def test_sendmsg(self):
+        self.node2.send(EXAMPLE_MSG1)
+        r = self.node1.recv(0.1)
+        self.assertNotEqual(r.timestamp, EXAMPLE_MSG1.timestamp)
+        self.assertEqual(r.arbitration_id, EXAMPLE_MSG1.arbitration_id)
+        self.assertEqual(r.data, EXAMPLE_MSG1.data)
+        self.assertEqual(r.channel, self.channel)
+        self.assertTrue(r.is_rx)
+        self.assertIsNone(self.node2.recv(0))
+
+    def test_sendmsg_preserve_timestamp(self):
+        self.node1.send(EXAMPLE_MSG1)
+        r = self.node2.recv(0.1)
+        self.assertEqual(r.timestamp, EXAMPLE_MSG1.timestamp)
+
+    def test_receive_own_messages(self):
+        with Bus(
+            self.channel, interface="shm_virtual", receive_own_messages=True
+        ) as bus:
+            bus.send(EXAMPLE_MSG1)
+            own = bus.recv(0.1)
+            self.assertFalse(own.is_rx)
+            received = self.node1.recv(0.1)
+            self.assertTrue(received.is_rx)
+            self.assertTrue(received.equals(own, check_direction=False))
+
+    def test_overwritten_messages_are_dropped(self):
+        channel = f"{self.channel}-small"
+        with Bus(channel, interface="shm_virtual", slot_count=4) as sender, Bus(
+            channel, interface="shm_virtual"
+        ) as receiver:
+            for arbitration_id in range(10):
+                sender.send(Message(arbitration_id=arbitration_id))
+            received = [receiver.recv(0).arbitration_id for _ in range(4)]
+            self.assertEqual(received, [6, 7, 8, 9])
+            self.assertEqual(receiver.dropped, 6)
+            self.assertIsNone(receiver.recv(0))
+
+    def test_too_many_buses(self):
+        channel = f"{self.channel}-full"
+        buses = [Bus(channel, interface="shm_virtual") for _ in range(MAX_BUSES)]
+        try:
+            with self.assertRaises(can.CanInitializationError):
+                Bus(channel, interface="shm_virtual")
+        finally:
+            for bus in buses:
+                bus.shutdown()
+
+    def test_failed_connection_removes_shared_memory(self):
+        channel = f"{self.channel}-failed"
+        with mock.patch("os.mkfifo", side_effect=OSError("no named pipes")):
+            with self.assertRaises(can.CanInitializationError):
+                Bus(channel, interface="shm_virtual")
+        with self.assertRaises(FileNotFoundError):
+            shared_memory.SharedMemory(_segment_name(channel))
+
+    def test_fileno_becomes_readable(self):
+        notifier_buffer = can.BufferedReader()
+        notifier = can.Notifier(self.node1, [notifier_buffer], shared_reader=True)
+        try:
+            time.sleep(0.05)
+            self.node2.send(EXAMPLE_MSG1)
+            r = notifier_buffer.get_message(1.0)
+            self.assertIsNotNone(r)
+            self.assertEqual(r.arbitration_id, EXAMPLE_MSG1.arbitration_id)
+        finally:
+            notifier.stop()
+
+    def test_other_process(self):
+        count = 1000
+        process = multiprocessing.get_context("spawn").Process(
+            target=_send_messages, args=(self.channel, count)
+        )
+        process.start()
+        try:
+            received = []
+            while len(received) < count:
+                msg = self.node1.recv(10.0)
+                self.assertIsNotNone(msg)
+                received.append(msg.arbitration_id)
+        finally:
+            process.join()
+        self.assertEqual(received, list(range(count)))
+        self.assertEqual(self.node1.dropped, 0)
+
+    def test_other_process_with_other_temporary_directory(self):
+        with tempfile.TemporaryDirectory() as directory:
+            with mock.patch.dict(os.environ, {"TMPDIR": directory}):
+                process = multiprocessing.get_context("spawn").Process(
+                    target=_send_messages, args=(self.channel, 1)
+                )
+                process.start()
+            try:
+                # the sender wakes up this bus instead of the timeout
+                start = time.perf_counter()
+                msg = self.node1.recv(10.0)
+                self.assertLess(time.perf_counter() - start, 5.0)
+                self.assertEqual(msg.arbitration_id, 0)
+            finally:
+                process.join()
+
+
+if __name__ == "__main__":
+    unittest.main()
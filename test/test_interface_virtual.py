@@ -4,9 +4,14 @@
 This module tests :meth:`can.interface.virtual`.
 """
 
+import copy
+import pickle
+import threading
+import time
 import unittest
 
 from can import Bus, Message
+from can.interfaces.virtual import FrozenMessage
 
 EXAMPLE_MSG1 = Message(timestamp=1639739471.5565314, arbitration_id=0x481, data=b"\x01")
 
@@ -35,5 +40,79 @@ class TestMessageFiltering(unittest.TestCase):
         assert r.data == EXAMPLE_MSG1.data
 
 
+class TestZeroCopy(unittest.TestCase):
+    def setUp(self):
+        self.sender = Bus(
+            "zero-copy", interface="virtual", zero_copy=True, receive_own_messages=True
+        )
+        self.receivers = [
+            Bus("zero-copy", interface="virtual", zero_copy=True) for _ in range(2)
+        ]
+        self.copying_receiver = Bus("zero-copy", interface="virtual")
+
+    def tearDown(self):
+        for bus in [self.sender, *self.receivers, self.copying_receiver]:
+            bus.shutdown()
+
+    def test_shared_message(self):
+        self.sender.send(EXAMPLE_MSG1)
+        first, second = [bus.recv(0.1) for bus in self.receivers]
+        self.assertIsInstance(first, FrozenMessage)
+        self.assertIs(first, second)
+        self.assertTrue(first.is_rx)
+        self.assertEqual(first.channel, "zero-copy")
+        self.assertEqual(first.data, EXAMPLE_MSG1.data)
+        self.assertIsInstance(first.data, bytes)
+
+        own = self.sender.recv(0.1)
+        self.assertIsInstance(own, FrozenMessage)
+        self.assertFalse(own.is_rx)
+        self.assertEqual(own.timestamp, first.timestamp)
+
+        copied = self.copying_receiver.recv(0.1)
+        self.assertNotIsInstance(copied, FrozenMessage)
+        self.assertTrue(copied.equals(first))
+
+    def test_read_only(self):
+        self.sender.send(EXAMPLE_MSG1)
+        msg = self.receivers[0].recv(0.1)
+        with self.assertRaises(AttributeError):
+            msg.arbitration_id = 1
+        with self.assertRaises(AttributeError):
+            del msg.data
+        with self.assertRaises(TypeError):
+            msg.data[0] = 1
+
+        for mutable in (
+            copy.copy(msg),
+            copy.deepcopy(msg),
+            pickle.loads(pickle.dumps(msg)),
+        ):
+            self.assertIs(type(mutable), Message)
+            self.assertTrue(mutable.equals(msg))
+            mutable.arbitration_id = 1
+
+    def test_rx_queue_size_drops_oldest(self):
+        with Bus(
+            "zero-copy", interface="virtual", zero_copy=True, rx_queue_size=2
+        ) as bus:
+            for arbitration_id in range(5):
+                self.sender.send(Message(arbitration_id=arbitration_id))
+            self.assertEqual(bus.recv(0).arbitration_id, 3)
+            self.assertEqual(bus.recv(0).arbitration_id, 4)
+            self.assertIsNone(bus.recv(0))
+
+    def test_blocking_recv(self):
+        receiver = self.receivers[0]
+        start = time.perf_counter()
+        self.assertIsNone(receiver.recv(0.05))
+        self.assertGreaterEqual(time.perf_counter() - start, 0.05)
+
+        timer = threading.Timer(0.05, self.sender.send, (EXAMPLE_MSG1,))
+        timer.start()
+        self.assertIsNotNone(receiver.recv(5))
+        timer.join()
+
+
 if __name__ == "__main__":
     unittest.main()
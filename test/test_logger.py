@@ -98,6 +98,14 @@ class TestLoggerScriptModule(unittest.TestCase):
         self.assertSuccessfullCleanup()
         self.mock_logger.assert_called_once()
 
+    def test_log_file_without_suffix(self):
+        self.mock_virtual_bus.recv = Mock(side_effect=[self.testmsg, KeyboardInterrupt])
+
+        sys.argv = self.baseargs + ["-f", "recording"]
+        can.logger.main()
+        self.assertSuccessfullCleanup()
+        self.assertEqual(self.MockLogger.call_args.kwargs["filename"], "recording.canb")
+
     def test_log_virtual_sizedlogger(self):
         self.mock_virtual_bus.recv = Mock(side_effect=[self.testmsg, KeyboardInterrupt])
         self.MockLoggerUse = self.MockLoggerSized
@@ -0,0 +1,129 @@
+#!/usr/bin/env python
+
+"""
+This module tests :func:`can.io.merge_logs` and merging files
+with the ``can.logconvert`` script.
+"""
+
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+import can
+import can.logconvert
+
+
+class TestMergeLogs(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+
+        self.first = [
+            can.Message(timestamp=t, arbitration_id=0x100, channel="can0")
+            for t in (0.0, 0.5, 1.0, 2.5)
+        ]
+        self.second = [
+            can.Message(timestamp=t, arbitration_id=0x200, channel="can0")
+            for t in (0.25, 1.0, 3.0)
+        ]
+
+    def _write_log(self, filename, messages):
+        path = os.path.join(self.directory.name, filename)
+        with can.Logger(path) as writer:
+            for msg in messages:
+                writer(msg)
+        return path
+
+    def test_merge_iterables(self):
+        merged = list(can.io.merge_logs(self.first, self.second, []))
+        self.assertEqual(
+            [msg.timestamp for msg in merged], [0.0, 0.25, 0.5, 1.0, 1.0, 2.5, 3.0]
+        )
+        # equal timestamps are ordered like the logs
+        self.assertEqual(merged[3].arbitration_id, 0x100)
+        self.assertEqual(merged[4].arbitration_id, 0x200)
+
+    def test_merge_is_lazy(self):
+        def messages():
+            yield from self.first
+            self.fail("read more messages than necessary")
+
+        merged = iter(can.io.merge_logs(messages(), self.second))
+        self.assertEqual(next(merged).timestamp, 0.0)
+        self.assertEqual(next(merged).timestamp, 0.25)
+
+    def test_remap_channels(self):
+        merged = list(
+            can.io.merge_logs(
+                self.first, self.second, channels=[{"can0": 1, "other": 3}, 2]
+            )
+        )
+        self.assertEqual(
+            [msg.channel for msg in merged if msg.arbitration_id == 0x100], [1] * 4
+        )
+        self.assertEqual(
+            [msg.channel for msg in merged if msg.arbitration_id == 0x200], [2] * 3
+        )
+        # the given messages are not modified
+        self.assertEqual({msg.channel for msg in self.first + self.second}, {"can0"})
+
+        with self.assertRaises(ValueError):
+            can.io.merge_logs(self.first, self.second, channels=[1])
+
+    def test_merge_files(self):
+        first = self._write_log("first.csv", self.first)
+        second = self._write_log("second.log", self.second)
+
+        reader = can.io.merge_logs(first, second, channels=[None, 1])
+        with mock.patch.object(can.CanutilsLogReader, "stop") as stop:
+            with reader:
+                merged = list(reader)
+            stop.assert_called()
+        self.assertEqual(
+            [(msg.timestamp, msg.channel) for msg in merged],
+            [
+                (0.0, None),
+                (0.25, 1),
+                (0.5, None),
+                (1.0, None),
+                (1.0, 1),
+                (2.5, None),
+                (3.0, 1),
+            ],
+        )
+
+    def test_unknown_format(self):
+        first = self._write_log("first.csv", self.first)
+        with self.assertRaises(ValueError):
+            can.io.merge_logs(first, "second.unknown")
+
+    def test_logconvert(self):
+        first = self._write_log("first.asc", self.first)
+        second = self._write_log("second.csv", self.second)
+        output = os.path.join(self.directory.name, "merged.log")
+
+        with mock.patch.object(
+            sys, "argv", ["can_logconvert", "-c", "0,vcan1", first, second, output]
+        ):
+            can.logconvert.main()
+
+        with can.LogReader(output) as reader:
+            merged = [(msg.arbitration_id, msg.channel) for msg in reader]
+        self.assertEqual(
+            merged,
+            [
+                (0x100, "can0"),
+                (0x200, "vcan1"),
+                (0x100, "can0"),
+                (0x100, "can0"),
+                (0x200, "vcan1"),
+                (0x100, "can0"),
+                (0x200, "vcan1"),
+            ],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,124 @@
+#!/usr/bin/env python
+
+"""
+This module tests :class:`can.MessageBatch`.
+"""
+
+import unittest
+
+import can
+
+from .data.example_data import TEST_ALL_MESSAGES
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+@unittest.skipIf(np is None, "numpy is not installed")
+class TestMessageBatch(unittest.TestCase):
+    def setUp(self):
+        self.messages = [
+            can.Message(
+                timestamp=msg.timestamp,
+                arbitration_id=msg.arbitration_id,
+                is_extended_id=msg.is_extended_id,
+                is_remote_frame=msg.is_remote_frame,
+                is_error_frame=msg.is_error_frame,
+                channel=["can0", 1, None][index % 3],
+                dlc=msg.dlc,
+                data=msg.data,
+                is_fd=msg.is_fd,
+                is_rx=bool(index % 2),
+                bitrate_switch=msg.bitrate_switch,
+                error_state_indicator=msg.error_state_indicator,
+            )
+            for index, msg in enumerate(TEST_ALL_MESSAGES)
+        ]
+        self.batch = can.MessageBatch.from_messages(self.messages)
+
+    def assertMessagesEqual(self, expected, actual):
+        self.assertEqual(len(expected), len(actual))
+        for msg1, msg2 in zip(expected, actual):
+            self.assertTrue(msg1.equals(msg2), f"{msg1!r} != {msg2!r}")
+
+    def test_round_trip(self):
+        self.assertEqual(len(self.batch), len(self.messages))
+        self.assertMessagesEqual(self.messages, self.batch.to_messages())
+        self.assertMessagesEqual(self.messages, list(self.batch))
+
+    def test_index(self):
+        self.assertTrue(self.messages[3].equals(self.batch[3]))
+        self.assertTrue(self.messages[-1].equals(self.batch[-1]))
+        with self.assertRaises(IndexError):
+            _ = self.batch[len(self.messages)]
+
+    def test_slice(self):
+        part = self.batch[2:7]
+        self.assertIsInstance(part, can.MessageBatch)
+        self.assertMessagesEqual(self.messages[2:7], part)
+        self.assertTrue(np.shares_memory(part.data, self.batch.data))
+
+    def test_boolean_mask(self):
+        part = self.batch[self.batch.is_extended_id & ~self.batch.is_remote_frame]
+        expected = [
+            msg
+            for msg in self.messages
+            if msg.is_extended_id and not msg.is_remote_frame
+        ]
+        self.assertMessagesEqual(expected, part)
+
+    def test_select(self):
+        ids = {0xAB, 0x42, 0x123}
+        start = self.messages[5].timestamp
+        stop = self.messages[-3].timestamp
+        expected = [
+            msg
+            for msg in self.messages
+            if msg.arbitration_id in ids and start <= msg.timestamp < stop
+        ]
+        self.assertMessagesEqual(
+            expected, self.batch.select(arbitration_ids=ids, start=start, stop=stop)
+        )
+
+        self.assertMessagesEqual(
+            [msg for msg in self.messages if msg.channel == 1],
+            self.batch.select(channel=1),
+        )
+        self.assertEqual(len(self.batch.select(channel="unknown")), 0)
+
+    def test_concatenate(self):
+        first = can.MessageBatch.from_messages(self.messages[:7])
+        second = can.MessageBatch.from_messages(self.messages[7:])
+        # the channels are numbered differently in both batches
+        self.assertNotEqual(first.channels, second.channels)
+
+        joined = can.MessageBatch.concatenate([first, second])
+        self.assertMessagesEqual(self.messages, joined)
+        self.assertEqual(len(can.MessageBatch.concatenate([])), 0)
+
+    def test_empty(self):
+        batch = can.MessageBatch.from_messages([])
+        self.assertEqual(len(batch), 0)
+        self.assertEqual(batch.to_messages(), [])
+        self.assertEqual(len(can.MessageBatch.empty(5)), 5)
+
+    def test_columns_must_match(self):
+        with self.assertRaises(ValueError):
+            can.MessageBatch(
+                timestamp=np.zeros(2),
+                arbitration_id=np.zeros(3),
+                flags=np.zeros(2),
+                dlc=np.zeros(2),
+                data=np.zeros((2, 64)),
+            )
+
+    def test_memory(self):
+        self.assertEqual(
+            self.batch.nbytes, len(self.messages) * (8 + 4 + 1 + 1 + 2 + 64)
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -4,6 +4,7 @@
 This module tests :meth:`can.BusABC._matches_filters`.
 """
 
+import random
 import unittest
 
 from can import Bus, Message
@@ -46,6 +47,72 @@ class TestMessageFiltering(unittest.TestCase):
         self.assertFalse(self.bus._matches_filters(EXAMPLE_MSG))
         self.assertTrue(self.bus._matches_filters(HIGHEST_MSG))
 
+    def test_match_extended_flag(self):
+        self.bus.set_filters([{"can_id": 0x123, "can_mask": 0x7FF, "extended": False}])
+        self.assertTrue(
+            self.bus._matches_filters(
+                Message(arbitration_id=0x123, is_extended_id=False)
+            )
+        )
+        self.assertFalse(self.bus._matches_filters(EXAMPLE_MSG))
+
+        self.bus.set_filters([{"can_id": 0x123, "can_mask": 0x7FF}])
+        self.assertTrue(
+            self.bus._matches_filters(
+                Message(arbitration_id=0x123, is_extended_id=False)
+            )
+        )
+        self.assertTrue(self.bus._matches_filters(EXAMPLE_MSG))
+
+    def test_match_zero_mask(self):
+        self.bus.set_filters([{"can_id": 0x123, "can_mask": 0x0}])
+        for msg in TEST_ALL_MESSAGES:
+            self.assertTrue(self.bus._matches_filters(msg))
+
+        self.bus.set_filters([{"can_id": 0x123, "can_mask": 0x0, "extended": True}])
+        for msg in TEST_ALL_MESSAGES:
+            self.assertEqual(self.bus._matches_filters(msg), msg.is_extended_id)
+
+    def test_match_many_filters(self):
+        """Compare against a straightforward evaluation of every single filter."""
+        rng = random.Random(42)
+        masks = [0x7FF, 0x1FFFFFFF, 0x700, 0x7F0, 0x1FFFFF00, 0x0]
+        filters = []
+        for _ in range(300):
+            _filter = {"can_id": rng.getrandbits(29), "can_mask": rng.choice(masks)}
+            if rng.random() < 0.7:
+                _filter["extended"] = rng.random() < 0.5
+            filters.append(_filter)
+
+        def expected(msg, filters):
+            return any(
+                ("extended" not in f or f["extended"] == msg.is_extended_id)
+                and (f["can_id"] ^ msg.arbitration_id) & f["can_mask"] == 0
+                for f in filters
+            )
+
+        for count in (1, 10, 100, 300):
+            self.bus.set_filters(filters[:count])
+            for _ in range(500):
+                is_extended_id = rng.random() < 0.5
+                msg = Message(
+                    arbitration_id=rng.getrandbits(29 if is_extended_id else 11),
+                    is_extended_id=is_extended_id,
+                )
+                self.assertEqual(
+                    self.bus._matches_filters(msg), expected(msg, filters[:count])
+                )
+
+            # the masked IDs of the filters themselves must always match
+            for _filter in filters[:count]:
+                msg = Message(
+                    arbitration_id=_filter["can_id"] & _filter["can_mask"] & 0x7FF,
+                    is_extended_id=_filter.get("extended", False),
+                )
+                self.assertEqual(
+                    self.bus._matches_filters(msg), expected(msg, filters[:count])
+                )
+
 
 if __name__ == "__main__":
     unittest.main()
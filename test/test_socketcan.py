@@ -4,6 +4,7 @@
 Test functions in `can.interfaces.socketcan.socketcan`.
 """
 import ctypes
+import socket
 import struct
 import unittest
 import warnings
@@ -14,9 +15,15 @@ from can.interfaces.socketcan.constants import (
     CAN_BCM_TX_DELETE,
     CAN_BCM_TX_SETUP,
     SETTIMER,
+    SO_TIMESTAMPNS,
     STARTTIMER,
     TX_COUNTEVT,
 )
+from can.interfaces.socketcan.recvmmsg import (
+    RecvmmsgBuffer,
+    capture_messages,
+    recvmmsg_available,
+)
 from can.interfaces.socketcan.socketcan import (
     BcmMsgHead,
     bcm_header_factory,
@@ -24,6 +31,7 @@ from can.interfaces.socketcan.socketcan import (
     build_bcm_transmit_header,
     build_bcm_tx_delete_header,
     build_bcm_update_header,
+    build_can_frame,
 )
 
 from .config import IS_LINUX, IS_PYPY, TEST_INTERFACE_SOCKETCAN
@@ -357,6 +365,42 @@ class SocketCANTest(unittest.TestCase):
         self.assertEqual(can_id, result.can_id)
         self.assertEqual(1, result.nframes)
 
+    @unittest.skipUnless(recvmmsg_available, "recvmmsg is not available")
+    def test_capture_messages(self):
+        # A datagram socket pair delivers the raw frames together with the
+        # SO_TIMESTAMPNS control message, just like a raw CAN socket would
+        sender, receiver = socket.socketpair(socket.AF_UNIX, socket.SOCK_DGRAM)
+        self.addCleanup(sender.close)
+        self.addCleanup(receiver.close)
+        receiver.setsockopt(socket.SOL_SOCKET, SO_TIMESTAMPNS, 1)
+
+        sent = [
+            can.Message(arbitration_id=0x123, data=[1, 2, 3], is_extended_id=False),
+            can.Message(arbitration_id=0x12345678, data=[4] * 8),
+            can.Message(arbitration_id=0x7FF, is_remote_frame=True, dlc=2),
+            can.Message(
+                arbitration_id=0x42,
+                is_extended_id=False,
+                is_fd=True,
+                bitrate_switch=True,
+                data=range(64),
+            ),
+        ]
+        for msg in sent:
+            sender.send(build_can_frame(msg))
+
+        buffer = RecvmmsgBuffer(3)
+        first = capture_messages(receiver, buffer, max_messages=10)
+        second = capture_messages(receiver, buffer, max_messages=10)
+        self.assertEqual(capture_messages(receiver, buffer, max_messages=10), [])
+
+        received = first + second
+        self.assertEqual(len(first), 3)
+        self.assertEqual(len(received), len(sent))
+        for expected, actual in zip(sent, received):
+            self.assertTrue(expected.equals(actual, timestamp_delta=None))
+            self.assertGreater(actual.timestamp, 0)
+
     @unittest.skipUnless(TEST_INTERFACE_SOCKETCAN, "Only run when vcan0 is available")
     def test_bus_creation_can(self):
         bus = can.Bus(interface="socketcan", channel="vcan0", fd=False)
@@ -367,6 +411,23 @@ class SocketCANTest(unittest.TestCase):
         bus = can.Bus(interface="socketcan", channel="vcan0", fd=True)
         self.assertEqual(bus.protocol, can.CanProtocol.CAN_FD)
 
+    @unittest.skipUnless(TEST_INTERFACE_SOCKETCAN, "Only run when vcan0 is available")
+    def test_bus_recv_batch(self):
+        with can.Bus(interface="socketcan", channel="vcan0") as bus_rx, can.Bus(
+            interface="socketcan", channel="vcan0"
+        ) as bus_tx:
+            for arbitration_id in range(20):
+                bus_tx.send(can.Message(arbitration_id=arbitration_id))
+
+            received = []
+            while len(received) < 20:
+                batch = bus_rx.recv_batch(max_messages=8, timeout=1.0)
+                self.assertTrue(0 < len(batch) <= 8)
+                received += batch
+
+            self.assertEqual([msg.arbitration_id for msg in received], list(range(20)))
+            self.assertTrue(all(msg.channel == "vcan0" for msg in received))
+
     @unittest.skipUnless(IS_LINUX and IS_PYPY, "Only test when run on Linux with PyPy")
     def test_pypy_socketcan_support(self):
         """Wait for PyPy raw CAN socket support